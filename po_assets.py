@@ -0,0 +1,219 @@
+"""Process-wide cache for the letterhead images and CenturyGothic fonts.
+
+Images are decoded and compressed into PDF image objects once per process;
+each document only gets a shallow copy that shares the encoded stream. Every
+entry remembers the file's mtime and is rebuilt when the file changes.
+
+Encoding the letterhead PNGs is most of a fresh process' first render, so
+the encoded streams are also kept on disk in ASSET_CACHE_DIR, keyed by the
+PNG's contents and the reportlab version: a JSON header line (dimensions,
+colour space, filters) followed by the raw stream bytes. New processes (app
+restarts, po_batch / po_server workers) rebuild the image objects from
+those instead of encoding again. Run
+
+    python po_assets.py
+
+at build time to ship the cache with the image. Fonts are not cached on
+disk: parsing both TTFs takes a few milliseconds.
+"""
+import copy
+import hashlib
+import json
+import os
+import threading
+
+import reportlab
+
+from reportlab.lib.utils import ImageReader, _digester
+from reportlab.pdfbase import pdfdoc, pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+from po_paths import BASE_DIR
+
+LOGO_PATH_RIGHT = os.path.join(BASE_DIR, "Metasol_Logo_Right.png")
+LOGO_PATH_LEFT = os.path.join(BASE_DIR, "Metasol_Logo_left.png")
+LOGO_PATH_FOOTER = os.path.join(BASE_DIR, "Footer.png")
+
+ASSET_CACHE_DIR = os.environ.get("PO_ASSET_CACHE", os.path.join(BASE_DIR, ".asset_cache"))
+
+FONT_PATHS = {
+    "CenturyGothic": os.path.join(BASE_DIR, "centurygothic.ttf"),
+    "CenturyGothicBold": os.path.join(BASE_DIR, "centurygothic_bold.ttf"),
+}
+
+_lock = threading.Lock()
+_images = {}  # path -> CachedImage
+_fonts = {}   # font name -> mtime it was registered with
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _encode(path):
+    reader = ImageReader(path)
+    width, height = reader.getSize()
+    xobj = pdfdoc.PDFImageXObject(path, reader, mask="auto")
+    # drawImage(mask="auto") on a PNG with alpha splits it into an image and
+    # a soft mask; keep the mask template aside so copies can reference it
+    smask = getattr(xobj, "_smask", None)
+    if smask is not None:
+        del xobj._smask
+    return width, height, xobj, smask
+
+
+def _bundle_path(path):
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read())
+    digest.update(reportlab.Version.encode())
+    return os.path.join(ASSET_CACHE_DIR, f"{digest.hexdigest()}.bin")
+
+
+def _stream_header(xobj):
+    content = xobj.streamContent
+    return {
+        "name": xobj.name, "width": xobj.width, "height": xobj.height,
+        "bitsPerComponent": xobj.bitsPerComponent, "colorSpace": xobj.colorSpace,
+        "filters": list(xobj._filters), "mask": xobj.mask, "decode": getattr(xobj, "_decode", None),
+        "text": isinstance(content, str), "length": len(content),
+    }
+
+
+def _dump_encoded(encoded):
+    width, height, xobj, smask = encoded
+    streams = [xobj] if smask is None else [xobj, smask]
+    header = {"width": width, "height": height, "streams": [_stream_header(s) for s in streams]}
+    body = [s.streamContent.encode("latin-1") if isinstance(s.streamContent, str) else s.streamContent
+            for s in streams]
+    return json.dumps(header).encode() + b"\n" + b"".join(body)
+
+
+def _load_stream(header, data):
+    xobj = pdfdoc.PDFImageXObject(str(header["name"]))
+    xobj.width, xobj.height = int(header["width"]), int(header["height"])
+    xobj.bitsPerComponent = int(header["bitsPerComponent"])
+    if header["colorSpace"] not in ("DeviceRGB", "DeviceGray", "DeviceCMYK"):
+        raise ValueError(f"unexpected colour space {header['colorSpace']!r}")
+    xobj.colorSpace = header["colorSpace"]
+    if not set(header["filters"]) <= {"ASCII85Decode", "FlateDecode", "DCTDecode"}:
+        raise ValueError(f"unexpected filters {header['filters']!r}")
+    xobj._filters = tuple(header["filters"])
+    xobj.mask = None if header["mask"] is None else tuple(int(v) for v in header["mask"])
+    if header["decode"] is not None:
+        xobj._decode = [int(v) for v in header["decode"]]
+    xobj.streamContent = data.decode("latin-1") if header["text"] else data
+    return xobj
+
+
+def _parse_encoded(blob):
+    """Rebuild (width, height, image, mask) from _dump_encoded() output; ValueError if it doesn't fit."""
+    head, sep, body = blob.partition(b"\n")
+    if not sep:
+        raise ValueError("no header")
+    header = json.loads(head)
+    streams = []
+    offset = 0
+    for stream in header["streams"]:
+        length = int(stream["length"])
+        streams.append(_load_stream(stream, body[offset:offset + length]))
+        offset += length
+    if offset != len(body) or len(streams) not in (1, 2):
+        raise ValueError("truncated or malformed cache entry")
+    return int(header["width"]), int(header["height"]), streams[0], streams[1] if len(streams) == 2 else None
+
+
+def _load_encoded(path):
+    """(width, height, image, mask) for ``path``, from the disk cache when possible."""
+    bundle = _bundle_path(path)
+    try:
+        with open(bundle, "rb") as f:
+            return _parse_encoded(f.read())
+    except (OSError, ValueError, KeyError, TypeError):
+        pass  # missing, stale or damaged: encode again
+    encoded = _encode(path)
+    # Best effort: a read-only install just encodes in every new process
+    try:
+        os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+        tmp = f"{bundle}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_dump_encoded(encoded))
+        os.replace(tmp, bundle)
+    except OSError:
+        pass
+    return encoded
+
+
+class CachedImage:
+    def __init__(self, path, mtime):
+        self.path = path
+        self.mtime = mtime
+        self.width, self.height, self.xobj, self.smask = _load_encoded(path)
+
+
+def get_image(path):
+    """Return the CachedImage for ``path``, or None if the file is missing."""
+    mtime = _mtime(path)
+    if mtime is None:
+        return None
+    cached = _images.get(path)
+    if cached is not None and cached.mtime == mtime:
+        return cached
+    with _lock:
+        cached = _images.get(path)
+        if cached is None or cached.mtime != mtime:
+            cached = _images[path] = CachedImage(path, mtime)
+    return cached
+
+
+def draw_image(c, path, x, y, width=None, height=None, **kwargs):
+    """Drop-in for ``c.drawImage(path, ..., mask='auto')`` backed by the cache.
+
+    The cached image object is registered with the canvas' document under the
+    name drawImage derives from the file name, so drawImage finds it and skips
+    reading, decoding and compressing the PNG again.
+    """
+    cached = get_image(path)
+    if cached is None:
+        return
+    doc = c._doc
+    name = _digester(f"{path}auto".encode("utf-8"))
+    reg_name = doc.getXObjectName(name)
+    if reg_name not in doc.idToObject:
+        img = copy.copy(cached.xobj)
+        img.name = name
+        if cached.smask is not None:
+            mask_name = doc.getXObjectName(cached.smask.name)
+            if mask_name in doc.idToObject:
+                img.smask = pdfdoc.PDFObjectReference(mask_name)
+            else:
+                img.smask = doc.Reference(copy.copy(cached.smask), mask_name)
+        doc.Reference(img, reg_name)
+        doc.addForm(name, img)
+    c.drawImage(path, x, y, width=width, height=height, mask="auto", **kwargs)
+
+
+def register_fonts():
+    """Register (or re-register after a file change) the CenturyGothic faces."""
+    for name, path in FONT_PATHS.items():
+        mtime = _mtime(path)
+        if _fonts.get(name) == mtime:
+            continue
+        with _lock:
+            if _fonts.get(name) != mtime:
+                pdfmetrics.registerFont(TTFont(name, path))
+                _fonts[name] = mtime
+
+
+def preload():
+    """Warm the cache: fonts plus every letterhead image."""
+    register_fonts()
+    for path in (LOGO_PATH_LEFT, LOGO_PATH_RIGHT, LOGO_PATH_FOOTER):
+        get_image(path)
+
+
+if __name__ == "__main__":
+    preload()
+    print(f"asset cache: {ASSET_CACHE_DIR}")
@@ -0,0 +1,194 @@
+"""Render many POs from a manifest across a process pool.
+
+    python po_batch.py manifest.json --out out_dir/
+    python po_batch.py manifest.csv --out month_end.zip --workers 8
+    python po_batch.py approved.csv --out print_run.pdf     # every PO in one PDF
+
+A JSON manifest is a list of PO dicts (see po_models.po_from_dict). A CSV
+manifest has one row per line item; the PO header columns are repeated on
+every row and rows sharing the same ``format`` + ``po_no`` belong to one PO.
+
+Each PO becomes local/<PO No.>.pdf or foreign/<PO No.>.pdf in the output
+directory or archive. An order whose file name is already taken by an earlier
+one in the manifest (e.g. "A/1" and "A 1") is reported as failed.
+"""
+import argparse
+import csv
+import json
+import os
+import time
+import zipfile
+from multiprocessing import Pool
+
+from po_models import BACKENDS, DEFAULT_BACKEND, FORMATS, backend_error, pdf_filename, po_from_dict
+
+ITEM_FIELDS = {
+    "local": ["description", "unit", "qty", "unit_cost"],
+    "foreign": ["hs_code", "product_description", "uom", "qty", "unit_cost"],
+}
+
+
+def load_manifest(path):
+    """Read a JSON or CSV manifest into a list of PO dicts."""
+    if path.lower().endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    orders = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            fmt = row.get("format") or "local"
+            if fmt not in FORMATS:
+                raise ValueError(f"Unknown PO format: {fmt!r}")
+            item_fields = ITEM_FIELDS[fmt]
+            key = (fmt, row["po_no"])
+            if key not in orders:
+                header = {k: v for k, v in row.items() if k not in item_fields and v not in (None, "")}
+                header["format"] = fmt
+                header["line_items"] = []
+                orders[key] = header
+            # A header-only row (no item columns filled in) adds no line item
+            item = {k: row[k] for k in item_fields if row.get(k) not in (None, "")}
+            if item:
+                orders[key]["line_items"].append(item)
+    return list(orders.values())
+
+
+def warm_worker():
+    # Load fonts and letterhead images once per worker, before the first job
+    import po_assets
+    import po_render  # noqa: F401
+    po_assets.preload()
+
+
+def _label(data):
+    return str(data.get("po_no") or "?") if isinstance(data, dict) else "?"
+
+
+def _output_name(data):
+    """"<format>/<PO No.>.pdf" for an order dict, or None if it has no usable PO No."""
+    if isinstance(data, dict) and isinstance(data.get("po_no"), str):
+        return f"{data.get('format', 'local')}/{pdf_filename(data['po_no'])}"
+    return None
+
+
+def _render_job(args):
+    """Render one order; returns (PO No., name, pdf or None, error message or None)."""
+    data, label, name, out_dir, backend = args
+    from po_render import render_po, write_po
+
+    path = None
+    try:
+        po = po_from_dict(data)
+        if out_dir is None:
+            return label, name, render_po(po, backend), None
+        # Straight to disk, page by page
+        path = os.path.join(out_dir, *name.split("/"))
+        with open(path, "wb") as f:
+            write_po(po, f, backend)
+    except Exception as e:
+        # One bad order shouldn't sink the rest of the run
+        if path is not None and os.path.exists(path):
+            os.unlink(path)
+        return label, name, None, f"{type(e).__name__}: {e}"
+    return label, name, None, None
+
+
+def render_batch(orders, out, workers=None, chunksize=4, backend=DEFAULT_BACKEND):
+    """Render ``orders`` (PO dicts) into ``out``, a directory or a .zip path.
+
+    Orders that fail are skipped. Returns (count, failures, seconds), where
+    ``failures`` lists (PO No., error message) for each of them.
+    """
+    to_zip = out.lower().endswith(".zip")
+    out_dir = None
+    if to_zip:
+        os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    else:
+        out_dir = out
+        for fmt in FORMATS:
+            os.makedirs(os.path.join(out_dir, fmt), exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    count = 0
+    failures = []
+    taken = {}  # casefolded output name -> PO No. that claimed it
+    jobs = []
+    for data in orders:
+        label, name = _label(data), _output_name(data)
+        if name is not None:
+            # Case-insensitive file systems would merge "A-1.pdf" and "a-1.pdf" too
+            if name.casefold() in taken:
+                failures.append((label, f"{name} is already taken by PO {taken[name.casefold()]}"))
+                continue
+            taken[name.casefold()] = label
+        jobs.append((data, label, name, out_dir, backend))
+    with Pool(processes=workers, initializer=warm_worker) as pool:
+        results = pool.imap_unordered(_render_job, jobs, chunksize=chunksize)
+        if to_zip:
+            # PDFs are already compressed, storing them is faster than deflating again
+            with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as archive:
+                for label, name, pdf, error in results:
+                    if error is not None:
+                        failures.append((label, error))
+                        continue
+                    archive.writestr(name, pdf)
+                    count += 1
+        else:
+            for label, _, _, error in results:
+                if error is not None:
+                    failures.append((label, error))
+                    continue
+                count += 1
+    return count, failures, time.perf_counter() - start
+
+
+def collate_batch(orders, out, title="Print run"):
+    """Render ``orders`` (PO dicts) into the single PDF ``out``, in manifest order.
+
+    One document can't be split across processes, so this runs here; sharing
+    fonts, images and letterheads across POs makes up for it. Returns
+    (count, seconds).
+    """
+    from po_render import write_collated
+
+    start = time.perf_counter()
+    pos = [po_from_dict(data) for data in orders]
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "wb") as f:
+        write_collated(pos, f, title)
+    return len(pos), time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render POs from a CSV/JSON manifest.")
+    parser.add_argument("manifest", help="JSON or CSV manifest of PO headers and line items")
+    parser.add_argument("--out", required=True,
+                        help="output directory, a .zip archive, or a .pdf to collate every PO into one file")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    parser.add_argument("--chunksize", type=int, default=4, help="POs handed to a worker at a time")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND, help="rendering engine")
+    args = parser.parse_args(argv)
+    if backend_error(args.backend):
+        parser.error(f"backend {args.backend!r} is unavailable: {backend_error(args.backend)}")
+
+    orders = load_manifest(args.manifest)
+    if args.out.lower().endswith(".pdf"):
+        if args.backend != "canvas":
+            parser.error("collated output (--out *.pdf) needs the canvas backend")
+        count, seconds = collate_batch(orders, args.out)
+        print(f"Collated {count} POs in {seconds:.2f}s -> {args.out}")
+        return
+    count, failures, seconds = render_batch(orders, args.out, workers=args.workers, chunksize=args.chunksize,
+                                            backend=args.backend)
+    rate = count / seconds if seconds else float("inf")
+    print(f"Rendered {count} POs in {seconds:.2f}s ({rate:.1f} POs/s) -> {args.out}")
+    if failures:
+        for name, error in failures:
+            print(f"  failed {name}: {error}")
+        parser.exit(1, f"{len(failures)} PO(s) failed\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Rendering benchmark for both PO formats.
+
+    python po_bench.py                                  # full run, writes bench_results.json
+    python po_bench.py --sizes 1 10 100 --out quick.json
+    python po_bench.py --check bench_baseline.json      # exit 1 on a regression
+
+Each format is rendered with synthetic POs of 1 to 10,000 line items. Wall
+time is the median of several renders after a warm-up; peak memory is taken
+from a separate tracemalloc run so tracing doesn't skew the timings.
+Everything runs offline from the bundled fonts and images.
+"""
+import argparse
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+from po_models import DEFAULT_BACKEND, ForeignLineItem, ForeignPO, LineItems, LocalLineItem, LocalPO
+from po_render import render_po
+
+SIZES = [1, 10, 100, 1_000, 10_000]
+FORMATS = ["local", "foreign"]
+
+# A change is a regression when it is this much worse than the baseline...
+TIME_TOLERANCE = 1.5
+SIZE_TOLERANCE = 1.10
+# ...and the slowdown is big enough not to be timer noise
+MIN_TIME_DELTA = 0.05
+
+_PAGE = re.compile(rb"/Type /Page\b")
+
+
+def synthetic_po(fmt, n_items):
+    if fmt == "local":
+        items = LineItems(LocalLineItem)
+        items.extend_columns(
+            {"description": [f"Item {i + 1} - stainless steel fitting, 2 inch" for i in range(n_items)],
+             "unit": ["EA"] * n_items},
+            [(i % 9) + 1 for i in range(n_items)],
+            [12_345 + i for i in range(n_items)],
+        )
+        return LocalPO(
+            po_no=f"BENCH-LOCAL-{n_items}", po_date=date(2025, 1, 1), name="Bench", designation="Sales",
+            vat_no="300000000000003", company_name="Benchmark Trading Est.", supplier="Bench Supplier",
+            subject="Benchmark purchase order", line_items=items,
+        )
+    items = LineItems(ForeignLineItem)
+    items.extend_columns(
+        {"hs_code": [f"{8481_80 + i % 90:08d}" for i in range(n_items)],
+         "product_description": [f"Product {i + 1} - ball valve, PN16" for i in range(n_items)],
+         "uom": ["PCS"] * n_items},
+        [(i % 9) + 1 for i in range(n_items)],
+        [6_789 + i for i in range(n_items)],
+    )
+    return ForeignPO(
+        po_no=f"BENCH-FOREIGN-{n_items}", po_date=date(2025, 1, 1), to_name="Bench", company="Bench Co.",
+        address="1 Bench Road", subject="Benchmark purchase order", consignee_name="Consignee",
+        line_items=items,
+    )
+
+
+def count_pages(pdf: bytes) -> int:
+    return len(_PAGE.findall(pdf))
+
+
+def repeats_for(n_items):
+    return 5 if n_items <= 100 else 3 if n_items <= 1_000 else 1
+
+
+def bench_one(fmt, n_items, backend=DEFAULT_BACKEND):
+    po = synthetic_po(fmt, n_items)
+    pdf = render_po(po, backend)  # warm-up: fonts, images, code paths
+    times = []
+    for _ in range(repeats_for(n_items)):
+        start = time.perf_counter()
+        pdf = render_po(po, backend)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    render_po(po, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "format": fmt,
+        "items": n_items,
+        "seconds": statistics.median(times),
+        "peak_bytes": peak,
+        "pdf_bytes": len(pdf),
+        "pages": count_pages(pdf),
+    }
+
+
+def run(sizes=SIZES, formats=FORMATS, log=print):
+    results = []
+    for fmt in formats:
+        for n_items in sizes:
+            result = bench_one(fmt, n_items)
+            results.append(result)
+            log(f"{fmt:8} {n_items:>6} items  {result['seconds'] * 1000:9.1f} ms  "
+                f"peak {result['peak_bytes'] / 1e6:7.1f} MB  "
+                f"{result['pdf_bytes'] / 1e3:8.1f} KB  {result['pages']:>4} pages")
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def check(report, baseline):
+    """Compare against a baseline report; returns a list of regression messages."""
+    previous = {(r["format"], r["items"]): r for r in baseline["results"]}
+    problems = []
+    for result in report["results"]:
+        old = previous.get((result["format"], result["items"]))
+        if old is None:
+            continue
+        label = f"{result['format']} {result['items']} items"
+        if (result["seconds"] > old["seconds"] * TIME_TOLERANCE
+                and result["seconds"] - old["seconds"] > MIN_TIME_DELTA):
+            problems.append(f"{label}: {result['seconds']:.3f}s vs {old['seconds']:.3f}s")
+        if result["pdf_bytes"] > old["pdf_bytes"] * SIZE_TOLERANCE:
+            problems.append(f"{label}: {result['pdf_bytes']} bytes vs {old['pdf_bytes']}")
+        if result["pages"] != old["pages"]:
+            problems.append(f"{label}: {result['pages']} pages vs {old['pages']}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PO rendering.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="line-item counts to render")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument("--out", default="bench_results.json", help="where to write the JSON results")
+    parser.add_argument("--check", metavar="BASELINE", help="fail if slower/larger than this results file")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.formats)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.check:
+        with open(args.check, encoding="utf-8") as f:
+            problems = check(report, json.load(f))
+        if problems:
+            print("Regressions against", args.check)
+            for problem in problems:
+                print("  " + problem)
+            return 1
+        print("No regressions against", args.check)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Content-addressed cache of rendered PO PDFs.
+
+The key is a SHA-256 of the format, every header field, the line-item
+columns and the rendering backend, so identical inputs map to the same PDF
+bytes no matter which session or rerun asks for them. Entries are evicted least recently used
+first once either the byte budget or the entry limit is exceeded.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import fields
+
+from po_models import DEFAULT_BACKEND, po_format
+
+MAX_BYTES = 64 * 1024 * 1024
+MAX_ENTRIES = 256
+
+
+def po_key(po, backend=DEFAULT_BACKEND) -> str:
+    """Stable hash of everything that ends up on the PDF."""
+    digest = hashlib.sha256()
+    header = {f.name: getattr(po, f.name) for f in fields(po) if f.name != "line_items"}
+    header["format"] = po_format(po)
+    if backend != DEFAULT_BACKEND:
+        header["backend"] = backend  # canvas keys stay what they were before backends existed
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode())
+    items = po.line_items
+    for name in items.text_fields:
+        digest.update(b"\0" + json.dumps(items.text(name)).encode())
+    # The numeric columns are hashed as raw int64 bytes, no per-row work
+    digest.update(b"\0" + items.qty.tobytes())
+    digest.update(b"\0" + items.unit_cents.tobytes())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Thread-safe LRU of PDF bytes with a byte budget."""
+
+    def __init__(self, max_bytes=MAX_BYTES, max_entries=MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            pdf = self._entries.get(key)
+            if pdf is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return pdf
+
+    def put(self, key, pdf: bytes):
+        if len(pdf) > self.max_bytes:
+            return  # would evict everything else and still not fit
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = pdf
+            self.size += len(pdf)
+            while self.size > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def render(self, po, render, backend=DEFAULT_BACKEND):
+        """Return ``render(po, backend)``, reusing the bytes of an identical earlier render."""
+        key = po_key(po, backend)
+        pdf = self.get(key)
+        if pdf is None:
+            pdf = render(po, backend)
+            self.put(key, pdf)
+        return pdf
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# One cache per process, shared by every Streamlit session
+render_cache = RenderCache()
+
+
+def cached_render_po(po, backend=DEFAULT_BACKEND) -> bytes:
+    from po_render import render_po
+    return render_cache.render(po, render_po, backend)
@@ -0,0 +1,103 @@
+"""Cold-start benchmark: first page load and first PDF in a fresh process.
+
+    python po_coldstart.py
+    python po_coldstart.py --runs 10 --pause 0
+
+Every run starts a new Python process, as a container restart does, and
+measures two paths:
+
+* app: streamlit_app.py's first script run (the first page a user sees),
+  then -- after ``--pause`` seconds standing in for the user filling in the
+  form -- the first "Generate PDF" on the local screen, through AppTest.
+* library: importing po_render plus the first render_po() call, which is
+  what a po_batch / po_server worker pays before its first PDF.
+
+Prints the median and best of each over ``--runs`` processes.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import date
+
+from po_models import LocalPO, po_to_dict
+from po_paths import BASE_DIR
+
+APP = os.path.join(BASE_DIR, "streamlit_app.py")
+
+_APP_RUN = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+args = json.loads(sys.argv[1])
+start = time.perf_counter()
+at = AppTest.from_file(args["app"], default_timeout=300).run()
+loaded = time.perf_counter()
+time.sleep(args["pause"])
+button = next(b for b in at.button if b.label == "Generate PDF")
+clicked = time.perf_counter()
+button.click().run()
+rendered = time.perf_counter()
+job = at.session_state["local_job"]
+print(json.dumps({"page_load": loaded - start, "first_pdf": rendered - clicked,
+                  "ok": not at.exception and job.state == "done"}))
+"""
+
+_LIBRARY_RUN = """
+import json, sys, time
+from po_models import po_from_dict
+po = po_from_dict(json.loads(sys.argv[1])["po"])
+start = time.perf_counter()
+from po_render import render_po
+imported = time.perf_counter()
+pdf = render_po(po)
+rendered = time.perf_counter()
+print(json.dumps({"import": imported - start, "first_pdf": rendered - imported, "ok": pdf.startswith(b"%PDF")}))
+"""
+
+
+def _child(code, args, env):
+    out = subprocess.run([sys.executable, "-c", code, json.dumps(args)], capture_output=True, text=True,
+                         env=env, cwd=os.path.dirname(APP), check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def run(runs, pause):
+    po = LocalPO(po_no="COLD-START-1", po_date=date(2025, 1, 1),
+                 line_items=[{"description": "Cold start", "unit": "EA", "qty": 1, "unit_cost": "10.00"}])
+    results = {"app": [], "library": []}
+    with tempfile.TemporaryDirectory() as scratch:
+        # Generated POs are saved to the history database; keep them out of the real one
+        env = dict(os.environ, PO_HISTORY_DB=os.path.join(scratch, "history.sqlite3"))
+        for _ in range(runs):
+            results["app"].append(_child(_APP_RUN, {"app": APP, "pause": pause}, env))
+            results["library"].append(_child(_LIBRARY_RUN, {"po": po_to_dict(po)}, env))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time first page load and first PDF in fresh processes.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh processes per path")
+    parser.add_argument("--pause", type=float, default=1.0,
+                        help="seconds between page load and Generate PDF (the user filling in the form)")
+    args = parser.parse_args(argv)
+
+    results = run(args.runs, args.pause)
+    failed = 0
+    for path, samples in results.items():
+        failed += sum(not sample["ok"] for sample in samples)
+        for metric in samples[0]:
+            if metric == "ok":
+                continue
+            values = [sample[metric] for sample in samples]
+            print(f"{path:8} {metric:10} median {statistics.median(values) * 1000:7.1f} ms  "
+                  f"best {min(values) * 1000:7.1f} ms")
+    if failed:
+        print(f"{failed} runs did not produce a PDF")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
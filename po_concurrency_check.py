@@ -0,0 +1,119 @@
+"""Check that simultaneous sessions each get their own foreign PO.
+
+    python po_concurrency_check.py --sessions 16
+
+1. N threads (one per simulated session) render distinct foreign POs at the
+   same moment through the app's render path, from an empty scratch working
+   directory. Every session must get back a PDF titled with its own PO No.
+   and nothing may be written to the file system.
+2. N Streamlit sessions (streamlit.testing AppTest, which can't run in
+   parallel threads) are stepped through the foreign screen interleaved; each
+   session's PDF must carry its own PO No.
+
+Exits 1 if any check fails.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+from po_bench import synthetic_po
+from po_cache import cached_render_po, render_cache
+from po_paths import BASE_DIR
+
+APP = os.path.join(BASE_DIR, "streamlit_app.py")
+
+_TITLE = re.compile(rb"/Title \((.*?)\)")
+
+
+def pdf_title(pdf: bytes) -> str:
+    match = _TITLE.search(pdf)
+    return match.group(1).decode() if match else ""
+
+
+def check_threads(sessions, items):
+    render_cache.clear()
+    barrier = threading.Barrier(sessions)
+    results = {}
+
+    def session(i):
+        po = synthetic_po("foreign", items)
+        po.po_no = f"SESSION-{i:03d}"
+        po.po_date = date(2025, 6, 2)
+        barrier.wait()
+        results[i] = cached_render_po(po)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            start = time.perf_counter()
+            threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            seconds = time.perf_counter() - start
+            leftovers = os.listdir(scratch)
+        finally:
+            os.chdir(cwd)
+
+    problems = [f"session {i}: got PDF titled {pdf_title(results.get(i, b''))!r}"
+                for i in range(sessions) if pdf_title(results.get(i, b"")) != f"SESSION-{i:03d}"]
+    if leftovers:
+        problems.append(f"files written to the working directory: {leftovers}")
+    print(f"threads:  {sessions} sessions rendered in {seconds:.2f}s, {len(problems)} problems")
+    return problems
+
+
+def check_app_sessions(sessions):
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("app:      skipped (streamlit.testing not available)")
+        return []
+
+    os.environ.setdefault("PO_HISTORY_DB", os.path.join(tempfile.mkdtemp(), "history.sqlite3"))
+
+    apps = []
+    for i in range(sessions):
+        at = AppTest.from_file(APP, default_timeout=120).run()
+        at.sidebar.selectbox[0].select("Foreign Report Format").run()
+        apps.append(at)
+    # Interleave: every session edits its PO No. before any of them renders
+    for i, at in enumerate(apps):
+        at.text_input(key="foreign_po_no").input(f"APP-SESSION-{i:03d}").run()
+    for at in apps:
+        next(b for b in at.button if b.label == "Generate PDF").click().run()
+
+    problems = []
+    for i, at in enumerate(apps):
+        job = at.session_state["foreign_job"] if "foreign_job" in at.session_state else None
+        title = pdf_title(job.result or b"") if job is not None else ""
+        if title != f"APP-SESSION-{i:03d}":
+            problems.append(f"app session {i}: got PDF titled {title!r}")
+    print(f"app:      {sessions} sessions, {len(problems)} problems")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session isolation check for foreign POs.")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--items", type=int, default=25, help="line items per PO in the threaded check")
+    parser.add_argument("--no-app", action="store_true", help="skip the Streamlit AppTest sessions")
+    args = parser.parse_args(argv)
+
+    problems = check_threads(args.sessions, args.items)
+    if not args.no_app:
+        problems += check_app_sessions(args.sessions)
+    for problem in problems:
+        print("  " + problem)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Head-to-head benchmark of the rendering backends (po_models.BACKENDS).
+
+    python po_enginebench.py
+    python po_enginebench.py --sizes 1 100 1000 --formats local --out engines.json
+
+Each backend, format and line-item count is measured in a fresh process
+with po_bench.bench_one (median wall time after a warm-up, tracemalloc
+peak, PDF size and pages), plus the growth in peak RSS over the timed
+renders, which also counts memory held by C libraries such as pango. The
+table ends with the faster backend for every format and size; a backend
+that can't load here (WeasyPrint without pango, say) is reported and
+left out of the comparison.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from po_models import BACKENDS
+
+SIZES = [1, 10, 100, 1_000]
+FORMATS = ["local", "foreign"]
+
+_CHILD = """
+import json, resource, sys
+args = json.loads(sys.argv[1])
+try:
+    from po_bench import bench_one, synthetic_po
+    from po_render import render_po
+    render_po(synthetic_po(args["format"], 1), args["backend"])  # imports, fonts, templates
+except (ImportError, OSError) as e:
+    print(json.dumps({"error": f"{type(e).__name__}: {e}"}))
+    sys.exit()
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+result = bench_one(args["format"], args["items"], args["backend"])
+result["rss_growth_bytes"] = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before) * 1024
+print(json.dumps(result))
+"""
+
+
+def measure(backend, fmt, n_items):
+    args = {"backend": backend, "format": fmt, "items": n_items}
+    out = subprocess.run([sys.executable, "-c", _CHILD, json.dumps(args)], capture_output=True, text=True,
+                         check=True).stdout
+    return {"backend": backend, **json.loads(out.strip().splitlines()[-1])}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the rendering backends.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="line-item counts to render")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--out", default="engine_results.json", help="where to write the JSON results")
+    args = parser.parse_args(argv)
+
+    results = []
+    unavailable = {}
+    for backend in args.backends:
+        for fmt in args.formats:
+            for n_items in args.sizes:
+                if backend in unavailable:
+                    break
+                result = measure(backend, fmt, n_items)
+                if "error" in result:
+                    unavailable[backend] = result["error"]
+                    print(f"{backend}: unavailable ({result['error']})")
+                    break
+                results.append(result)
+                print(f"{backend:7} {fmt:8} {n_items:>6} items  {result['seconds'] * 1000:9.1f} ms  "
+                      f"peak {result['peak_bytes'] / 1e6:7.1f} MB  RSS +{result['rss_growth_bytes'] / 1e6:6.1f} MB  "
+                      f"{result['pdf_bytes'] / 1e3:8.1f} KB  {result['pages']:>4} pages")
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"results": results, "unavailable": unavailable}, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    by_case = {}
+    for result in results:
+        by_case.setdefault((result["format"], result["items"]), []).append(result)
+    if len(set(r["backend"] for r in results)) < 2:
+        return 0
+    print("\nFaster backend per workload:")
+    for (fmt, n_items), rows in sorted(by_case.items()):
+        rows.sort(key=lambda r: r["seconds"])
+        best, other = rows[0], rows[-1]
+        print(f"  {fmt:8} {n_items:>6} items  {best['backend']:7} "
+              f"({other['seconds'] / best['seconds']:.1f}x faster than {other['backend']}, "
+              f"PDF {best['pdf_bytes'] / other['pdf_bytes']:.2f}x the size)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
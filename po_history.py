@@ -0,0 +1,213 @@
+"""Persistent history of generated POs (SQLite).
+
+Every generated PO is stored with its full payload (po_models.po_to_dict as
+JSON), one row per format + PO No.; generating the same PO No. again
+replaces the row. The searchable columns are declared COLLATE NOCASE and
+indexed, so case-insensitive prefix searches (LIKE 'abc%') are index range
+scans and stay fast at hundreds of thousands of rows.
+
+    python po_history.py search MSIC-PO-A065
+    python po_history.py bench --count 300000     # search timings on a scratch DB
+"""
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from po_models import ForeignPO, po_format, po_from_dict, po_to_dict
+from po_paths import BASE_DIR
+
+DB_PATH = os.environ.get("PO_HISTORY_DB", os.path.join(BASE_DIR, "po_history.sqlite3"))
+SEARCH_LIMIT = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pos (
+    id INTEGER PRIMARY KEY,
+    format TEXT NOT NULL,
+    po_no TEXT NOT NULL COLLATE NOCASE,
+    pr_number TEXT NOT NULL COLLATE NOCASE,
+    supplier TEXT NOT NULL COLLATE NOCASE,
+    company TEXT NOT NULL COLLATE NOCASE,
+    po_date TEXT NOT NULL,
+    saved_at TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    UNIQUE (format, po_no)
+);
+CREATE INDEX IF NOT EXISTS pos_po_no ON pos (po_no);
+CREATE INDEX IF NOT EXISTS pos_pr_number ON pos (pr_number);
+CREATE INDEX IF NOT EXISTS pos_supplier ON pos (supplier);
+CREATE INDEX IF NOT EXISTS pos_company ON pos (company);
+CREATE INDEX IF NOT EXISTS pos_po_date ON pos (po_date, po_no);
+"""
+
+SEARCH_COLUMNS = ("po_no", "pr_number", "supplier", "company")
+# Above this many matches a search walks the po_date index instead
+BROAD_MATCHES = 2_000
+
+# Matches per column, counted on the column indexes and capped at :cap
+_COUNT = "SELECT " + " + ".join(
+    f"(SELECT count(*) FROM (SELECT 1 FROM pos WHERE {column} LIKE :prefix ESCAPE '\\' LIMIT :cap))"
+    for column in SEARCH_COLUMNS
+)
+
+# Narrow prefixes: one index range scan per column, each branch keeping its
+# newest ``limit`` matches, so only the matching rows are ever sorted
+_SEARCH = " UNION ".join(
+    f"SELECT * FROM (SELECT id, format, po_no, pr_number, supplier, company, po_date FROM pos "
+    f"WHERE {column} LIKE :prefix ESCAPE '\\' ORDER BY po_date DESC, po_no DESC LIMIT :limit)"
+    for column in SEARCH_COLUMNS
+) + " ORDER BY po_date DESC, po_no DESC LIMIT :limit"
+
+# Broad prefixes: read newest-first off the po_date index and stop at
+# ``limit`` matches, which come early when matches are common
+_SEARCH_BROAD = (
+    "SELECT id, format, po_no, pr_number, supplier, company, po_date FROM pos INDEXED BY pos_po_date WHERE "
+    + " OR ".join(f"{column} LIKE :prefix ESCAPE '\\'" for column in SEARCH_COLUMNS)
+    + " ORDER BY po_date DESC, po_no DESC LIMIT :limit"
+)
+
+_RECENT = ("SELECT id, format, po_no, pr_number, supplier, company, po_date FROM pos "
+           "ORDER BY po_date DESC, po_no DESC LIMIT :limit")
+
+
+@dataclass
+class HistoryEntry:
+    id: int
+    format: str
+    po_no: str
+    pr_number: str
+    supplier: str
+    company: str
+    po_date: date
+
+    @property
+    def label(self):
+        return f"{self.po_no} · {self.company or self.supplier} · {self.po_date:%d %b %Y}"
+
+
+def _columns(po):
+    """Searchable column values of a PO of either format."""
+    if isinstance(po, ForeignPO):
+        return {"pr_number": po.pr_no, "supplier": po.to_name, "company": po.company}
+    return {"pr_number": po.pr_number, "supplier": po.supplier, "company": po.company_name}
+
+
+class POHistory:
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        # sqlite3 connections can't be shared between threads, and every
+        # Streamlit session runs on its own thread
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")  # readers don't block the writer
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def save(self, po):
+        """Store (or replace) ``po``; returns its row id."""
+        row = {
+            "format": po_format(po),
+            "po_no": po.po_no,
+            **_columns(po),
+            "po_date": po.po_date.isoformat(),
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+            "payload": json.dumps(po_to_dict(po)),
+        }
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO pos (format, po_no, pr_number, supplier, company, po_date, saved_at, payload) "
+                "VALUES (:format, :po_no, :pr_number, :supplier, :company, :po_date, :saved_at, :payload) "
+                "ON CONFLICT (format, po_no) DO UPDATE SET pr_number = excluded.pr_number, "
+                "supplier = excluded.supplier, company = excluded.company, po_date = excluded.po_date, "
+                "saved_at = excluded.saved_at, payload = excluded.payload",
+                row,
+            )
+            return conn.execute("SELECT id FROM pos WHERE format = ? AND po_no = ?",
+                                (row["format"], row["po_no"])).fetchone()[0]
+
+    def search(self, text, limit=SEARCH_LIMIT):
+        """POs whose PO No., PR Number, supplier or company starts with ``text`` (any case), newest first.
+
+        An empty query lists the most recent POs.
+        """
+        text = text.strip()
+        conn = self._connect()
+        if not text:
+            rows = conn.execute(_RECENT, {"limit": limit}).fetchall()
+        else:
+            prefix = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            params = {"prefix": prefix, "limit": limit, "cap": BROAD_MATCHES + 1}
+            broad = conn.execute(_COUNT, params).fetchone()[0] > BROAD_MATCHES
+            rows = conn.execute(_SEARCH_BROAD if broad else _SEARCH, params).fetchall()
+        return [HistoryEntry(*row[:-1], date.fromisoformat(row[-1])) for row in rows]
+
+    def load(self, entry_id):
+        """The stored PO with row id ``entry_id``, ready to render."""
+        row = self._connect().execute("SELECT payload FROM pos WHERE id = ?", (entry_id,)).fetchone()
+        if row is None:
+            raise KeyError(entry_id)
+        return po_from_dict(json.loads(row[0]))
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM pos").fetchone()[0]
+
+
+def _bench(count, queries):
+    from po_bench import synthetic_po
+
+    with tempfile.TemporaryDirectory() as scratch:
+        history = POHistory(os.path.join(scratch, "history.sqlite3"))
+        po = synthetic_po("local", 5)
+        payload = json.dumps(po_to_dict(po))
+        start = time.perf_counter()
+        with history._connect() as conn:
+            conn.executemany(
+                "INSERT INTO pos (format, po_no, pr_number, supplier, company, po_date, saved_at, payload) "
+                "VALUES ('local', ?, ?, ?, ?, ?, '', ?)",
+                ((f"MSIC-PO-A{i:06d}-{i % 12 + 1:02d}-2025", f"MSIC-PR-A{i:06d}", f"Supplier {i % 5000}",
+                  f"Company {i % 20000} Trading", date(2020 + i % 6, i % 12 + 1, i % 28 + 1).isoformat(), payload)
+                 for i in range(count)),
+            )
+        print(f"inserted {count:,} POs in {time.perf_counter() - start:.1f}s")
+        for query in queries:
+            times = []
+            for _ in range(5):
+                start = time.perf_counter()
+                hits = history.search(query)
+                times.append(time.perf_counter() - start)
+            print(f"search {query!r:28} {len(hits):3} hits  best {min(times) * 1000:6.2f} ms  "
+                  f"worst {max(times) * 1000:6.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PO history database.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    search = commands.add_parser("search", help="search the history")
+    search.add_argument("text", nargs="?", default="")
+    search.add_argument("--db", default=DB_PATH)
+    bench = commands.add_parser("bench", help="time searches on a scratch database")
+    bench.add_argument("--count", type=int, default=300_000)
+    args = parser.parse_args(argv)
+
+    if args.command == "search":
+        for entry in POHistory(args.db).search(args.text):
+            print(f"{entry.id:>8}  {entry.format:8} {entry.label}")
+    else:
+        _bench(args.count, ["", "M", "msic-po-a0123", "MSIC-PR-A000999", "supplier 42", "Company 1999",
+                            "no such po"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""HS code reference table: suggestions and validation for foreign line items.
+
+hs_codes.csv (next to this file, or PO_HS_CODES_FILE) has ``code`` and
+``description`` columns; codes may be written with dots or spaces
+("8481.80"). The bundled file lists the HS chapters; drop in the full
+nomenclature export (chapters, headings and subheadings in the same two
+columns) to check codes down to the subheading.
+
+Codes are kept in a sorted PrefixIndex, so suggestions and the
+longest-known-prefix lookup behind validation are O(log n). The table is
+reloaded when the file changes.
+"""
+import os
+import re
+
+from po_master import MasterFile, PrefixIndex
+from po_paths import BASE_DIR
+
+HS_CODES_PATH = os.environ.get("PO_HS_CODES_FILE", os.path.join(BASE_DIR, "hs_codes.csv"))
+
+# HS subheadings are 6 digits; national tariff lines add up to 6 more
+MIN_DIGITS, MAX_DIGITS = 6, 12
+
+
+def normalise_code(code) -> str:
+    return re.sub(r"[\s.\-]", "", str(code))
+
+
+class HSCodeTable(MasterFile):
+    def _load(self):
+        index = super()._load()
+        return PrefixIndex((normalise_code(record["code"]), {**record, "code": normalise_code(record["code"])})
+                           for record in index.values)
+
+    def suggest(self, prefix, limit=10):
+        """Known codes starting with ``prefix``, as {"code", "description"} records."""
+        return self.search(normalise_code(prefix), limit)
+
+    def lookup(self, code):
+        """Record of the longest known code that ``code`` starts with, or None."""
+        code = normalise_code(code)
+        index = self.index()
+        for length in range(min(len(code), MAX_DIGITS), 1, -1):
+            record = index.get(code[:length])
+            if record is not None:
+                return record
+        return None
+
+    def validate(self, code):
+        """Problem with ``code`` as a string, or None if it looks right."""
+        code = normalise_code(code)
+        if not code:
+            return "HS code is empty"
+        if not code.isdigit():
+            return "HS code must contain digits only"
+        if not MIN_DIGITS <= len(code) <= MAX_DIGITS:
+            return f"HS code must have {MIN_DIGITS} to {MAX_DIGITS} digits"
+        if len(self.index()) and self.lookup(code) is None:
+            return f"Unknown HS chapter/heading {code[:2]}"
+        return None
+
+    def validate_line_items(self, items):
+        """[(Sr. No., code, problem)] for every line item with a bad HS code.
+
+        Each distinct code is checked once, so a 10,000-row PO with a
+        hundred different codes costs a hundred lookups.
+        """
+        codes = items.text("hs_code")
+        problems = {code: self.validate(code) for code in set(codes)}
+        return [(i + 1, code, problems[code]) for i, code in enumerate(codes) if problems[code]]
+
+
+hs_codes = HSCodeTable(HS_CODES_PATH, ("code", "description"), ("code",))
@@ -0,0 +1,88 @@
+"""HTML rendering backend: Jinja2 templates laid out by WeasyPrint.
+
+    po_render.render_po(po, backend="html")
+
+The templates in TEMPLATE_DIR are compiled once per process and kept
+(auto_reload is off), and the stylesheet, @font-face rules included, is
+parsed once and reused for every document, so a render only pays for
+filling in the template and laying it out. Line-item tables use <thead>,
+which WeasyPrint repeats on every page; the letterhead and footer are
+fixed-position and repeat the same way.
+
+WeasyPrint needs pango at run time, so it is imported on first use; the
+canvas backend in po_render works without it.
+"""
+import os
+import threading
+from pathlib import Path
+
+from po_assets import FONT_PATHS, LOGO_PATH_FOOTER, LOGO_PATH_LEFT, LOGO_PATH_RIGHT
+from po_metrics import stage, trace
+from po_models import FOREIGN_COLUMNS, LOCAL_COLUMNS, SHIPPING_COLUMNS, format_cents, po_format
+from po_paths import BASE_DIR
+
+TEMPLATE_DIR = os.path.join(BASE_DIR, "templates")
+
+_lock = threading.Lock()
+_engine = None  # (jinja2 Environment, weasyprint CSS, FontConfiguration)
+
+
+def _load_engine():
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+    from weasyprint import CSS
+    from weasyprint.text.fonts import FontConfiguration
+
+    from po_render import FOREIGN_COL_WIDTHS, LOCAL_COL_WIDTHS
+
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape(["html"]),
+                      auto_reload=False, trim_blocks=True, lstrip_blocks=True)
+    env.globals.update(
+        logo_left=Path(LOGO_PATH_LEFT).as_uri(),
+        logo_right=Path(LOGO_PATH_RIGHT).as_uri(),
+        logo_footer=Path(LOGO_PATH_FOOTER).as_uri(),
+        fonts={name: Path(path).as_uri() for name, path in FONT_PATHS.items()},
+        LOCAL_COLUMNS=LOCAL_COLUMNS,
+        FOREIGN_COLUMNS=FOREIGN_COLUMNS,
+        SHIPPING_COLUMNS=SHIPPING_COLUMNS,
+        LOCAL_COL_WIDTHS=LOCAL_COL_WIDTHS,
+        FOREIGN_COL_WIDTHS=FOREIGN_COL_WIDTHS,
+    )
+    font_config = FontConfiguration()
+    css = CSS(string=env.get_template("po.css").render(), font_config=font_config)
+    return env, css, font_config
+
+
+def engine():
+    """The process-wide (Environment, stylesheet, font configuration), built on first use."""
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = _load_engine()
+    return _engine
+
+
+def po_html(po) -> str:
+    """The filled-in HTML for ``po``, before layout."""
+    from po_render import iter_foreign_table_rows, iter_local_table_rows
+
+    env, _, _ = engine()
+    fmt = po_format(po)
+    rows = iter_foreign_table_rows(po) if fmt == "foreign" else iter_local_table_rows(po)
+    # Rows are a generator: Jinja formats them while it writes the table
+    return env.get_template(f"{fmt}_po.html").render(po=po, rows=rows, format_cents=format_cents)
+
+
+def write_po_html(po, sink):
+    """Render either PO type into ``sink`` through WeasyPrint."""
+    from weasyprint import HTML
+
+    with trace(f"{po_format(po)}-html", items=len(po.line_items)):
+        with stage("fonts"):
+            _, css, font_config = engine()
+        with stage("template"):
+            html = po_html(po)
+        with stage("layout"):
+            document = HTML(string=html, base_url=BASE_DIR).render(stylesheets=[css], font_config=font_config)
+        with stage("save"):
+            document.write_pdf(target=sink)
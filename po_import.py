@@ -0,0 +1,196 @@
+"""Bulk line-item import from CSV or Excel supplier sheets.
+
+Files are read in chunks of CHUNK_ROWS rows; each chunk is validated with
+vectorized pandas/NumPy operations and appended to a LineItems store in one
+go, so a 100k-row sheet never exists as one big DataFrame.
+"""
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# pandas is imported by the functions that read sheets: the app imports this
+# module on startup (for import_template), long before anyone uploads a file
+from po_models import MAX_INT64, ForeignLineItem, LineItems
+
+CHUNK_ROWS = 10_000
+MAX_REPORTED_ERRORS = 50
+
+# Accepted header spellings per line-item field (compared after normalising)
+COLUMN_ALIASES = {
+    "description": ["description", "item description", "desc"],
+    "unit": ["unit", "uom", "unit of measure"],
+    "hs_code": ["hs code", "hscode", "hs"],
+    "product_description": ["product description", "description", "item description", "desc"],
+    "uom": ["uom", "unit", "unit of measure"],
+    "qty": ["qty", "quantity"],
+    "unit_cost": ["unit cost", "unit price", "price", "rate"],
+}
+
+# Which text column must be filled in for a row to count
+REQUIRED_TEXT = {"description", "product_description"}
+
+_MONEY = r"^(\d+)(?:\.(\d*))?$"
+
+
+@dataclass
+class ImportResult:
+    added: int = 0
+    skipped: int = 0
+    first_sr_no: int = 0
+    last_sr_no: int = 0
+    errors: list = field(default_factory=list)  # (file row number, message)
+
+    def _error(self, row, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((row, message))
+
+
+def _normalise(header):
+    return re.sub(r"[^a-z0-9]+", " ", str(header).lower()).strip()
+
+
+def _map_columns(headers, store):
+    """Map the sheet's headers onto the store's fields; raise ValueError if any is missing."""
+    wanted = store.text_fields + ("qty", "unit_cost")
+    normalised = {_normalise(h): h for h in headers}
+    mapping = {}
+    for name in wanted:
+        for alias in COLUMN_ALIASES[name]:
+            if alias in normalised and normalised[alias] not in mapping.values():
+                mapping[name] = normalised[alias]
+                break
+    missing = [name for name in wanted if name not in mapping]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)} (found: {', '.join(map(str, headers))})")
+    return mapping
+
+
+def _money_to_cents(values):
+    """Vectorized money parse to integer cents, rounding half up; NaN where invalid."""
+    import pandas as pd
+
+    text = values.str.replace(",", "", regex=False).str.strip()
+    parts = text.str.extract(_MONEY)
+    frac = parts[1].fillna("").str.ljust(3, "0").str[:3]
+    cents = pd.to_numeric(parts[0], errors="coerce") * 100 + pd.to_numeric(frac.str[:2], errors="coerce")
+    cents += (pd.to_numeric(frac.str[2], errors="coerce") >= 5).astype(int)
+    # Anything else numeric (e.g. 1e3 from Excel) goes through float
+    fallback = pd.to_numeric(text, errors="coerce")
+    return cents.where(parts[0].notna(), np.floor(fallback * 100 + 0.5))
+
+
+def _validate_chunk(chunk, mapping, store, first_row, result):
+    import pandas as pd
+
+    chunk = chunk.rename(columns={v: k for k, v in mapping.items()})
+    chunk = chunk.fillna("").astype(str)
+    for name in store.text_fields:
+        chunk[name] = chunk[name].str.strip()
+
+    # Entirely blank rows (trailing lines in Excel exports) are ignored quietly
+    blank = (chunk[list(mapping)] == "").all(axis=1)
+    chunk = chunk[~blank]
+    if chunk.empty:
+        return
+
+    qty = pd.to_numeric(chunk["qty"].str.replace(",", "", regex=False), errors="coerce")
+    cents = _money_to_cents(chunk["unit_cost"])
+
+    # Compared as floats: inf, 1e400 and 1e20 must not reach the int64 columns
+    limit = float(MAX_INT64)
+    checks = [
+        (qty.isna(), "Qty is not a number"),
+        (qty.notna() & ((qty % 1 != 0) | (qty < 1) | (qty >= limit)), "Qty must be a whole number of at least 1"),
+        (cents.isna() | (cents < 0) | (cents >= limit), "Unit Cost is not a valid amount"),
+        (qty.astype(float) * cents.astype(float) >= limit, "Total Price is too large"),
+    ]
+    for name in REQUIRED_TEXT.intersection(store.text_fields):
+        checks.append((chunk[name] == "", f"{name.replace('_', ' ').capitalize()} is empty"))
+
+    bad = np.zeros(len(chunk), dtype=bool)
+    for mask, message in checks:
+        mask = mask.to_numpy() & ~bad
+        for row in chunk.index[mask]:
+            result._error(first_row + int(row), message)
+        bad |= mask
+
+    good = chunk[~bad]
+    if good.empty:
+        return
+    start = len(store)
+    store.extend_columns(
+        {name: good[name].tolist() for name in store.text_fields},
+        qty[~bad].to_numpy(dtype=np.int64),
+        cents[~bad].to_numpy(dtype=np.int64),
+    )
+    # Sr. No. is the 1-based position in the store
+    sr_nos = np.arange(start + 1, len(store) + 1)
+    if not result.added:
+        result.first_sr_no = int(sr_nos[0])
+    result.last_sr_no = int(sr_nos[-1])
+    result.added += len(sr_nos)
+
+
+def _csv_chunks(source):
+    import pandas as pd
+
+    return pd.read_csv(source, dtype=str, keep_default_na=False, chunksize=CHUNK_ROWS,
+                       skipinitialspace=True, encoding="utf-8-sig")
+
+
+def _excel_chunks(source):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportError("Excel import needs openpyxl (pip install openpyxl)") from None
+    import pandas as pd
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = next(rows, None)
+        if headers is None:
+            return
+        headers = [h if h is not None else f"column {i}" for i, h in enumerate(headers)]
+        buffer = []
+        for row in rows:
+            # Whole-number cells (HS codes, quantities) come back as floats
+            buffer.append([int(v) if isinstance(v, float) and v.is_integer() else v for v in row])
+            if len(buffer) == CHUNK_ROWS:
+                yield pd.DataFrame(buffer, columns=headers)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=headers)
+    finally:
+        workbook.close()
+
+
+def import_line_items(source, store: LineItems, filename=None) -> ImportResult:
+    """Append the rows of a CSV/Excel sheet (path or file-like) to ``store``.
+
+    Invalid rows are skipped and reported in the result with their sheet row
+    number; a missing required column raises ValueError before anything is added.
+    """
+    name = (filename or getattr(source, "name", None) or str(source)).lower()
+    chunks = _excel_chunks(source) if name.endswith((".xlsx", ".xlsm")) else _csv_chunks(source)
+
+    result = ImportResult()
+    mapping = None
+    first_row = 2  # row 1 is the header
+    for chunk in chunks:
+        if mapping is None:
+            mapping = _map_columns(list(chunk.columns), store)
+        chunk = chunk.reset_index(drop=True)
+        _validate_chunk(chunk, mapping, store, first_row, result)
+        first_row += len(chunk)
+    result.errors.sort()
+    return result
+
+
+def import_template(item_cls) -> str:
+    """Header line for an empty import sheet."""
+    if item_cls is ForeignLineItem:
+        return "HS Code,Product Description,UoM,Qty,Unit Cost\n"
+    return "Description,Unit,Qty,Unit Cost\n"
@@ -0,0 +1,175 @@
+"""Background PDF rendering for the app.
+
+"Generate PDF" submits a job to a small thread pool instead of rendering
+in the Streamlit script thread, so the session stays responsive, can show
+progress and can cancel. At most MAX_PENDING jobs (queued + running) are
+accepted per process; past that submit() raises QueueFull and the caller
+asks the user to retry, so a burst of big POs can't pile up behind each
+other and starve every other session on the server.
+
+Threads rather than processes: results land in the in-process render cache
+and a job only needs the PO it was given. Cancellation is cooperative: the
+renderer reports progress after each page/chunk of line items, and a
+cancelled job stops at the next report.
+"""
+import dataclasses
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from po_batch import warm_worker
+from po_cache import po_key, render_cache
+from po_metrics import last_trace
+from po_models import DEFAULT_BACKEND
+
+WORKERS = 2
+MAX_PENDING = 8
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class QueueFull(Exception):
+    pass
+
+
+class RenderCancelled(Exception):
+    pass
+
+
+class RenderJob:
+    def __init__(self, job_id, po, backend=DEFAULT_BACKEND):
+        # Snapshot, so edits made while the job runs don't leak into the PDF
+        self.po = dataclasses.replace(po, line_items=po.line_items.copy())
+        self.backend = backend
+        self.key = po_key(self.po, backend)
+        self._setup(job_id, len(po.line_items))
+
+    def _setup(self, job_id, total):
+        self.id = job_id
+        self.state = QUEUED
+        self.done = 0
+        self.total = total
+        self.result = None
+        self.error = None
+        self.trace = None  # stage timings, unless served from the cache
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+
+    @property
+    def fraction(self):
+        if self.state == DONE:
+            return 1.0
+        return self.done / self.total if self.total else 0.0
+
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def wait(self, timeout=None) -> bool:
+        """Block up to ``timeout`` seconds; True once the job has finished."""
+        return self._finished.wait(timeout)
+
+    def _progress(self, done, total):
+        if self._cancel.is_set():
+            raise RenderCancelled
+        self.done, self.total = done, total
+
+    def _render(self):
+        from po_render import render_po
+
+        return render_cache.render(self.po, render_po, self.backend)
+
+    def _run(self):
+        from po_render import progress_callback
+
+        try:
+            if self._cancel.is_set():
+                raise RenderCancelled
+            self.state = RUNNING
+            before = last_trace()
+            with progress_callback(self._progress):
+                self.result = self._render()
+            if last_trace() is not before:
+                self.trace = last_trace()
+            self.state = DONE
+        except RenderCancelled:
+            self.state = CANCELLED
+        except Exception as e:
+            self.error = e
+            self.state = FAILED
+        finally:
+            self.po = None  # the snapshot can be large; the PDF is all we need now
+            self._finished.set()
+
+
+class CollatedJob(RenderJob):
+    """Several POs in one PDF (po_render.render_collated); not cached.
+
+    ``load_pos`` is called on the worker thread and returns the POs, so
+    loading them doesn't hold up the session either.
+    """
+
+    def __init__(self, job_id, load_pos, title):
+        self.po = None
+        self.backend = "canvas"
+        self.key = None
+        self._load_pos = load_pos
+        self.title = title
+        self._setup(job_id, 0)
+
+    def _render(self):
+        from po_render import render_collated
+
+        pos = self._load_pos()
+        self._load_pos = None
+        self.total = sum(len(po.line_items) for po in pos)
+        return render_collated(pos, self.title)
+
+
+class RenderQueue:
+    def __init__(self, workers=WORKERS, max_pending=MAX_PENDING):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="po-render")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._ids = itertools.count(1)
+        self._warming = None
+
+    def warm(self):
+        """Load reportlab, fonts and letterhead images on a worker thread, once.
+
+        Called when the app starts, so the imports happen while the user
+        fills in the form instead of on their first "Generate PDF".
+        """
+        if self._warming is None:
+            self._warming = self._executor.submit(warm_worker)
+
+    def submit(self, po, backend=DEFAULT_BACKEND) -> RenderJob:
+        """Queue a render of ``po``; raises QueueFull when MAX_PENDING jobs are already in."""
+        return self._enqueue(lambda job_id: RenderJob(job_id, po, backend))
+
+    def submit_collated(self, load_pos, title) -> CollatedJob:
+        """Queue one PDF of the POs ``load_pos()`` returns; raises QueueFull like submit()."""
+        return self._enqueue(lambda job_id: CollatedJob(job_id, load_pos, title))
+
+    def _enqueue(self, make_job):
+        if not self._slots.acquire(blocking=False):
+            raise QueueFull(f"{self.max_pending} PDFs are already being rendered")
+        try:
+            job = make_job(next(self._ids))
+            future = self._executor.submit(job._run)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return job
+
+    @property
+    def pending(self):
+        return self.max_pending - self._slots._value
+
+
+# One queue per server process, shared by every session
+render_queue = RenderQueue()
@@ -0,0 +1,100 @@
+"""Page layouts as data, compiled into draw-op lists and replayed onto a canvas.
+
+A layout spec is a list of plain tuples:
+
+    ("font", name, size)            ("line_width", width)        ("stroke_rgb", r, g, b)
+    ("text", x, y, template)        ("centred", x, y, template)
+    ("line", x1, y1, x2, y2)        ("rect", x, y, width, height)
+    ("image", path, x, y, options)  ("paragraph", x, y, width, height, style, template)
+
+Templates are str.format strings filled from the values given to replay(),
+e.g. "{po_no}" or "{po_date:%d %b %Y}"; text without fields is resolved
+once, at compile time. compile_layout() only sets font, line width and
+stroke colour right before an op that uses them, and only when they differ
+from what is already set, so a spec can restate them freely without any
+cost per page.
+"""
+from string import Formatter
+
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Frame, Paragraph
+
+from po_assets import draw_image
+
+_STATE_OPS = {
+    "font": Canvas.setFont,
+    "line_width": Canvas.setLineWidth,
+    "stroke_rgb": Canvas.setStrokeColorRGB,
+}
+
+
+def _rect(c, x, y, width, height):
+    c.rect(x, y, width, height, stroke=1, fill=0)
+
+
+def _image(c, path, x, y, options):
+    draw_image(c, path, x, y, **options)
+
+
+def _paragraph(c, x, y, width, height, style, text):
+    # Drawn in a frame so long text wraps inside it
+    Frame(x, y, width, height, showBoundary=0).addFromList([Paragraph(text, style)], c)
+
+
+# op -> (draw function, state it depends on, whether the last argument is a template)
+_DRAW_OPS = {
+    "text": (Canvas.drawString, ("font",), True),
+    "centred": (Canvas.drawCentredString, ("font",), True),
+    "line": (Canvas.line, ("line_width", "stroke_rgb"), False),
+    "rect": (_rect, ("line_width", "stroke_rgb"), False),
+    "image": (_image, (), False),
+    "paragraph": (_paragraph, (), True),
+}
+
+
+def _has_fields(template):
+    return any(name is not None for _, name, _, _ in Formatter().parse(template))
+
+
+def compile_layout(spec):
+    """Compile a layout spec into [(function, args, template)] for replay()."""
+    ops = []
+    current = {}  # state op -> its arguments as last emitted
+    pending = {}  # state op -> arguments requested but not needed yet
+    for kind, *args in spec:
+        if kind in _STATE_OPS:
+            pending[kind] = tuple(args)
+            continue
+        draw, needs, templated = _DRAW_OPS[kind]
+        for state in needs:
+            wanted = pending.pop(state, None)
+            if wanted is not None and current.get(state) != wanted:
+                ops.append((_STATE_OPS[state], wanted, None))
+                current[state] = wanted
+        template = None
+        if templated:
+            *args, text = args
+            if _has_fields(text):
+                template = text
+            else:
+                args.append(text.format())
+        ops.append((draw, tuple(args), template))
+    # State set at the end still applies to whatever the caller draws next
+    for state, wanted in pending.items():
+        if current.get(state) != wanted:
+            ops.append((_STATE_OPS[state], wanted, None))
+    return ops
+
+
+def replay(c, ops, values=None, y=0):
+    """Draw compiled ``ops`` onto ``c``, filling templates from ``values``, shifted up by ``y``."""
+    if y:
+        c.saveState()
+        c.translate(0, y)
+    for draw, args, template in ops:
+        if template is None:
+            draw(c, *args)
+        else:
+            draw(c, *args, template.format_map(values))
+    if y:
+        c.restoreState()
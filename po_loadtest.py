@@ -0,0 +1,97 @@
+"""Load test for po_server.py.
+
+    python po_server.py --workers 4 &
+    python po_loadtest.py --clients 8 --requests 400 --items 50
+
+Each client thread keeps one HTTP/1.1 connection open and posts synthetic
+POs back to back. By default every request has a unique PO No., so the
+server's render cache doesn't answer it; --repeat sends the same PO every
+time to measure the cache path. Prints requests/s and latency percentiles.
+"""
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import threading
+import time
+
+from po_bench import synthetic_po
+from po_models import po_to_dict
+
+
+def _percentile(ordered, q):
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def run(host, port, clients, requests, fmt, items, repeat):
+    template = po_to_dict(synthetic_po(fmt, items))
+    counter = iter(range(requests))
+    lock = threading.Lock()
+    latencies, errors = [], []
+
+    def client(n):
+        conn = http.client.HTTPConnection(host, port, timeout=300)
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            payload = dict(template, po_no=template["po_no"] if repeat else f"LOAD-{n}-{i}")
+            body = json.dumps(payload)
+            start = time.perf_counter()
+            try:
+                conn.request("POST", "/render", body, {"Content-Type": "application/json"})
+                response = conn.getresponse()
+                data = response.read()
+            except (OSError, http.client.HTTPException) as e:
+                errors.append(repr(e))
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=300)
+                continue
+            elapsed = time.perf_counter() - start
+            if response.status != 200 or not data.startswith(b"%PDF"):
+                errors.append(f"HTTP {response.status}: {data[:200]!r}")
+            else:
+                latencies.append(elapsed)
+        conn.close()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    return latencies, errors, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test a running po_server.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--clients", type=int, default=8, help="concurrent keep-alive connections")
+    parser.add_argument("--requests", type=int, default=200, help="total requests")
+    parser.add_argument("--format", choices=["local", "foreign"], default="local")
+    parser.add_argument("--items", type=int, default=20, help="line items per PO")
+    parser.add_argument("--repeat", action="store_true", help="send the same PO every time (cache hits)")
+    args = parser.parse_args(argv)
+
+    latencies, errors, seconds = run(args.host, args.port, args.clients, args.requests,
+                                     args.format, args.items, args.repeat)
+    if latencies:
+        ordered = sorted(latencies)
+        print(f"{len(latencies)} OK, {len(errors)} errors in {seconds:.2f}s "
+              f"-> {len(latencies) / seconds:.1f} req/s")
+        print(f"latency ms: mean {statistics.mean(ordered) * 1000:.1f}  "
+              f"p50 {_percentile(ordered, 0.50) * 1000:.1f}  "
+              f"p90 {_percentile(ordered, 0.90) * 1000:.1f}  "
+              f"p99 {_percentile(ordered, 0.99) * 1000:.1f}  "
+              f"max {ordered[-1] * 1000:.1f}")
+    for error in errors[:5]:
+        print("  " + error)
+    return 1 if errors or not latencies else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
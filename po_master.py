@@ -0,0 +1,108 @@
+"""Supplier and consignee master data for autocomplete.
+
+suppliers.csv and consignees.csv (next to this file, or PO_SUPPLIERS_FILE /
+PO_CONSIGNEES_FILE) have one row per party, with columns named after the
+ForeignPO fields they fill in. Each file is loaded once per process into a
+PrefixIndex and reloaded when its modification time changes, so edits to
+the file show up without restarting the app.
+"""
+import csv
+import os
+import threading
+from bisect import bisect_left
+
+from po_paths import BASE_DIR
+
+SUPPLIER_FIELDS = ("to_name", "designation", "company", "telephone", "email", "fax", "mobile", "address")
+CONSIGNEE_FIELDS = ("consignee_name", "consignee_address", "consignee_contact", "consignee_tel",
+                    "consignee_fax", "consignee_email")
+
+SUPPLIERS_PATH = os.environ.get("PO_SUPPLIERS_FILE", os.path.join(BASE_DIR, "suppliers.csv"))
+CONSIGNEES_PATH = os.environ.get("PO_CONSIGNEES_FILE", os.path.join(BASE_DIR, "consignees.csv"))
+
+# Columns a party can be found by
+SUPPLIER_KEYS = ("company", "to_name")
+CONSIGNEE_KEYS = ("consignee_name",)
+
+
+def _normalise(text):
+    return " ".join(str(text).lower().split())
+
+
+class PrefixIndex:
+    """Sorted (key, value) pairs; prefix lookups are a bisect plus a short scan.
+
+    Keys are compared case- and whitespace-insensitively. A lookup costs
+    O(log n + limit), however many entries there are.
+    """
+
+    def __init__(self, entries=()):
+        pairs = sorted(((_normalise(key), value) for key, value in entries if str(key).strip()),
+                       key=lambda pair: pair[0])
+        self.keys = [key for key, _ in pairs]
+        self.values = [value for _, value in pairs]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def search(self, prefix, limit=20):
+        """Values whose key starts with ``prefix``, in key order."""
+        prefix = _normalise(prefix)
+        start = bisect_left(self.keys, prefix)
+        hits = []
+        for i in range(start, min(start + limit, len(self.keys))):
+            if not self.keys[i].startswith(prefix):
+                break
+            hits.append(self.values[i])
+        return hits
+
+    def get(self, key):
+        """Value stored under exactly ``key``, or None."""
+        key = _normalise(key)
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.values[i]
+        return None
+
+
+class MasterFile:
+    """A master CSV and its index, reloaded when the file changes."""
+
+    def __init__(self, path, fields, key_fields):
+        self.path = path
+        self.fields = fields
+        self.key_fields = key_fields
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._index = PrefixIndex()
+
+    def _load(self):
+        with open(self.path, newline="", encoding="utf-8-sig") as f:
+            records = [{name: (row.get(name) or "").strip() for name in self.fields} for row in csv.DictReader(f)]
+        # A party is listed once per key column it can be found by
+        return PrefixIndex((record[key], record) for record in records for key in self.key_fields)
+
+    def index(self) -> PrefixIndex:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return PrefixIndex()
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    self._index = self._load()
+                    self._mtime = mtime
+        return self._index
+
+    def search(self, prefix, limit=20):
+        """Distinct records with a key column starting with ``prefix``."""
+        hits, seen = [], set()
+        for record in self.index().search(prefix, limit * len(self.key_fields)):
+            if id(record) not in seen:
+                seen.add(id(record))
+                hits.append(record)
+        return hits[:limit]
+
+
+suppliers = MasterFile(SUPPLIERS_PATH, SUPPLIER_FIELDS, SUPPLIER_KEYS)
+consignees = MasterFile(CONSIGNEES_PATH, CONSIGNEE_FIELDS, CONSIGNEE_KEYS)
@@ -0,0 +1,98 @@
+"""Peak-memory benchmark for page-by-page PDF output.
+
+    python po_membench.py
+    python po_membench.py --pages 50 500 1000 --check
+
+Renders local POs of 25 to 500 pages, each in a fresh process, three ways:
+
+* file:      po_render.write_po() into a temporary file (what po_batch and
+             po_server's large-PO path do)
+* bytes:     po_render.render_po(), the same stream into memory; grows only
+             with the size of the finished PDF
+* reportlab: a plain reportlab Canvas, which holds every page until save()
+             (how rendering worked before po_stream)
+
+The figure reported is peak RSS during the render minus RSS just before it,
+after fonts and images are loaded and the PO is built. --check fails when
+the file path grows by more than FLAT_TOLERANCE_MB from the smallest to the
+largest PO.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+SIZES = [25, 100, 250, 500]
+MODES = ["file", "bytes", "reportlab"]
+# Line items that fill one continuation page of the local format
+ITEMS_PER_PAGE = 34
+FLAT_TOLERANCE_MB = 4
+
+_CHILD = """
+import json, resource, sys, tempfile
+from io import BytesIO
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+from po_bench import count_pages, synthetic_po
+from po_render import draw_local_po, render_po, write_po
+
+args = json.loads(sys.argv[1])
+render_po(synthetic_po("local", 1))  # fonts, images, imports
+po = synthetic_po("local", args["items"])
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+with tempfile.TemporaryFile() as f:
+    before = rss_mb()
+    if args["mode"] == "file":
+        write_po(po, f)
+    elif args["mode"] == "bytes":
+        f.write(render_po(po))
+    else:
+        buffer = BytesIO()
+        c = canvas.Canvas(buffer, pagesize=A4)
+        draw_local_po(c, po)
+        c.save()
+        f.write(buffer.getvalue())
+    peak = rss_mb() - before
+    f.seek(0)
+    pdf = f.read()
+print(json.dumps({"peak_mb": peak, "size": len(pdf), "pages": count_pages(pdf)}))
+"""
+
+
+def measure(mode, pages):
+    args = {"mode": mode, "items": pages * ITEMS_PER_PAGE}
+    out = subprocess.run([sys.executable, "-c", _CHILD, json.dumps(args)], capture_output=True, text=True,
+                         check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Peak RSS of rendering large POs, per output mode.")
+    parser.add_argument("--pages", type=int, nargs="+", default=SIZES, help="approximate page counts")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--check", action="store_true",
+                        help=f"exit 1 if file output grows more than {FLAT_TOLERANCE_MB} MB across sizes")
+    args = parser.parse_args(argv)
+
+    peaks = {}
+    for mode in args.modes:
+        for pages in args.pages:
+            result = measure(mode, pages)
+            peaks[mode, pages] = result["peak_mb"]
+            print(f"{mode:9} {result['pages']:4} pages  {result['size'] / 1e6:6.2f} MB PDF  "
+                  f"peak +{result['peak_mb']:6.1f} MB")
+
+    if args.check and "file" in args.modes:
+        growth = peaks["file", max(args.pages)] - peaks["file", min(args.pages)]
+        if growth > FLAT_TOLERANCE_MB:
+            print(f"File output grew {growth:.1f} MB from {min(args.pages)} to {max(args.pages)} pages")
+            return 1
+        print(f"File output grew {growth:.1f} MB from {min(args.pages)} to {max(args.pages)} pages: flat")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""Per-stage render timings.
+
+A render runs inside ``trace(fmt)``; the renderer wraps each stage in
+``stage(name)`` and time spent in a stage is summed per render (the line-item
+table is built, wrapped and drawn once per page). When the render finishes:
+
+* the breakdown is kept as the calling thread's ``last_trace()`` (one
+  Streamlit session = one script thread, so the debug panel shows its own),
+* one JSON line is logged on the ``po_metrics`` logger,
+* the samples feed process-wide summaries exported by ``prometheus_text()``
+  and, if PO_METRICS_FILE is set, rewritten to that file for a node_exporter
+  textfile collector.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+logger = logging.getLogger("po_metrics")
+
+METRICS_FILE = os.environ.get("PO_METRICS_FILE")
+# Recent samples kept per (format, stage) for the percentiles
+WINDOW = 1000
+QUANTILES = (0.5, 0.9, 0.99)
+
+_local = threading.local()
+_lock = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=WINDOW))
+_sums = defaultdict(float)
+_counts = defaultdict(int)
+
+
+@contextmanager
+def stage(name):
+    """Time a block as part of the current trace; a no-op outside a trace."""
+    current = getattr(_local, "current", None)
+    if current is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        current[name] = current.get(name, 0.0) + time.perf_counter() - start
+
+
+@contextmanager
+def trace(fmt, **fields):
+    """Collect the stage timings of one render of format ``fmt``."""
+    if getattr(_local, "current", None) is not None:
+        yield  # nested render: the outer trace owns the timings
+        return
+    timings = {}
+    _local.current = timings
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _local.current = None
+    timings["total"] = time.perf_counter() - start
+    _local.last = {"format": fmt, **fields, "stages": timings}
+    _record(fmt, timings)
+    logger.info(json.dumps({"event": "render", "format": fmt, **fields,
+                            **{k: round(v, 6) for k, v in timings.items()}}))
+    if METRICS_FILE:
+        write_prometheus(METRICS_FILE)
+
+
+def last_trace():
+    """Stage timings of the most recent render on this thread, or None."""
+    return getattr(_local, "last", None)
+
+
+def _record(fmt, timings):
+    with _lock:
+        for name, seconds in timings.items():
+            key = (fmt, name)
+            _samples[key].append(seconds)
+            _sums[key] += seconds
+            _counts[key] += 1
+
+
+def _quantile(ordered, q):
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+def percentiles(fmt, name):
+    """{quantile: seconds} over the recent window for one stage."""
+    with _lock:
+        ordered = sorted(_samples.get((fmt, name), ()))
+    if not ordered:
+        return {}
+    return {q: _quantile(ordered, q) for q in QUANTILES}
+
+
+def summary():
+    """[(format, stage, count, p50, p90, p99)] for every stage seen so far."""
+    with _lock:
+        keys = sorted(_samples)
+        snapshot = {key: (sorted(_samples[key]), _counts[key]) for key in keys}
+    return [(fmt, name, count, *(_quantile(ordered, q) for q in QUANTILES))
+            for (fmt, name), (ordered, count) in snapshot.items()]
+
+
+def prometheus_text() -> str:
+    """All stage timings in the Prometheus text exposition format."""
+    lines = [
+        "# HELP po_render_stage_seconds Time spent per PO rendering stage.",
+        "# TYPE po_render_stage_seconds summary",
+    ]
+    with _lock:
+        keys = sorted(_samples)
+        snapshot = {key: (sorted(_samples[key]), _sums[key], _counts[key]) for key in keys}
+    for (fmt, name), (ordered, total, count) in snapshot.items():
+        labels = f'format="{fmt}",stage="{name}"'
+        for q in QUANTILES:
+            lines.append(f'po_render_stage_seconds{{{labels},quantile="{q}"}} {_quantile(ordered, q):.6f}')
+        lines.append(f"po_render_stage_seconds_sum{{{labels}}} {total:.6f}")
+        lines.append(f"po_render_stage_seconds_count{{{labels}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    # Write-then-rename so a scraper never reads a half-written file
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+        _sums.clear()
+        _counts.clear()
@@ -0,0 +1,453 @@
+import re
+from dataclasses import dataclass, field, fields
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+import numpy as np
+
+
+# Default shipping documents printed on every foreign PO
+# (Documentation, Original, Duplicate)
+DEFAULT_SHIPPING_DOCS = [
+    ["Bill of Lading / Airway Bill", 2, 1],
+    ["Packing List", 2, 1],
+    ["Certificate of Origin (Chambered)", 2, 1],
+    ["Commercial Invoice (Chambered)", 2, 1],
+    ["Insurance Policy", 1, "-"],
+    ["Certificate of Analysis", 2, "-"],
+    ["Material Safety Data Sheet", 2, "-"]
+]
+
+# Table headings, shared by the PDF and the on-screen grids
+LOCAL_COLUMNS = ["Sr. No.", "Description", "Unit", "Qty", "Unit Cost", "Total Price"]
+FOREIGN_COLUMNS = ["S.No.", "HS Code", "Product Description", "UoM", "Qty", "Unit Cost", "Total Price"]
+SHIPPING_COLUMNS = ["Documentation", "Original", "Duplicate"]
+
+# 15% VAT, as a fraction so cent amounts stay integers
+VAT_NUMERATOR, VAT_DENOMINATOR = 15, 100
+
+# Columns every line item has; everything else on an item is text
+NUMERIC_FIELDS = ("qty", "unit_cost")
+
+# Quantities and cent amounts are stored in int64 columns
+MAX_INT64 = int(np.iinfo(np.int64).max)
+
+
+def to_cents(amount) -> int:
+    """Convert a money amount (int, float, str or Decimal) to integer cents.
+
+    Raises ValueError for anything that isn't a finite, non-negative amount.
+    """
+    if isinstance(amount, float):
+        # go through repr so 0.1 is 10 cents, not 0.1000000000000000055...
+        amount = repr(amount)
+    try:
+        value = Decimal(amount.strip() if isinstance(amount, str) else amount)
+        if value.is_finite() and 0 <= value.scaleb(2) <= MAX_INT64:
+            return int(value.scaleb(2).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, TypeError, ValueError):
+        pass
+    raise ValueError(f"Not a valid amount: {amount!r}")
+
+
+def to_qty(qty) -> int:
+    """Convert a quantity (int, float, str or Decimal) to an int.
+
+    Raises ValueError for anything that isn't a whole number of at least 1.
+    """
+    if isinstance(qty, np.integer):
+        qty = int(qty)
+    elif isinstance(qty, float):
+        qty = repr(qty)
+    try:
+        value = Decimal(qty.strip() if isinstance(qty, str) else qty)
+        if value.is_finite() and value == value.to_integral_value() and 1 <= value <= MAX_INT64:
+            return int(value)
+    except (InvalidOperation, TypeError, ValueError):
+        pass
+    raise ValueError(f"Qty must be a whole number of at least 1: {qty!r}")
+
+
+def format_cents(cents: int) -> str:
+    """Format integer cents the way the PDFs print money: 1,234.50"""
+    sign = "-" if cents < 0 else ""
+    whole, frac = divmod(abs(int(cents)), 100)
+    return f"{sign}{whole:,}.{frac:02d}"
+
+
+def compute_vat_cents(total_cents: int) -> int:
+    # round half up to the cent
+    return (total_cents * VAT_NUMERATOR + VAT_DENOMINATOR // 2) // VAT_DENOMINATOR
+
+
+@dataclass
+class LocalLineItem:
+    description: str
+    unit: str
+    qty: int
+    unit_cost: Decimal
+
+    def __post_init__(self):
+        self.qty = to_qty(self.qty)
+        self.unit_cost = Decimal(to_cents(self.unit_cost)).scaleb(-2)
+
+    @property
+    def total_price(self) -> Decimal:
+        return self.qty * self.unit_cost
+
+
+@dataclass
+class ForeignLineItem:
+    hs_code: str
+    product_description: str
+    uom: str
+    qty: int
+    unit_cost: Decimal
+
+    def __post_init__(self):
+        self.qty = to_qty(self.qty)
+        self.unit_cost = Decimal(to_cents(self.unit_cost)).scaleb(-2)
+
+    @property
+    def total_price(self) -> Decimal:
+        return self.qty * self.unit_cost
+
+
+class LineItems:
+    """Columnar line-item store.
+
+    Text columns are plain lists; quantity and unit cost (integer cents) are
+    int64 NumPy arrays, so line totals are one vectorized multiply and
+    nothing is ever parsed back out of a string. The PO total is kept as a
+    running sum, adjusted on every append, edit and delete, so reading it
+    never rescans the items. Sr. No. is not stored: it is the position.
+    Iterating yields ``item_cls`` records; ``rows()`` yields the raw columns.
+    """
+
+    def __init__(self, item_cls, items=()):
+        self.item_cls = item_cls
+        self.text_fields = tuple(f.name for f in fields(item_cls) if f.name not in NUMERIC_FIELDS)
+        self._text = {name: [] for name in self.text_fields}
+        self._qty = np.zeros(16, dtype=np.int64)
+        self._unit_cents = np.zeros(16, dtype=np.int64)
+        self._size = 0
+        self._total_cents = 0
+        self.extend(items)
+
+    def _reserve(self, size):
+        if size > len(self._qty):
+            capacity = max(size, 2 * len(self._qty))
+            self._qty = np.resize(self._qty, capacity)
+            self._unit_cents = np.resize(self._unit_cents, capacity)
+
+    def append(self, item):
+        """Add one ``item_cls`` record (or a dict of its fields)."""
+        if isinstance(item, dict):
+            item = self.item_cls(**item)
+        self._reserve(self._size + 1)
+        for name in self.text_fields:
+            self._text[name].append(getattr(item, name))
+        qty, unit_cents = item.qty, to_cents(item.unit_cost)
+        self._qty[self._size] = qty
+        self._unit_cents[self._size] = unit_cents
+        self._total_cents += qty * unit_cents
+        self._size += 1
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def extend_columns(self, text_columns, qty, unit_cents):
+        """Bulk-append already validated columns (text lists, qty and cents arrays)."""
+        qty = np.asarray(qty, dtype=np.int64)
+        unit_cents = np.asarray(unit_cents, dtype=np.int64)
+        n = len(qty)
+        self._reserve(self._size + n)
+        for name in self.text_fields:
+            self._text[name].extend(text_columns[name])
+        self._qty[self._size:self._size + n] = qty
+        self._unit_cents[self._size:self._size + n] = unit_cents
+        self._total_cents += int(qty @ unit_cents)
+        self._size += n
+
+    def _index(self, i):
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("line item index out of range")
+        return i
+
+    def __getitem__(self, i):
+        i = self._index(i)
+        return self.item_cls(*(self._text[name][i] for name in self.text_fields),
+                             int(self._qty[i]), Decimal(int(self._unit_cents[i])).scaleb(-2))
+
+    def update(self, i, **changes):
+        """Change some fields of item ``i``; the total is adjusted, not recomputed."""
+        i = self._index(i)
+        unknown = set(changes) - set(self.text_fields) - set(NUMERIC_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown line item fields: {sorted(unknown)}")
+        old = int(self._qty[i]) * int(self._unit_cents[i])
+        for name in self.text_fields:
+            if name in changes:
+                self._text[name][i] = changes[name]
+        if "qty" in changes:
+            self._qty[i] = to_qty(changes["qty"])
+        if "unit_cost" in changes:
+            self._unit_cents[i] = to_cents(changes["unit_cost"])
+        self._total_cents += int(self._qty[i]) * int(self._unit_cents[i]) - old
+
+    def __delitem__(self, i):
+        i = self._index(i)
+        self._total_cents -= int(self._qty[i]) * int(self._unit_cents[i])
+        for column in self._text.values():
+            del column[i]
+        end = self._size
+        self._qty[i:end - 1] = self._qty[i + 1:end]
+        self._unit_cents[i:end - 1] = self._unit_cents[i + 1:end]
+        self._size -= 1
+
+    def move(self, src, dst):
+        """Move item ``src`` to position ``dst``; everything between shifts by one."""
+        src, dst = self._index(src), self._index(dst)
+        if src == dst:
+            return
+        for column in self._text.values():
+            column.insert(dst, column.pop(src))
+        for array in (self._qty, self._unit_cents):
+            value = array[src]
+            if src < dst:
+                array[src:dst] = array[src + 1:dst + 1]
+            else:
+                array[dst + 1:src + 1] = array[dst:src]
+            array[dst] = value
+
+    def copy(self):
+        """Independent snapshot; later edits to either store don't affect the other."""
+        other = LineItems(self.item_cls)
+        other.extend_columns({name: self._text[name] for name in self.text_fields}, self.qty, self.unit_cents)
+        return other
+
+    def clear(self):
+        for column in self._text.values():
+            column.clear()
+        self._size = 0
+        self._total_cents = 0
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for row in self.rows():
+            *text, qty, unit_cents, _ = row
+            yield self.item_cls(*text, qty, Decimal(unit_cents).scaleb(-2))
+
+    @property
+    def qty(self):
+        return self._qty[:self._size]
+
+    @property
+    def unit_cents(self):
+        return self._unit_cents[:self._size]
+
+    @property
+    def total_cents(self):
+        return self.qty * self.unit_cents
+
+    def text(self, name):
+        return self._text[name]
+
+    def sum_cents(self) -> int:
+        return self._total_cents
+
+    def rows(self, start=0, stop=None):
+        """Yield (text fields..., qty, unit_cents, total_cents) as plain Python values."""
+        stop = self._size if stop is None else min(stop, self._size)
+        qty = self._qty[start:stop].tolist()
+        unit_cents = self._unit_cents[start:stop].tolist()
+        texts = [self._text[name][start:stop] for name in self.text_fields]
+        for i, (q, u) in enumerate(zip(qty, unit_cents)):
+            yield (*(column[i] for column in texts), q, u, q * u)
+
+    def to_dicts(self):
+        return [
+            {**{name: value for name, value in zip(self.text_fields, row)},
+             "qty": row[-3], "unit_cost": str(Decimal(row[-2]).scaleb(-2))}
+            for row in self.rows()
+        ]
+
+
+def _line_items_field(item_cls):
+    return field(default_factory=lambda: LineItems(item_cls))
+
+
+def _coerce_line_items(po, item_cls):
+    if not isinstance(po.line_items, LineItems):
+        po.line_items = LineItems(item_cls, po.line_items)
+
+
+@dataclass
+class LocalPO:
+    po_no: str
+    po_date: date
+    name: str = ""
+    designation: str = ""
+    vat_no: str = ""
+    mobile: str = ""
+    company_name: str = ""
+    fax_no: str = "-"
+    pr_number: str = ""
+    supplier: str = ""
+    ref_quote: str = ""
+    telephone: str = ""
+    email: str = ""
+    subject: str = ""
+    line_items: LineItems = _line_items_field(LocalLineItem)
+
+    def __post_init__(self):
+        _coerce_line_items(self, LocalLineItem)
+
+    @property
+    def total_cents(self) -> int:
+        return self.line_items.sum_cents()
+
+    @property
+    def vat_cents(self) -> int:
+        return compute_vat_cents(self.total_cents)
+
+    @property
+    def grand_total_cents(self) -> int:
+        return self.total_cents + self.vat_cents
+
+
+@dataclass
+class ForeignPO:
+    po_no: str
+    po_date: date
+    pr_no: str = ""
+    to_name: str = ""
+    designation: str = ""
+    company: str = ""
+    telephone: str = "-"
+    email: str = ""
+    fax: str = "-"
+    mobile: str = ""
+    address: str = ""
+    subject: str = ""
+    consignee_name: str = ""
+    consignee_address: str = ""
+    consignee_contact: str = ""
+    consignee_tel: str = ""
+    consignee_fax: str = ""
+    consignee_email: str = ""
+    shipping_docs: list = field(default_factory=lambda: [row[:] for row in DEFAULT_SHIPPING_DOCS])
+    line_items: LineItems = _line_items_field(ForeignLineItem)
+
+    def __post_init__(self):
+        _coerce_line_items(self, ForeignLineItem)
+
+    @property
+    def grand_total_cents(self) -> int:
+        return self.line_items.sum_cents()
+
+
+FORMATS = {
+    "local": (LocalPO, LocalLineItem),
+    "foreign": (ForeignPO, ForeignLineItem),
+}
+
+# Rendering engines: reportlab canvas drawing (po_render) or HTML templates
+# laid out by WeasyPrint (po_html)
+BACKENDS = ("canvas", "html")
+DEFAULT_BACKEND = "canvas"
+
+
+def check_backend(backend) -> str:
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown rendering backend: {backend!r}")
+    return backend
+
+
+_backend_errors = {}  # backend -> why it can't render in this process (None if it can)
+
+
+def backend_error(backend):
+    """Why ``backend`` can't render in this process, or None if it can.
+
+    The html backend needs WeasyPrint, which loads pango when imported; the
+    first call per process tries that import.
+    """
+    if backend == "html" and backend not in _backend_errors:
+        try:
+            import weasyprint  # noqa: F401
+        except (ImportError, OSError) as e:
+            _backend_errors[backend] = f"WeasyPrint can't load: {e}"
+        else:
+            _backend_errors[backend] = None
+    return _backend_errors.get(backend)
+
+
+def available_backends() -> tuple:
+    """The BACKENDS that can render in this process."""
+    return tuple(backend for backend in BACKENDS if backend_error(backend) is None)
+
+
+def po_format(po) -> str:
+    return "foreign" if isinstance(po, ForeignPO) else "local"
+
+
+def pdf_filename(po) -> str:
+    """File name for a PO (or a PO No.)."""
+    po_no = po if isinstance(po, str) else po.po_no
+    # PO numbers end up as file names, keep them portable
+    return re.sub(r"[^\w.-]+", "_", po_no) + ".pdf"
+
+
+def po_from_dict(data: dict):
+    """Build a PO from a plain dict (JSON manifest, HTTP payload, ...).
+
+    ``format`` selects "local" (default) or "foreign"; ``po_date`` may be an
+    ISO date string; ``line_items`` is a list of dicts keyed by the line-item
+    field names. Unknown keys, and a ``po_no`` or ``po_date`` of the wrong
+    type, raise ValueError.
+    """
+    data = dict(data)
+    fmt = data.pop("format", "local")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown PO format: {fmt!r}")
+    po_cls, item_cls = FORMATS[fmt]
+
+    item_names = {f.name for f in fields(item_cls)}
+    line_items = LineItems(item_cls)
+    for item in data.pop("line_items", []):
+        unknown = set(item) - item_names
+        if unknown:
+            raise ValueError(f"Unknown line item fields: {sorted(unknown)}")
+        item = {"qty": 1, "unit_cost": 0, **item}
+        line_items.append(item_cls(**item))
+
+    po_names = {f.name for f in fields(po_cls)}
+    unknown = set(data) - po_names
+    if unknown:
+        raise ValueError(f"Unknown PO fields: {sorted(unknown)}")
+    if "po_no" in data and not isinstance(data["po_no"], str):
+        raise ValueError(f"PO No. must be a string: {data['po_no']!r}")
+    if isinstance(data.get("po_date"), str):
+        data["po_date"] = date.fromisoformat(data["po_date"])
+    elif "po_date" in data and not isinstance(data["po_date"], date):
+        raise ValueError(f"PO date must be an ISO date string: {data['po_date']!r}")
+    return po_cls(line_items=line_items, **data)
+
+
+def po_to_dict(po) -> dict:
+    """Inverse of po_from_dict; the result is JSON serialisable.
+
+    Unit costs are written as exact decimal strings ("1234.50").
+    """
+    data = {f.name: getattr(po, f.name) for f in fields(po)}
+    data["po_date"] = po.po_date.isoformat()
+    data["line_items"] = po.line_items.to_dicts()
+    if "shipping_docs" in data:
+        data["shipping_docs"] = [list(row) for row in po.shipping_docs]
+    return {"format": po_format(po), **data}
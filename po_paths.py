@@ -0,0 +1,4 @@
+"""Where the files shipped next to the code live."""
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
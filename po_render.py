@@ -0,0 +1,703 @@
+import threading
+from contextlib import contextmanager
+from io import BytesIO
+from itertools import islice
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfdoc import PDFPageLabel
+from reportlab.platypus import Paragraph, Table, TableStyle
+
+from po_assets import LOGO_PATH_FOOTER, LOGO_PATH_LEFT, LOGO_PATH_RIGHT, register_fonts
+from po_layout import compile_layout, replay
+from po_metrics import stage, trace
+from po_models import (DEFAULT_BACKEND, FOREIGN_COLUMNS, LOCAL_COLUMNS, SHIPPING_COLUMNS, ForeignPO, LocalPO,
+                       check_backend, format_cents, po_format)
+from po_stream import StreamingCanvas
+from po_wrap import wrap_cell
+
+PAGE_WIDTH, PAGE_HEIGHT = A4
+
+LOCAL_COL_WIDTHS = [40, 220, 50, 40, 70, 70]
+LOCAL_TABLE_STYLE = TableStyle([
+    ("GRID", (0,0), (-1,-1), 0.5, colors.black),
+    ("ALIGN", (2,1), (-1,-1), "CENTER"),
+    ("FONTSIZE", (0,0), (-1,-1), 9)
+])
+LOCAL_ROW_HEIGHT = 18       # a single-line row at font size 9
+LOCAL_LEADING = 12          # each further line in a cell (Table's default leading)
+CELL_PADDING = 6            # top + bottom padding of a Table cell
+LOCAL_TABLE_TOP = PAGE_HEIGHT - 305
+CONTINUATION_TOP = PAGE_HEIGHT - 125  # first line below the letterhead rule
+TABLE_BOTTOM = 80           # keeps clear of the approvals block and footer
+LOCAL_CLOSING_HEIGHT = 15 + 36 + 227  # totals + terms block below the last row
+
+FOREIGN_COL_WIDTHS = [40, 60, 180, 40, 40, 60, 60]
+FOREIGN_TABLE_STYLE = TableStyle([
+    ("GRID", (0,0), (-1,-1), 0.5, colors.black),
+    ("FONTNAME", (0,0), (-1,0), "CenturyGothicBold"),  # header bold
+    ("FONTNAME", (0,1), (-1,-1), "CenturyGothic"),     # body normal
+    ("FONTSIZE", (0,0), (-1,-1), 7.5),
+    ("ALIGN", (4,1), (-1,-1), "CENTER"),
+    ("VALIGN", (0,0), (-1,-1), "TOP"),  # so wrapped text starts at top
+    ("LEADING", (2,1), (2,-1), 9),  # pre-wrapped descriptions, as century_style
+])
+FOREIGN_ROW_HEIGHT = 18     # a single-line row; the other columns keep Table's default leading
+FOREIGN_LEADING = 9         # each further line of a wrapped description
+FOREIGN_CLOSING_HEIGHT = 60 + 72  # grand total, then note and approvals, above the signoff
+
+# (header row, column widths, style, single-line row height, leading) per paginated table
+LOCAL_TABLE = (LOCAL_COLUMNS, LOCAL_COL_WIDTHS, LOCAL_TABLE_STYLE, LOCAL_ROW_HEIGHT, LOCAL_LEADING)
+FOREIGN_TABLE = (FOREIGN_COLUMNS, FOREIGN_COL_WIDTHS, FOREIGN_TABLE_STYLE, FOREIGN_ROW_HEIGHT, FOREIGN_LEADING)
+
+# Text width inside the description and consignee cells (6pt padding each side)
+DESCRIPTION_WIDTH = FOREIGN_COL_WIDTHS[2] - 12
+CONSIGNEE_VALUE_WIDTH = 180 - 12
+
+# Company name block on the local format
+company_style = ParagraphStyle(
+    name="CenturyGothicNormal",
+    fontName="CenturyGothic",
+    fontSize=10,
+    leading=12
+)
+
+# Wrapped cells (consignee address, product description) on the foreign format
+century_style = ParagraphStyle(
+    name="CenturyGothicSmall",
+    fontName="CenturyGothic",
+    fontSize=7.5,
+    leading=9
+)
+
+
+def iter_local_table_rows(po, stop=None):
+    # Money is kept in integer cents and only formatted here, at render time
+    for i, (description, unit, qty, unit_cents, total_cents) in enumerate(po.line_items.rows(stop=stop)):
+        yield [i + 1, description, unit, qty, format_cents(unit_cents), format_cents(total_cents)]
+
+
+def local_table_rows(po, stop=None):
+    """Line items of a local PO as they are printed (and shown in the app)."""
+    return list(iter_local_table_rows(po, stop))
+
+
+def iter_foreign_table_rows(po, stop=None):
+    for i, (hs_code, product_description, uom, qty, unit_cents, total_cents) in enumerate(po.line_items.rows(stop=stop)):
+        yield [i + 1, hs_code, product_description, uom, qty, format_cents(unit_cents), format_cents(total_cents)]
+
+
+def foreign_table_rows(po, stop=None):
+    """Line items of a foreign PO as they are printed (and shown in the app)."""
+    return list(iter_foreign_table_rows(po, stop))
+
+
+_progress = threading.local()
+
+
+@contextmanager
+def progress_callback(callback):
+    """Call ``callback(done, total)`` as line items are laid out by renders on this thread.
+
+    The callback may raise to abandon the render (e.g. on cancellation).
+    """
+    previous = getattr(_progress, "callback", None)
+    _progress.callback = callback
+    try:
+        yield
+    finally:
+        _progress.callback = previous
+
+
+def _report_progress(done, total):
+    callback = getattr(_progress, "callback", None)
+    if callback is not None:
+        callback(done, total)
+
+
+def _stamp(c, name, ops, x=0, y=0):
+    """Stamp static content onto the current page as a form XObject.
+
+    The compiled layout ``ops`` are replayed only the first time ``name`` is
+    used in a document; every later page just references the stored form,
+    offset by (x, y).
+    """
+    if not c.hasForm(name):
+        # Blocks placed relative to a running y are drawn below their origin
+        with stage("static_forms"):
+            c.beginForm(name, lowerx=0, lowery=-PAGE_HEIGHT, upperx=PAGE_WIDTH, uppery=PAGE_HEIGHT)
+            replay(c, ops)
+            c.endForm()
+    if x or y:
+        c.saveState()
+        c.translate(x, y)
+        c.doForm(name)
+        c.restoreState()
+    else:
+        c.doForm(name)
+
+
+# Label x, value x and where the rule under the value ends, per details column
+DETAIL_COLUMNS = {
+    "left": (40, 130, PAGE_WIDTH / 2 - 10),
+    "right": (PAGE_WIDTH / 2, PAGE_WIDTH / 2 + 70, PAGE_WIDTH - 50),
+    "wide": (40, 130, PAGE_WIDTH - 50),
+}
+
+
+def field(label, value, top, column="left"):
+    """Spec for one details entry ``top`` points below the page top: label, value, rule under the value."""
+    label_x, value_x, rule_end = DETAIL_COLUMNS[column]
+    y = PAGE_HEIGHT - top
+    return [("text", label_x, y, label), ("text", value_x, y, value), ("line", value_x, y - 2, rule_end, y - 2)]
+
+
+def letterhead(title):
+    right_img_width = 2.33 * inch
+    return [
+        # Logos
+        ("image", LOGO_PATH_LEFT, 40, PAGE_HEIGHT - 60,
+         {"width": 2.11*inch, "height": 0.58*inch, "preserveAspectRatio": True, "anchor": "nw"}),
+        ("image", LOGO_PATH_RIGHT, PAGE_WIDTH - 40 - right_img_width, PAGE_HEIGHT - 60,
+         {"width": 2.33*inch, "height": 0.58*inch, "preserveAspectRatio": True, "anchor": "ne"}),
+        # VAT Number
+        ("font", "CenturyGothic", 10),
+        ("text", 40, PAGE_HEIGHT - 70, " VAT No. 311863395100003"),
+        ("line_width", 1),
+        ("line", 40, PAGE_HEIGHT - 80, PAGE_WIDTH - 40, PAGE_HEIGHT - 80),
+        # Title
+        ("font", "CenturyGothicBold", 12.5),
+        ("centred", PAGE_WIDTH / 2, PAGE_HEIGHT - 100, title),
+        ("line_width", 1),
+        ("line", 40, PAGE_HEIGHT - 110, PAGE_WIDTH - 40, PAGE_HEIGHT - 110),
+    ]
+
+
+FOOTER = compile_layout([
+    ("image", LOGO_PATH_FOOTER, 40, -30, {"width": PAGE_WIDTH - (2 * 40), "preserveAspectRatio": True}),
+])
+
+LOCAL_LETTERHEAD = compile_layout(letterhead("PURCHASE ORDER"))
+FOREIGN_LETTERHEAD = compile_layout(letterhead("FOREIGN PURCHASE ORDER"))
+
+# Terms and closing note, drawn relative to the rule under the totals (y=0)
+LOCAL_TERMS = compile_layout([
+    ("line_width", 0.5),
+    ("line", 40, 0, PAGE_WIDTH - 40, 0),
+    ("font", "CenturyGothic", 11),
+    ("text", 40, -12, "Terms and Conditions"),
+    # Payment Terms
+    ("font", "CenturyGothic", 10),
+    ("text", 40, -37, "Payment Terms: 100% Advance through bank"),
+    ("text", 40, -49, "Contact Person:"),
+    ("text", 40, -61, "Incoterm: DPA"),
+    ("text", 40, -73, "Place of Delivery: Meta Solutions Industrial Company,  First Floor, KCT Building No: 8588, Al Firdaws Ar"),
+    ("text", 40, -85, "Contact Person: "),
+    ("text", 40, -97, "Delivery Schedule: Immediate"),
+    ("text", 40, -109, "Packing: N/A"),
+    ("text", 40, -121, "Packaging: N/A"),
+    ("text", 40, -133, "Note: Duration of Subscription: 7th Aug 2025 to 6th Aug 2026 "),
+    # Note
+    ("text", 40, -203, "Please confirm the purchase order."),
+    ("text", 40, -215, "Best Regards"),
+    ("text", 40, -227, "On behalf of Meta Solutions Industrial Company"),
+])
+
+LOCAL_APPROVALS = compile_layout([
+    ("font", "CenturyGothic", 9),
+    ("text", 40, 62, "Prepared & checked by:"),
+    ("text", 40, 36, "AMIR RODRIGUEZ"),
+    ("text", 180, 62, "Reviewed by:"),
+    ("text", 180, 36, "WASIUR REHMAN KHAN"),
+    ("text", 320, 62, "Authorized by"),
+    ("text", 320, 36, "DR. VIMAL PATEL"),
+    ("text", 460, 62, "Approved by:"),
+    ("text", 460, 36, " ANVER SADATH"),
+    ("font", "CenturyGothic", 8),
+    ("text", 40, 50, "Procurement Manager"),
+    ("text", 180, 50, "Finance Manager"),
+    ("text", 320, 50, "General Manager"),
+    ("text", 460, 50, "Chairman & Managing Director"),
+])
+
+LOCAL_DETAILS = compile_layout([
+    ("font", "CenturyGothic", 10),
+    ("line_width", 0.3),
+    *field("Name:", "{name}", 130),
+    *field("PO No.:", "{po_no}", 130, "right"),
+    *field("Designation:", "{designation}", 150),
+    *field("PO Date:", "{po_date:%A, %B %d, %Y}", 150, "right"),
+    ("text", 40, PAGE_HEIGHT - 175, "Company Name:"),
+    # Company name wraps inside a small frame
+    ("paragraph", 130, PAGE_HEIGHT - 200, 150, 50, company_style, "{company_name}"),
+    ("line", 130, PAGE_HEIGHT - 190, PAGE_WIDTH / 2 - 10, PAGE_HEIGHT - 190),
+    ("text", PAGE_WIDTH / 2, PAGE_HEIGHT - 175, "Supplier"),
+    ("text", PAGE_WIDTH / 2, PAGE_HEIGHT - 185, "Reference:"),
+    ("text", PAGE_WIDTH / 2 + 70, PAGE_HEIGHT - 180, "Quotation #: {ref_quote}"),
+    ("line", PAGE_WIDTH / 2 + 70, PAGE_HEIGHT - 190, PAGE_WIDTH - 50, PAGE_HEIGHT - 190),
+    *field("Telephone No.:", "{telephone}", 210),
+    *field("Email:", "{email}", 210, "right"),
+    *field("Fax No.:", "{fax_no}", 230),
+    *field("PR Number:", "{pr_number}", 230, "right"),
+    *field("Mobile No.:", "{mobile}", 250),
+    ("text", 40, PAGE_HEIGHT - 270, "Subject: {subject}"),
+])
+
+# Drawn below the last line item (y=0); the terms follow at y=-51
+LOCAL_TOTALS = compile_layout([
+    ("font", "CenturyGothicBold", 10),
+    ("text", 400, -15, "Total: {total}"),
+    ("text", 400, -27, "15% VAT: {vat}"),
+    ("text", 400, -39, "Grand Total (SAR): {grand_total}"),
+])
+
+
+def local_values(po: LocalPO):
+    """Template values for the local layouts."""
+    return {**vars(po), "total": format_cents(po.total_cents), "vat": format_cents(po.vat_cents),
+            "grand_total": format_cents(po.grand_total_cents)}
+
+
+def draw_local_po(c, po: LocalPO):
+    """Draw a local PO onto an open canvas, finishing with showPage()."""
+    values = local_values(po)
+    _stamp(c, "LocalLetterhead", LOCAL_LETTERHEAD)
+
+    with stage("details"):
+        replay(c, LOCAL_DETAILS, values)
+
+    # Line Items Table, paginated: one small Table per page, header row repeated
+    y_pos = _draw_local_line_items(c, po)
+
+    # Totals, terms and closing note need LOCAL_CLOSING_HEIGHT below the last row
+    if y_pos - LOCAL_CLOSING_HEIGHT < TABLE_BOTTOM:
+        _next_local_page(c)
+        y_pos = CONTINUATION_TOP
+
+    replay(c, LOCAL_TOTALS, values, y=y_pos)
+    _stamp(c, "LocalTerms", LOCAL_TERMS, y=y_pos - 51)
+    _stamp(c, "LocalApprovals", LOCAL_APPROVALS)
+
+    _stamp(c, "Footer", FOOTER)
+    c.showPage()
+
+
+def _next_local_page(c):
+    # Continuation pages carry the letterhead and footer; approvals stay on the last page
+    _stamp(c, "Footer", FOOTER)
+    c.showPage()
+    _stamp(c, "LocalLetterhead", LOCAL_LETTERHEAD)
+
+
+def _draw_local_line_items(c, po):
+    """Draw the line items across as many pages as needed; return the y below the last row."""
+    return _draw_paged_table(c, iter_local_table_rows(po), len(po.line_items), LOCAL_TABLE_TOP, LOCAL_TABLE,
+                             _next_local_page)
+
+
+def _draw_paged_table(c, rows, total, y, spec, next_page):
+    """Draw ``rows`` from ``y`` down, one Table per page with the header row repeated; return the y below.
+
+    Rows are read from the iterator lazily and at most one page of them is
+    held in a Table at a time, so memory stays flat however long the PO is.
+    A row that doesn't fit in what is left of a page moves to the next one
+    (``next_page(c)`` starts it); a row taller than a whole page is split.
+    """
+    columns, col_widths, style, row_height, leading = spec
+    done = 0
+    pending = []
+    exhausted = False
+    while True:
+        avail = y - TABLE_BOTTOM
+        if not exhausted:
+            want = max(int(avail // row_height) - 1 - len(pending), 0)
+            with stage("table_rows"):
+                pending.extend(islice(rows, want))
+                # Peek one row ahead so a page that ends exactly on the last row
+                # is not followed by an empty continuation table
+                peek = next(rows, None)
+            if peek is None:
+                exhausted = True
+            else:
+                pending.append(peek)
+
+        with stage("table_wrap"):
+            table = Table([columns] + pending, colWidths=col_widths, repeatRows=1)
+            table.setStyle(style)
+            _, height = table.wrapOn(c, PAGE_WIDTH - 80, avail)
+            drawn = len(pending)
+            if height > avail:
+                # Multi-line cells made the rows taller than estimated
+                parts = table.split(PAGE_WIDTH - 80, avail)
+                drawn = len(parts[0]._cellvalues) - 1 if parts else 0
+                if drawn:
+                    table = parts[0]
+                    _, height = table.wrapOn(c, PAGE_WIDTH - 80, avail)
+        if pending and not drawn:
+            # Not even the next row fits in what is left of this page
+            if y != CONTINUATION_TOP:
+                next_page(c)
+                y = CONTINUATION_TOP
+                continue
+            # Taller than a whole page: carry the rest of its lines on as another row
+            lines = max(int((avail - row_height - CELL_PADDING) // leading), 1)
+            head, tail = _split_row(pending[0], lines, leading, col_widths)
+            if tail is not None:
+                pending[:1] = [head, tail]
+                done -= 1  # both pieces get counted as they are drawn
+                continue
+            # Nothing left to split off; draw it and let it run past the bottom
+            table = Table([columns, pending[0]], colWidths=col_widths)
+            table.setStyle(style)
+            _, height = table.wrapOn(c, PAGE_WIDTH - 80, avail)
+            drawn = 1
+        with stage("table_draw"):
+            table.drawOn(c, 40, y - height)
+        y -= height
+        pending = pending[drawn:]
+        done += drawn
+        _report_progress(done, total)
+
+        if exhausted and not pending:
+            return y
+        next_page(c)
+        y = CONTINUATION_TOP
+
+
+def _split_row(row, lines, leading, col_widths):
+    """Split ``row`` after its first ``lines`` lines; (row, None) if there is nothing to split."""
+    head, tail = [], []
+    for value, width in zip(row, col_widths):
+        if isinstance(value, Paragraph):
+            parts = value.split(width - 12, lines * leading)  # 6pt padding each side
+            first, rest = (parts[0], parts[1]) if len(parts) == 2 else (value, "")
+        else:
+            text = str(value).split("\n")
+            first, rest = "\n".join(text[:lines]), "\n".join(text[lines:])
+        head.append(first)
+        tail.append(rest)
+    if not any(tail):
+        return row, None
+    return head, tail
+
+
+# Details block shared by both pages of the foreign format; only the subject moves
+FOREIGN_DETAILS = [
+    ("font", "CenturyGothic", 7.5),
+    ("line_width", 0.3),
+    *field("P.O. No.:", "{po_no}", 130),
+    *field("Date:", "{po_date:%A, %B %d, %Y}", 130, "right"),
+    *field("P.R. No.:", "{pr_no}", 140),
+    ("text", 40, PAGE_HEIGHT - 150, "Supplier Details"),
+    *field("To:", "{to_name}", 160),
+    *field("Designation:", "{designation}", 160, "right"),
+    *field("Company:", "{company}", 170, "wide"),
+    *field("Telephone No.:", "{telephone}", 180),
+    *field("Email:", "{email}", 180, "right"),
+    *field("Fax No:", "{fax}", 190),
+    *field("Mobile No.:", "{mobile}", 190, "right"),
+    *field("Address:", "{address}", 200, "wide"),
+]
+FOREIGN_DETAILS_FIRST = compile_layout(FOREIGN_DETAILS + field("Subject:", "{subject}", 210, "wide"))
+FOREIGN_DETAILS_SECOND = compile_layout(FOREIGN_DETAILS + field("Subject:", "{subject}", 220, "wide"))
+
+FOREIGN_REGULATIONS = compile_layout([
+    ("stroke_rgb", 0, 0, 0),  # black border
+    ("line_width", 1),
+    ("rect", 38, PAGE_HEIGHT - 302, PAGE_WIDTH - 80, 80),
+    ("font", "CenturyGothicBold", 7.5),
+    ("text", 40, PAGE_HEIGHT - 230, "Saudi Import Regulations:"),
+    ("font", "CenturyGothic", 7.5),
+    ("text", 40, PAGE_HEIGHT - 240, "This is to notify Saudi Customs authority will not allow to clear the cargo of any material without any origin"),
+    ("text", 40, PAGE_HEIGHT - 250, "information identification label, Hazmats or Hazcom, and supplier will be liable for the cost of return and"),
+    ("text", 40, PAGE_HEIGHT - 260, "the penalties"),
+    ("text", 40, PAGE_HEIGHT - 270, "a. Product Name"),
+    ("text", PAGE_WIDTH / 2, PAGE_HEIGHT - 270, "e. Date of Production"),
+    ("text", 40, PAGE_HEIGHT - 280, "b. Weight(Gross/Net)"),
+    ("text", PAGE_WIDTH / 2, PAGE_HEIGHT - 280, "f. Hazcom or Hazmat signs as per the MSDS,"),
+    ("text", 40, PAGE_HEIGHT - 290, "c. Supplier name,"),
+    ("text", PAGE_WIDTH / 2, PAGE_HEIGHT - 290, "g. Country of origin for all drums / IBC's etc."),
+    ("text", 40, PAGE_HEIGHT - 300, "d. Batch# or Lot#,"),
+    ("text", PAGE_WIDTH / 2, PAGE_HEIGHT - 300, "h. SASO Certificate for spares or equipments."),
+    ("text", 40, PAGE_HEIGHT - 320, "Terms & Conditions:"),
+    ("font", "CenturyGothicBold", 7.5),
+    ("text", 40, PAGE_HEIGHT - 330, "Please note that this FPO T&C is our standard format; it may not be applicable to your materials or services. We kindly request that"),
+    ("text", 40, PAGE_HEIGHT - 340, "you review the clauses and disregard any that do not pertain to your products and services."),
+    ("font", "CenturyGothic", 7.5),
+    ("text", 40, PAGE_HEIGHT - 350, "A  Payment Terms   : Advance"),
+    ("text", 40, PAGE_HEIGHT - 360, "B  Mode of Payment : 100% Advance through bank"),
+    ("text", 40, PAGE_HEIGHT - 370, "C  Regulations :"),
+    ("font", "CenturyGothic", 7),
+    ("text", 50, PAGE_HEIGHT - 380, "- Photos of the material must be sent prior to dispatch, with a clear view of the label and the container. Do not ship the goods unless confirmed by"),
+    ("text", 50, PAGE_HEIGHT - 390, "  the consignee and/or a COA is provided. (The supplier will not hold the containers once the product is stuffed and ready for shipment.)"),
+    ("text", 50, PAGE_HEIGHT - 400, "- Purchase Order number, HS Code, and Weight (Net/Gross) must be mentioned in all documents. "),
+    ("text", 50, PAGE_HEIGHT - 410, "- Please send the draft of the shipping documents before legalization. Send the scan of the shipping documents after legalization, prior to courier."),
+    ("text", 50, PAGE_HEIGHT - 420, "- Please mention the bill of lading and container number in the commercial invoice and packing list."),
+    ("text", 50, PAGE_HEIGHT - 430, "- Place the COA, Material Safety Data Sheet, and Packing List along with the goods."),
+    ("font", "CenturyGothic", 7.5),
+    ("text", 40, PAGE_HEIGHT - 440, "D  INCO terms          :   DAP - MestaSoL, 2nd Industiral, Dammam"),
+    ("text", 40, PAGE_HEIGHT - 450, "E  Place of Delivery   :   Meta Solutions Industrial Company, 2nd Industrial Dammam"),
+    ("text", 40, PAGE_HEIGHT - 460, "F  Delivery Priority   :   Immediate"),
+    ("text", 40, PAGE_HEIGHT - 470, "G  Delivery Schedule   :   Immediate"),
+    ("text", 40, PAGE_HEIGHT - 480, "H  Packing             :   Palletized"),
+    ("text", 40, PAGE_HEIGHT - 490, "I  Packaging           :   Palletized and shrink-wrapped"),
+    ("text", 40, PAGE_HEIGHT - 500, "J  Additional Terms    :   Logo allocation: 300 pcs - MetaSol, 100 pcs - GIT, and 100 pcs - IAA "),
+])
+
+FOREIGN_PURCHASE_HEADING = compile_layout([
+    ("font", "CenturyGothic", 7.5),
+    ("text", 40, PAGE_HEIGHT - 240, "Harmonized System (HS) Code       : AS PER BELOW"),
+    ("text", 40, PAGE_HEIGHT - 260, "Import Permit (Internal Use Only) : -"),
+    ("text", 40, PAGE_HEIGHT - 280, "Special Import Requirements       : -"),
+    ("text", 40, PAGE_HEIGHT - 300, "Supplier Offer Reference          : FR20250529-JW"),
+    ("text", 40, PAGE_HEIGHT - 320, "Purchase Details:"),
+])
+
+# Drawn below the purchase table (y=0); the closing follows at y=-60
+FOREIGN_GRAND_TOTAL = compile_layout([
+    ("font", "CenturyGothic", 7.5),
+    ("text", 320, -20, "Grand Total"),
+    ("text", 400, -20, "USD"),
+    ("text", PAGE_WIDTH - 100, -20, "{grand_total}"),
+    ("line_width", 0.3),
+    ("line", 40, -30, PAGE_WIDTH - 40, -30),
+])
+
+# Note and approvals, drawn relative to 30pt below the grand total rule (y=0)
+FOREIGN_CLOSING = compile_layout([
+    ("font", "CenturyGothic", 7.5),
+    ("text", 40, 0, "Note: Please mention the product name and HS code exactly the same in all documents"),
+    ("text", 40, -12, "Best Regards"),
+    ("text", 40, -24, "On behalf of Meta Solutions Industrial Company"),
+    # Approvals
+    ("text", 40, -44, "Prepared & checked by:"),
+    ("text", 40, -56, "AMIR RODRIGUEZ"),
+    ("text", 180, -44, "Reviewed by:"),
+    ("text", 180, -56, "WASIUR REHMAN KHAN"),
+    ("text", 320, -44, "Authorized by"),
+    ("text", 320, -56, "DR. VIMAL PATEL"),
+    ("text", 460, -44, "Approved by:"),
+    ("text", 460, -56, " ANVER SADATH"),
+    ("font", "CenturyGothic", 7),
+    ("text", 40, -68, "Procurement Manager"),
+    ("text", 180, -68, "Finance Manager"),
+    ("text", 320, -68, "General Manager"),
+    ("text", 460, -68, "Chairman & Managing Director"),
+])
+
+FOREIGN_SIGNOFF = compile_layout([
+    ("font", "CenturyGothic", 7),
+    ("text", 40, 70, "Please confirm the purchase order and send the scanned copy by email."),
+    ("line_width", 0.3),
+    ("line", 40, 50, 130, 50),
+    ("text", 50, 40, "Name"),
+    ("line", 170, 50, 360, 50),
+    ("text", 180, 40, "Supplier Authorized Signature and Date"),
+    ("line", 450, 50, 550, 50),
+    ("text", 460, 40, "Company Seal"),
+])
+
+
+def _iter_foreign_purchase_rows(po):
+    for row in iter_foreign_table_rows(po):
+        # Product Description (column index 2) is wrapped to the column
+        row[2] = wrap_cell(str(row[2]), century_style, DESCRIPTION_WIDTH)
+        yield row
+
+
+def _next_foreign_page(c):
+    # Continuation pages carry the letterhead and footer; the closing stays on the last page
+    _stamp(c, "Footer", FOOTER)
+    c.showPage()
+    _stamp(c, "ForeignLetterhead", FOREIGN_LETTERHEAD)
+
+
+def _draw_foreign_purchase_table(c, po, y):
+    """Draw the purchase details from ``y`` down across as many pages as needed; return the y below."""
+    return _draw_paged_table(c, _iter_foreign_purchase_rows(po), len(po.line_items), y, FOREIGN_TABLE,
+                             _next_foreign_page)
+
+
+def draw_foreign_po(c, po: ForeignPO):
+    """Draw a foreign PO (two pages or more) onto an open canvas, finishing with showPage()."""
+    values = vars(po)
+    _stamp(c, "ForeignLetterhead", FOREIGN_LETTERHEAD)
+    with stage("details"):
+        replay(c, FOREIGN_DETAILS_FIRST, values)
+
+    _stamp(c, "ForeignRegulations", FOREIGN_REGULATIONS)
+
+    # -------- CONSIGNEE TABLE --------
+    y = PAGE_HEIGHT - 510
+    consignee_data = [
+        ["Consignee Details & Notify Party", ""],
+        ["Name", po.consignee_name],
+        ["Address", wrap_cell(po.consignee_address, century_style, CONSIGNEE_VALUE_WIDTH)],  # wrapped
+        ["Contact", po.consignee_contact],
+        ["Tel.", po.consignee_tel],
+        ["Fax", po.consignee_fax],
+        ["Email", po.consignee_email]
+    ]
+
+    # row heights — make Address row taller (index 2)
+    consignee_row_heights = [20, 18, 50, 18, 18, 18, 18]
+
+    consignee_table = Table(consignee_data, colWidths=[80, 180], rowHeights=consignee_row_heights)
+    consignee_table.setStyle(TableStyle([
+        ("GRID", (0,0), (-1,-1), 0.5, colors.black),
+        ("BACKGROUND", (0,0), (-1,0), colors.lightgrey),
+        ("SPAN", (0,0), (-1,0)),
+        ("FONTSIZE", (0,0), (-1,-1), 7.5),
+        ("VALIGN", (0,0), (-1,-1), "TOP"),
+        ("FONTNAME", (0,0), (-1,0), "CenturyGothicBold"),  # header bold
+        ("FONTNAME", (0,1), (-1,-1), "CenturyGothic"),     # rest normal
+        ("ALIGN", (0,0), (-1,0), "CENTER"),
+        ("LEADING", (1,2), (1,2), 9),  # wrapped address, as century_style
+    ]))
+
+    # -------- SHIPPING DOCUMENTS TABLE --------
+    shipping_data = [["Shipping Documents", "", ""], SHIPPING_COLUMNS] + [list(row) for row in po.shipping_docs]
+    shipping_table = Table(shipping_data, colWidths=[160, 50, 50])
+    shipping_table.setStyle(TableStyle([
+        ("GRID", (0,0), (-1,-1), 0.5, colors.black),
+        ("BACKGROUND", (0,0), (-1,0), colors.lightgrey),
+        ("FONTSIZE", (0,0), (-1,-1), 7.5),
+        ("SPAN", (0,0), (-1,0)),
+        ("ALIGN", (1,1), (-1,-1), "CENTER"),
+        ("ALIGN", (0,0), (-1,0), "CENTER"),
+        ("FONTNAME", (0,0), (-1,0), "CenturyGothicBold"),  # header bold
+        ("FONTNAME", (0,1), (-1,-1), "CenturyGothic"),     # rest normal
+    ]))
+
+    # Draw both tables side-by-side
+    y -= 10
+    with stage("consignee_shipping"):
+        consignee_table.wrapOn(c, 40, y)
+        shipping_table.wrapOn(c, 320, y)
+        consignee_table.drawOn(c, 40, y - consignee_table._height)
+        shipping_table.drawOn(c, 320, y - shipping_table._height)
+
+    _stamp(c, "Footer", FOOTER)
+    c.showPage()
+
+    # -------- NEW PAGE --------
+    _stamp(c, "ForeignLetterhead", FOREIGN_LETTERHEAD)
+    with stage("details"):
+        replay(c, FOREIGN_DETAILS_SECOND, values)
+
+    _stamp(c, "ForeignPurchaseHeading", FOREIGN_PURCHASE_HEADING)
+
+    # -------- PURCHASE DETAILS TABLE --------
+    y = _draw_foreign_purchase_table(c, po, PAGE_HEIGHT - 330)
+
+    # Grand total, note and approvals need FOREIGN_CLOSING_HEIGHT below the last row
+    if y - FOREIGN_CLOSING_HEIGHT < TABLE_BOTTOM:
+        _next_foreign_page(c)
+        y = CONTINUATION_TOP
+
+    replay(c, FOREIGN_GRAND_TOTAL, {"grand_total": format_cents(po.grand_total_cents)}, y=y)
+    _stamp(c, "ForeignClosing", FOREIGN_CLOSING, y=y - 60)
+    _stamp(c, "ForeignSignoff", FOREIGN_SIGNOFF)
+
+    _stamp(c, "Footer", FOOTER)
+    c.showPage()
+
+
+def write_local_po(po: LocalPO, sink):
+    """Render a local PO into ``sink`` (anything with write()), one page at a time."""
+    with trace("local", items=len(po.line_items)):
+        with stage("fonts"):
+            register_fonts()
+        c = StreamingCanvas(sink, pagesize=A4)
+        c.setTitle(po.po_no)
+        draw_local_po(c, po)
+        with stage("save"):
+            c.save()
+
+
+def write_foreign_po(po: ForeignPO, sink):
+    """Render a foreign PO into ``sink`` (anything with write()), one page at a time."""
+    with trace("foreign", items=len(po.line_items)):
+        with stage("fonts"):
+            register_fonts()
+        c = StreamingCanvas(sink, pagesize=A4)
+        c.setTitle(po.po_no)
+        draw_foreign_po(c, po)
+        with stage("save"):
+            c.save()
+
+
+def write_po(po, sink, backend=DEFAULT_BACKEND):
+    """Render either PO type into ``sink`` with ``backend`` (see po_models.BACKENDS).
+
+    With the canvas backend memory stays flat however many pages the PO has.
+    """
+    if check_backend(backend) == "html":
+        from po_html import write_po_html
+        write_po_html(po, sink)
+    elif isinstance(po, ForeignPO):
+        write_foreign_po(po, sink)
+    else:
+        write_local_po(po, sink)
+
+
+def write_collated(pos, sink, title="Purchase orders"):
+    """Render a list of POs, local and/or foreign, into one PDF in ``sink``.
+
+    The whole run shares one copy of the fonts, letterhead images and static
+    forms. Each PO gets a bookmark and page labels such as "<PO No.> / 2".
+    Canvas backend only.
+    """
+    with trace("collated", pos=len(pos), items=sum(len(po.line_items) for po in pos)):
+        with stage("fonts"):
+            register_fonts()
+        c = StreamingCanvas(sink, pagesize=A4)
+        c.setTitle(title)
+        total = sum(len(po.line_items) for po in pos)
+        offset = 0
+        report = getattr(_progress, "callback", None) or (lambda done, total: None)
+        for i, po in enumerate(pos):
+            key = f"po{i}"
+            c.bookmarkPage(key)
+            c.addOutlineEntry(f"{po.po_no} ({po_format(po)})", key)
+            c.addPageLabel(c.getPageNumber() - 1, style=PDFPageLabel.ARABIC, start=1, prefix=f"{po.po_no} / ")
+            # Progress over the whole run rather than per PO
+            with progress_callback(lambda done, _, base=offset: report(base + done, total)):
+                if isinstance(po, ForeignPO):
+                    draw_foreign_po(c, po)
+                else:
+                    draw_local_po(c, po)
+            offset += len(po.line_items)
+        c.showOutline()
+        with stage("save"):
+            c.save()
+
+
+def render_collated(pos, title="Purchase orders") -> bytes:
+    """Render a list of POs into one PDF; see write_collated()."""
+    buffer = BytesIO()
+    write_collated(pos, buffer, title)
+    return buffer.getvalue()
+
+
+def render_local_po(po: LocalPO) -> bytes:
+    """Render a local PO to PDF bytes."""
+    buffer = BytesIO()
+    write_local_po(po, buffer)
+    return buffer.getvalue()
+
+
+def render_foreign_po(po: ForeignPO) -> bytes:
+    """Render a foreign PO to PDF bytes."""
+    buffer = BytesIO()
+    write_foreign_po(po, buffer)
+    return buffer.getvalue()
+
+
+def render_po(po, backend=DEFAULT_BACKEND) -> bytes:
+    """Render either PO type to PDF bytes."""
+    buffer = BytesIO()
+    write_po(po, buffer, backend)
+    return buffer.getvalue()
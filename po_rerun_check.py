@@ -0,0 +1,101 @@
+"""Rerun-latency budget for the Foreign Report Format screen.
+
+    python po_rerun_check.py
+    python po_rerun_check.py --sizes 0 1000 --budget-ms 200
+
+Drives streamlit_app.py through streamlit.testing AppTest with 0 to 10,000
+purchase items already in the session and times two interactions: editing
+a header field and adding one item. AppTest always reruns the whole
+script, so these are upper bounds for the fragment-scoped reruns a browser
+sees. Fails when the median rerun exceeds the budget, or when it grows
+with the number of items (it should be flat: the preview is capped and
+totals are vectorized).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from po_bench import synthetic_po
+from po_paths import BASE_DIR
+
+APP = os.path.join(BASE_DIR, "streamlit_app.py")
+
+SIZES = [0, 100, 1_000, 10_000]
+BUDGET_MS = 150
+# Largest size may be at most this much slower than the smallest...
+GROWTH_TOLERANCE = 1.5
+# ...give or take scheduler noise
+GROWTH_SLACK_MS = 30
+REPEATS = 5
+
+
+def _median_ms(action, repeats):
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        action(i)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def measure(n_items, repeats=REPEATS):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.session_state["foreign_line_items"] = synthetic_po("foreign", n_items).line_items
+    at.run()
+    at.sidebar.selectbox[0].select("Foreign Report Format").run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+    def edit_header(i):
+        at.text_area(key="foreign_subject").input(f"Subject {i}").run()
+
+    def add_item(i):
+        next(b for b in at.button if b.label == "Add Item").click().run()
+
+    return {
+        "items": n_items,
+        "edit_header_ms": _median_ms(edit_header, repeats),
+        "add_item_ms": _median_ms(add_item, repeats),
+    }
+
+
+def check(results, budget_ms=BUDGET_MS):
+    problems = []
+    for result in results:
+        for name in ("edit_header_ms", "add_item_ms"):
+            if result[name] > budget_ms:
+                problems.append(f"{result['items']} items: {name} {result[name]:.0f} ms > {budget_ms} ms")
+    first, last = results[0], results[-1]
+    for name in ("edit_header_ms", "add_item_ms"):
+        if last[name] > first[name] * GROWTH_TOLERANCE + GROWTH_SLACK_MS:
+            problems.append(f"{name} grows with items: {first[name]:.0f} ms at {first['items']}, "
+                            f"{last[name]:.0f} ms at {last['items']}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check Foreign Report Format rerun latency.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="purchase items in the session")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    results = []
+    for n_items in sorted(args.sizes):
+        result = measure(n_items)
+        results.append(result)
+        print(f"{n_items:>6} items  edit header {result['edit_header_ms']:6.1f} ms  "
+              f"add item {result['add_item_ms']:6.1f} ms")
+
+    problems = check(results, args.budget_ms)
+    for problem in problems:
+        print("  " + problem)
+    print("Within budget" if not problems else "Over budget")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
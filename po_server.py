@@ -0,0 +1,182 @@
+"""HTTP rendering service for other systems (ERP exports, approval workflow).
+
+    python po_server.py --port 8600 --workers 4 --concurrency 8
+
+    POST /render    body: PO JSON (see po_models.po_from_dict), either format
+                    ?backend=canvas (default) or html picks the rendering engine
+                    -> 200 application/pdf, 400 {"error": ...} for a bad payload,
+                       or 503 {"error": ...} when the backend can't load here
+    GET  /health    -> {"workers": ..., "concurrency": ..., "in_flight": ..., "cache": {...}}
+
+Renders run on a process pool whose workers load fonts and letterheads
+before the first request. At most --concurrency renders are in flight;
+further requests wait for a slot (tornado keeps the connection open, and
+HTTP/1.1 keep-alive lets clients reuse it between requests). Identical
+payloads are answered from the in-process render cache.
+
+POs with more than STREAM_ITEMS line items skip the cache: the worker
+writes the PDF page by page to a temporary file and the response streams
+it out in CHUNK_BYTES pieces, so neither process ever holds the whole PDF.
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import tornado.web
+from tornado.httpserver import HTTPServer
+from tornado.ioloop import IOLoop
+
+from po_batch import warm_worker
+from po_cache import po_key, render_cache
+from po_models import DEFAULT_BACKEND, backend_error, check_backend, pdf_filename, po_from_dict
+
+STREAM_ITEMS = 5_000
+CHUNK_BYTES = 64 * 1024
+
+
+def _render(data, backend):
+    from po_render import render_po
+    return render_po(po_from_dict(data), backend)
+
+
+def _render_to_file(data, backend):
+    """Render into a temporary file; the caller sends it and deletes it."""
+    from po_render import write_po
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write_po(po_from_dict(data), f, backend)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+def _ping():
+    return os.getpid()
+
+
+class RenderHandler(tornado.web.RequestHandler):
+    def initialize(self, pool, limit):
+        self.pool = pool
+        self.limit = limit
+
+    def _error(self, status, message):
+        self.set_status(status)
+        self.finish({"error": message})
+
+    async def post(self):
+        try:
+            data = json.loads(self.request.body)
+            po = po_from_dict(data)
+            backend = check_backend(self.get_argument("backend", DEFAULT_BACKEND))
+        except (ValueError, TypeError, AttributeError, KeyError, ArithmeticError) as e:
+            # Bad JSON, unknown fields, missing po_no/po_date, bad dates or amounts...
+            return self._error(400, str(e))
+        unavailable = backend_error(backend)
+        if unavailable:
+            return self._error(503, f"Rendering backend {backend!r} is unavailable: {unavailable}")
+
+        self.set_header("Content-Type", "application/pdf")
+        self.set_header("Content-Disposition", f'attachment; filename="{pdf_filename(po)}"')
+        if len(po.line_items) > STREAM_ITEMS:
+            return await self._stream(data, backend)
+
+        key = po_key(po, backend)
+        pdf = render_cache.get(key)
+        if pdf is None:
+            pdf = await self._run(_render, data, backend)
+            if pdf is None:
+                return
+            render_cache.put(key, pdf)
+        self.finish(pdf)
+
+    async def _run(self, render, data, backend):
+        """Run ``render`` on the pool; None (with a 503 sent) if the backend can't load."""
+        async with self.limit:
+            try:
+                return await IOLoop.current().run_in_executor(self.pool, render, data, backend)
+            except (ImportError, OSError) as e:
+                # e.g. WeasyPrint installed without the pango libraries it needs
+                self.clear_header("Content-Disposition")
+                self._error(503, f"Rendering backend {backend!r} is unavailable: {e}")
+                return None
+
+    async def _stream(self, data, backend):
+        path = await self._run(_render_to_file, data, backend)
+        if path is None:
+            return
+        try:
+            self.set_header("Content-Length", os.path.getsize(path))
+            with open(path, "rb") as f:
+                while chunk := f.read(CHUNK_BYTES):
+                    self.write(chunk)
+                    await self.flush()
+        finally:
+            os.unlink(path)
+        self.finish()
+
+
+class HealthHandler(tornado.web.RequestHandler):
+    def initialize(self, workers, concurrency, limit):
+        self.workers = workers
+        self.concurrency = concurrency
+        self.limit = limit
+
+    def get(self):
+        self.finish({
+            "workers": self.workers,
+            "concurrency": self.concurrency,
+            "in_flight": self.concurrency - self.limit._value,
+            "cache": render_cache.stats(),
+        })
+
+
+def make_app(pool, workers, concurrency):
+    limit = asyncio.Semaphore(concurrency)
+    return tornado.web.Application([
+        (r"/render", RenderHandler, {"pool": pool, "limit": limit}),
+        (r"/health", HealthHandler, {"workers": workers, "concurrency": concurrency, "limit": limit}),
+    ])
+
+
+async def serve(port, address, workers, concurrency, idle_timeout):
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=warm_worker)
+    # Start every worker (and let it load its assets) before taking traffic
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(loop.run_in_executor(pool, _ping) for _ in range(workers)))
+
+    server = HTTPServer(make_app(pool, workers, concurrency), idle_connection_timeout=idle_timeout,
+                        max_body_size=64 * 1024 * 1024)
+    server.listen(port, address)
+    print(f"Rendering on http://{address}:{port}/render ({workers} workers, {concurrency} concurrent)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        server.stop()
+        pool.shutdown(cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve PO rendering over HTTP.")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--address", default="127.0.0.1")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: one per core)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="renders in flight at once; others wait (default: 2 per worker)")
+    parser.add_argument("--idle-timeout", type=float, default=60, help="seconds to keep idle connections open")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or os.cpu_count() or 1
+    concurrency = args.concurrency or 2 * workers
+    try:
+        asyncio.run(serve(args.port, args.address, workers, concurrency, args.idle_timeout))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
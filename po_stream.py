@@ -0,0 +1,81 @@
+"""Page-at-a-time PDF output for reportlab.
+
+reportlab keeps every finished page, content stream included, in memory
+until save() and then builds the whole file as one bytes object, so memory
+grows with the page count. StreamingCanvas writes each page to its output
+file as soon as showPage() finishes it and keeps only the page's name.
+Everything else (fonts, images, forms, the page tree) is written by save()
+as usual, followed by the cross-reference table. The output only needs
+write(): a file, a socket wrapper or a BytesIO all work.
+"""
+from reportlab.pdfbase import pdfdoc
+from reportlab.pdfgen import canvas
+
+
+class StreamingDocument(pdfdoc.PDFDocument):
+    def __init__(self, sink, **kwargs):
+        super().__init__(**kwargs)
+        self.sink = sink
+        self.offset = 0
+        self._written = set()
+
+    def _write(self, data):
+        if not self.offset:
+            # Written with the first object rather than up front, so the
+            # version covers what the first page needed (e.g. transparency)
+            header = pdfdoc.PDFFile(self._pdfVersion).format(self)
+            self.sink.write(header)
+            self.offset = len(header)
+        self.sink.write(data)
+        self.offset += len(data)
+
+    def _write_object(self, name):
+        data = pdfdoc.PDFIndirectObject(name, self.idToObject[name]).format(self)
+        if not self.offset:
+            self._write(b"")
+        self.idToOffset[name] = self.offset
+        self._write(data)
+        self._written.add(name)
+
+    def addPage(self, page):
+        name = self.thisPageName()
+        super().addPage(page)
+        # Formatting the page registers its content stream; write both and
+        # let go of them. The page tree only needs the page's name.
+        self._write_object(name)
+        contents = page.Contents.__InternalName__
+        self._write_object(contents)
+        self.idToObject[name] = self.idToObject[contents] = None
+        self.Pages.pages[-1] = pdfdoc.PDFObjectReference(name)
+
+    def format(self):
+        """Write everything not written yet, then the xref and trailer; returns b""."""
+        if self.encrypt.info():
+            raise ValueError("encrypted documents can't be streamed")
+        self.Reference(self.Catalog)
+        self.Reference(self.info)
+        # Formatting can register new objects, so walk the numbers until they run out
+        number = 1
+        while number in self.numberToId:
+            name = self.numberToId[number]
+            if name not in self._written:
+                self._write_object(name)
+            number += 1
+        xref = pdfdoc.PDFCrossReferenceTable()
+        xref.addsection(0, [self.numberToId[n] for n in range(1, number)])
+        xref_offset = self.offset
+        self._write(xref.format(self))
+        trailer = pdfdoc.PDFTrailer(startxref=xref_offset, Size=number, Root=self.Reference(self.Catalog),
+                                    Info=self.Reference(self.info), ID=self.ID())
+        self._write(trailer.format(self))
+        return b""
+
+
+class StreamingCanvas(canvas.Canvas):
+    """A Canvas that writes to ``sink`` page by page; call save() to finish the file."""
+
+    def __init__(self, sink, **kwargs):
+        super().__init__(sink, **kwargs)
+        doc = self._doc
+        self._doc = StreamingDocument(sink, compression=doc.compression, invariant=doc.invariant,
+                                      pdfVersion=doc._pdfVersion, lang=kwargs.get("lang"))
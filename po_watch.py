@@ -0,0 +1,367 @@
+"""Watch-folder daemon: render the PO exports the ERP drops into an inbox.
+
+    python po_watch.py inbox/ --outbox outbox/ --workers 4
+    python po_watch.py inbox/ --outbox outbox/ --once      # process what's there and exit
+
+Inbox files are PO JSON (one PO dict or a list of them, see
+po_models.po_from_dict) or CSV manifests in po_batch's layout. A file is
+picked up once its size and mtime have stayed the same for DEBOUNCE_SECONDS,
+so half-written exports are left alone. Names starting with "." or "~" and
+anything that isn't .json/.csv are ignored, so the ERP can write "x.json.tmp"
+and rename it when done. Each PO is rendered on a process pool into
+outbox/local/<PO No.>.pdf or outbox/foreign/<PO No.>.pdf; the PDF is written
+to a temporary name and renamed, so readers never see a partial file. The input then moves to inbox/processed/,
+or to inbox/failed/ next to a .error.txt saying why.
+
+Rendering is idempotent: outbox/.po_watch.sqlite3 records each format + PO
+No. with the content hash of what was rendered (po_cache.po_key). Dropping the same
+export again, or restarting the daemon over the same inbox, renders nothing;
+a PO that comes back with the same number and different content is rendered
+again and replaces its PDF. When two versions of one PO are in flight, only
+the later one is kept.
+
+The watchdog thread only records paths. Parsing and bookkeeping happen on
+the main thread, and at most MAX_IN_FLIGHT POs per worker are queued on the
+pool at once, so memory stays bounded however fast files arrive.
+"""
+import argparse
+import itertools
+import logging
+import os
+import shutil
+import signal
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from po_batch import load_manifest, warm_worker
+from po_cache import po_key
+from po_models import FORMATS, pdf_filename, po_format, po_from_dict
+
+DEBOUNCE_SECONDS = 2.0
+POLL_SECONDS = 0.25
+MAX_IN_FLIGHT = 4  # per worker
+SUFFIXES = (".json", ".csv")
+LEDGER_NAME = ".po_watch.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rendered (
+    format TEXT NOT NULL,
+    po_no TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    pdf TEXT NOT NULL,
+    source TEXT NOT NULL,
+    rendered_at TEXT NOT NULL,
+    PRIMARY KEY (format, po_no)
+);
+"""
+
+logger = logging.getLogger("po_watch")
+
+
+def _init_worker():
+    # Ctrl-C is for the daemon; it shuts the pool down itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    warm_worker()
+
+
+def _render_to(data, path):
+    """Worker: render one PO dict into ``path``."""
+    from po_render import write_po
+    try:
+        with open(path, "wb") as f:
+            write_po(po_from_dict(data), f)
+    except BaseException:
+        if os.path.exists(path):
+            os.unlink(path)
+        raise
+    return os.path.getsize(path)
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _wanted(path):
+    name = os.path.basename(path)
+    return not name.startswith((".", "~")) and name.lower().endswith(SUFFIXES)
+
+
+def _unique_path(directory, name):
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        return path
+    stem, ext = os.path.splitext(name)
+    for n in itertools.count(1):
+        path = os.path.join(directory, f"{stem}.{n}{ext}")
+        if not os.path.exists(path):
+            return path
+
+
+def read_orders(path):
+    """The PO dicts in an inbox file."""
+    orders = load_manifest(path)
+    return [orders] if isinstance(orders, dict) else orders
+
+
+class Ledger:
+    """(format, PO No.) -> content hash of the PDF in the outbox, in SQLite."""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def get(self, key):
+        return self.conn.execute("SELECT content_hash, pdf FROM rendered WHERE format = ? AND po_no = ?",
+                                 key).fetchone()
+
+    def record(self, key, content_hash, pdf, source):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO rendered (format, po_no, content_hash, pdf, source, rendered_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, content_hash, pdf, source, datetime.now().isoformat(timespec="seconds")),
+            )
+
+
+class InboxFile:
+    def __init__(self, path):
+        self.path = path
+        self.pending = 0
+        self.errors = []
+
+
+class Watcher:
+    def __init__(self, inbox, outbox, workers=None, debounce=DEBOUNCE_SECONDS):
+        self.inbox = inbox
+        self.outbox = outbox
+        self.debounce = debounce
+        self.processed_dir = os.path.join(inbox, "processed")
+        self.failed_dir = os.path.join(inbox, "failed")
+        for directory in (self.processed_dir, self.failed_dir, *(os.path.join(outbox, fmt) for fmt in FORMATS)):
+            os.makedirs(directory, exist_ok=True)
+        self.ledger = Ledger(os.path.join(outbox, LEDGER_NAME))
+
+        self.workers = workers or os.cpu_count() or 1
+        self.max_in_flight = MAX_IN_FLIGHT * self.workers
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+        self._lock = threading.Lock()
+        self._seen = {}         # path -> (monotonic time of last change, signature); filled by watchdog
+        self._ready = deque()   # debounced paths, oldest first
+        self._queue = deque()   # (InboxFile, key, content_hash, pdf path, data) waiting for a pool slot
+        self._futures = {}      # future -> (InboxFile, key, content_hash, pdf path, seq, temp path)
+        self._latest = {}       # key -> (seq, content_hash) of its newest submission; key is (format, PO No.)
+        self._seq = itertools.count(1)
+        self.stats = {"rendered": 0, "unchanged": 0, "superseded": 0, "failed": 0, "files": 0}
+
+    # -- intake ---------------------------------------------------------
+
+    def touch(self, path):
+        """Note that ``path`` changed; it is processed once it stays unchanged for the debounce time."""
+        if os.path.dirname(os.path.abspath(path)) != os.path.abspath(self.inbox) or not _wanted(path):
+            return
+        with self._lock:
+            self._seen[path] = (time.monotonic(), _signature(path))
+
+    def forget(self, path):
+        with self._lock:
+            self._seen.pop(path, None)
+
+    def sweep(self):
+        """Pick up files that were already in the inbox."""
+        for entry in os.scandir(self.inbox):
+            if entry.is_file():
+                self.touch(entry.path)
+
+    def _debounce(self, now):
+        with self._lock:
+            for path, (changed, signature) in list(self._seen.items()):
+                if now - changed < self.debounce:
+                    continue
+                current = _signature(path)
+                if current is None:
+                    del self._seen[path]  # gone (renamed away or deleted)
+                elif current != signature:
+                    self._seen[path] = (now, current)  # still being written
+                else:
+                    del self._seen[path]
+                    self._ready.append(path)
+
+    def _open(self, path):
+        """Parse a debounced file and queue its POs."""
+        record = InboxFile(path)
+        self.stats["files"] += 1
+        try:
+            orders = read_orders(path)
+            jobs = []
+            for data in orders:
+                po = po_from_dict(data)
+                fmt = po_format(po)
+                jobs.append(((fmt, po.po_no), po_key(po), os.path.join(fmt, pdf_filename(po)), data))
+        except (OSError, ValueError, TypeError, KeyError, AttributeError, ArithmeticError) as e:
+            self.stats["failed"] += 1
+            record.errors.append(f"{os.path.basename(path)}: {e}")
+            self._finish(record)
+            return
+        for job in jobs:
+            self._queue.append((record, *job))
+            record.pending += 1
+        if not record.pending:
+            self._finish(record)
+
+    # -- rendering ------------------------------------------------------
+
+    def _submit(self):
+        while self._queue and len(self._futures) < self.max_in_flight:
+            record, key, content_hash, name, data = self._queue.popleft()
+            latest = self._latest.get(key)
+            done = self.ledger.get(key)
+            if (latest is not None and latest[1] == content_hash) or (
+                    latest is None and done is not None and done[0] == content_hash
+                    and os.path.exists(os.path.join(self.outbox, done[1]))):
+                self.stats["unchanged"] += 1
+                self._po_done(record)
+                continue
+            seq = next(self._seq)
+            self._latest[key] = (seq, content_hash)
+            temp = os.path.join(self.outbox, f".{seq}.pdf.tmp")
+            future = self.pool.submit(_render_to, data, temp)
+            self._futures[future] = (record, key, content_hash, name, seq, temp)
+
+    def _reap(self, timeout):
+        if not self._futures:
+            time.sleep(timeout)
+            return
+        done, _ = wait(self._futures, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            record, key, content_hash, name, seq, temp = self._futures.pop(future)
+            # A newer version may have been submitted, or even finished, meanwhile
+            entry = self._latest.get(key)
+            latest = entry is not None and entry[0] == seq
+            if latest:
+                del self._latest[key]
+            try:
+                future.result()
+            except Exception as e:
+                self.stats["failed"] += 1
+                record.errors.append(f"{key[1]}: {e}")
+                logger.warning("failed %s from %s: %s", name, os.path.basename(record.path), e)
+            else:
+                if not latest:
+                    # A newer version of this PO was submitted meanwhile; it wins
+                    os.unlink(temp)
+                    self.stats["superseded"] += 1
+                else:
+                    os.replace(temp, os.path.join(self.outbox, name))
+                    self.ledger.record(key, content_hash, name, os.path.basename(record.path))
+                    self.stats["rendered"] += 1
+                    logger.info("rendered %s from %s", name, os.path.basename(record.path))
+            self._po_done(record)
+
+    def _po_done(self, record):
+        record.pending -= 1
+        if not record.pending:
+            self._finish(record)
+
+    def _finish(self, record):
+        """Move a fully handled inbox file to processed/ or failed/."""
+        name = os.path.basename(record.path)
+        target_dir = self.failed_dir if record.errors else self.processed_dir
+        target = _unique_path(target_dir, name)
+        try:
+            shutil.move(record.path, target)
+        except FileNotFoundError:
+            pass  # removed while we were rendering it
+        if record.errors:
+            with open(target + ".error.txt", "w", encoding="utf-8") as f:
+                f.write("\n".join(record.errors) + "\n")
+            logger.warning("%s -> failed/ (%d problem(s))", name, len(record.errors))
+
+    # -- main loop ------------------------------------------------------
+
+    @property
+    def idle(self):
+        return not (self._seen or self._ready or self._queue or self._futures)
+
+    def step(self, timeout=POLL_SECONDS):
+        self._debounce(time.monotonic())
+        # Parse files only while there is room, so a burst stays on disk rather than in memory
+        while self._ready and len(self._queue) < self.max_in_flight:
+            self._open(self._ready.popleft())
+        self._submit()
+        self._reap(timeout)
+
+    def run(self, stop=None, once=False):
+        """Process the inbox until ``stop`` is set, or until it is empty with ``once``."""
+        stop = stop or threading.Event()
+        self.sweep()
+        observer = None
+        if not once:
+            observer = _observe(self)
+        try:
+            while not stop.is_set() and not (once and self.idle):
+                self.step()
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            self.pool.shutdown(wait=True, cancel_futures=True)
+        return self.stats
+
+
+def _observe(watcher):
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    class Handler(FileSystemEventHandler):
+        def on_created(self, event):
+            if not event.is_directory:
+                watcher.touch(event.src_path)
+
+        on_modified = on_closed = on_created
+
+        def on_moved(self, event):
+            if not event.is_directory:
+                watcher.forget(event.src_path)
+                watcher.touch(event.dest_path)
+
+        def on_deleted(self, event):
+            watcher.forget(event.src_path)
+
+    observer = Observer()
+    observer.schedule(Handler(), watcher.inbox, recursive=False)
+    observer.start()
+    return observer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render PO exports dropped into an inbox directory.")
+    parser.add_argument("inbox", help="directory the ERP writes PO JSON/CSV files into")
+    parser.add_argument("--outbox", required=True, help="directory for the rendered PDFs")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: one per core)")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS,
+                        help="seconds a file must stay unchanged before it is read")
+    parser.add_argument("--once", action="store_true", help="process the files already there, then exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    watcher = Watcher(args.inbox, args.outbox, workers=args.workers, debounce=args.debounce)
+    print(f"Watching {args.inbox} -> {args.outbox} ({watcher.workers} workers)")
+    try:
+        stats = watcher.run(once=args.once)
+    except KeyboardInterrupt:
+        stats = watcher.stats
+    print(", ".join(f"{count} {name}" for name, count in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
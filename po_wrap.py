@@ -0,0 +1,96 @@
+"""Fast line wrapping for plain-text table cells.
+
+A Paragraph per cell is how reportlab wraps text in a Table, but on long
+purchase tables building, measuring and drawing thousands of them is most
+of the render. wrap_cell() breaks plain text into lines itself and returns
+them "\\n"-joined, which Table draws with one drawString per line. Word
+widths are summed from a per-font glyph-width table and memoized, since
+descriptions repeat the same words row after row.
+
+Lines break exactly where Paragraph would put them, so the output doesn't
+change. Text this can't reproduce that way still gets a Paragraph: markup
+or entities, non-ASCII text, a word wider than the cell (Paragraph splits
+it), or a line that only fits by squeezing its spaces.
+
+The Table cell needs the Paragraph style's leading, e.g.
+("LEADING", (2, 1), (2, -1), style.leading), for the rows to come out the
+same height.
+"""
+import threading
+
+from reportlab import rl_config
+from reportlab.pdfbase.pdfmetrics import getFont
+from reportlab.platypus import Paragraph
+
+# Words remembered per font and size before the memo starts over
+MAX_WORDS = 50_000
+
+_lock = threading.Lock()
+_tables = {}  # (font name, size) -> WidthTable
+
+
+class WidthTable:
+    """Widths of ASCII words in one font and size, computed as reportlab's stringWidth does."""
+
+    def __init__(self, font, size):
+        self.font = font
+        face = font.face
+        self._glyphs = [face.charWidths.get(code, face.defaultWidth) for code in range(128)]
+        self._scale = 0.001 * size
+        self._words = {}
+        self.space = self.width(" ")
+
+    def width(self, word):
+        width = self._words.get(word)
+        if width is None:
+            if len(self._words) >= MAX_WORDS:
+                self._words.clear()
+            width = self._words[word] = self._scale * sum(map(self._glyphs.__getitem__, word.encode("ascii")))
+        return width
+
+
+def width_table(font_name, size) -> WidthTable:
+    """The shared table for ``font_name`` at ``size``; rebuilt if the font is registered again."""
+    font = getFont(font_name)
+    table = _tables.get((font_name, size))
+    if table is None or table.font is not font:
+        with _lock:
+            table = _tables[font_name, size] = WidthTable(font, size)
+    return table
+
+
+def wrap_lines(text, table, max_width, space_shrinkage=rl_config.spaceShrinkage):
+    """Break ``text`` into lines no wider than ``max_width``, or None if Paragraph would do it differently."""
+    words = text.split()
+    if not words:
+        return []
+    space = table.space
+    shrink = space_shrinkage * space
+    lines = []
+    line = []
+    current = -space  # the first word on a line has no space before it
+    for word in words:
+        width = table.width(word)
+        if width > max_width:
+            return None
+        new = current + space + width
+        if new <= max_width:
+            line.append(word)
+            current = new
+        elif line and new > max_width + shrink * len(line):
+            lines.append(" ".join(line))
+            line = [word]
+            current = width
+        else:
+            return None  # fits only with shrunk spaces
+    lines.append(" ".join(line))
+    return lines
+
+
+def wrap_cell(text, style, max_width):
+    """``text`` as a pre-broken string for a Table cell ``max_width`` wide, or a Paragraph when it needs one."""
+    if text.isascii() and "<" not in text and "&" not in text:
+        lines = wrap_lines(text, width_table(style.fontName, style.fontSize), max_width, style.spaceShrinkage)
+        if lines is not None:
+            return "\n".join(lines)
+    return Paragraph(text, style)
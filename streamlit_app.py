@@ -1,35 +1,407 @@
 import streamlit as st
-from io import BytesIO
 from datetime import date
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from reportlab.platypus import Table, TableStyle, Frame, Paragraph
-from reportlab.lib.units import inch
-import os
-from reportlab.lib.styles import getSampleStyleSheet
-import pandas as pd
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfbase import pdfmetrics
-from reportlab.lib.styles import ParagraphStyle
-
-pdfmetrics.registerFont(TTFont('CenturyGothic', 'centurygothic.ttf'))
-pdfmetrics.registerFont(TTFont('CenturyGothicBold', 'centurygothic_bold.ttf'))
-
-PAGE_WIDTH, PAGE_HEIGHT = A4
-
-# Path to your hardcoded logo file
-LOGO_PATH_RIGHT = "Metasol_Logo_Right.png"  # make sure this file is in the same folder as this script
-LOGO_PATH_LEFT = "Metasol_Logo_left.png"  # make sure this file is in the same folder as this script
-LOGO_PATH_FOOTER = 'Footer.png'
+
+from po_models import (DEFAULT_SHIPPING_DOCS, FOREIGN_COLUMNS, LOCAL_COLUMNS, NUMERIC_FIELDS, SHIPPING_COLUMNS,
+                       ForeignLineItem, ForeignPO, LineItems, LocalLineItem, LocalPO, available_backends, format_cents,
+                       pdf_filename)
+from po_cache import po_key, render_cache
+from po_history import POHistory
+from po_hscodes import hs_codes
+from po_import import import_line_items, import_template
+from po_jobs import CANCELLED, DONE, FAILED, QueueFull, render_queue
+from po_master import CONSIGNEE_FIELDS, SUPPLIER_FIELDS, consignees, suppliers
+from po_metrics import prometheus_text, summary
 
 st.set_page_config(page_title="PO PDF Generator", layout="wide")
 
+# pandas and reportlab are imported where they are first needed, so the first
+# page shows without them; the renderer loads on a worker thread meanwhile
+render_queue.warm()
+
+# Line items shown on screen per page; the PDF always has all of them
+PREVIEW_ROWS = 200
+
+
+def import_items_ui(key, store, item_cls):
+    """Upload + import widgets for a line-item store; returns True when rows were added."""
+    uploaded = st.file_uploader("Supplier sheet", type=["csv", "xlsx"], key=key)
+    st.download_button("Download template", import_template(item_cls), file_name="line_items.csv",
+                       mime="text/csv", key=f"{key}_template")
+    if uploaded is None or not st.button("Import", key=f"{key}_button"):
+        return False
+    try:
+        result = import_line_items(uploaded, store, filename=uploaded.name)
+    except (ValueError, ImportError) as e:
+        st.error(str(e))
+        return False
+    if result.added:
+        st.success(f"Imported {result.added:,} items (Sr. No. {result.first_sr_no}-{result.last_sr_no}).")
+    if result.skipped:
+        import pandas as pd
+
+        st.warning(f"Skipped {result.skipped:,} invalid rows.")
+        st.table(pd.DataFrame(result.errors, columns=["Row", "Problem"]))
+    return result.added > 0
+
+
+def _apply_item_edits(editor_key, store, start, version_key):
+    """Apply a data_editor delta to the store, one row at a time."""
+    delta = st.session_state[editor_key]
+    for row, edits in delta["edited_rows"].items():
+        changes = {}
+        for name, value in edits.items():
+            if name in NUMERIC_FIELDS:
+                if value is not None:
+                    changes[name] = value
+            else:
+                changes[name] = value or ""
+        store.update(start + int(row), **changes)
+    for row in sorted(delta["deleted_rows"], reverse=True):
+        del store[start + row]
+    for added in delta["added_rows"]:
+        item = {name: "" for name in store.text_fields}
+        item.update({"qty": 1, "unit_cost": 0})
+        item.update({name: value for name, value in added.items() if value is not None})
+        store.append(item)
+    # A fresh editor key drops the applied delta from the widget
+    st.session_state[version_key] += 1
+
+
+def _move_item(store, src_key, dst_key, version_key):
+    store.move(st.session_state[src_key] - 1, st.session_state[dst_key] - 1)
+    st.session_state[version_key] += 1
+
+
+def _clamp(key, maximum):
+    # Number inputs keep their value across reruns; keep it valid when the store shrinks
+    if st.session_state.get(key, 1) > maximum:
+        st.session_state[key] = maximum
+
+
+def line_items_editor(key, store, columns):
+    """Editable grid over one page of a line-item store.
+
+    Only the visible page is turned into a DataFrame and Sr. No. is worked
+    out for those rows only; an edit updates one row of the store and its
+    running total, whatever the size of the PO.
+    """
+    version_key = f"{key}_version"
+    st.session_state.setdefault(version_key, 0)
+
+    pages = max((len(store) + PREVIEW_ROWS - 1) // PREVIEW_ROWS, 1)
+    page_key = f"{key}_page"
+    _clamp(page_key, pages)
+    page = st.number_input(f"Page (of {pages})", 1, pages, key=page_key) if pages > 1 else 1
+    start = (page - 1) * PREVIEW_ROWS
+
+    import pandas as pd
+
+    names = store.text_fields + NUMERIC_FIELDS
+    frame = pd.DataFrame(
+        [(start + i + 1, *row[:-2], row[-2] / 100, format_cents(row[-1]))
+         for i, row in enumerate(store.rows(start, start + PREVIEW_ROWS))],
+        columns=["sr_no", *names, "total"],
+    )
+    labels = dict(zip(["sr_no", *names, "total"], columns))
+    config = {name: st.column_config.TextColumn(label) for name, label in labels.items()}
+    config["sr_no"] = st.column_config.NumberColumn(labels["sr_no"], disabled=True)
+    config["qty"] = st.column_config.NumberColumn(labels["qty"], min_value=1, step=1)
+    config["unit_cost"] = st.column_config.NumberColumn(labels["unit_cost"], min_value=0.0, step=0.01,
+                                                        format="%.2f")
+    config["total"] = st.column_config.TextColumn(labels["total"], disabled=True)
+
+    editor_key = f"{key}_editor_{st.session_state[version_key]}"
+    st.data_editor(frame, key=editor_key, column_config=config, num_rows="dynamic", hide_index=True,
+                   on_change=_apply_item_edits, args=(editor_key, store, start, version_key))
+    if len(store) > PREVIEW_ROWS:
+        st.caption(f"Rows {start + 1:,}-{min(start + PREVIEW_ROWS, len(store)):,} of {len(store):,} line items.")
+
+    # Reorder by Sr. No.; the grid itself can't drag rows
+    if len(store) > 1:
+        move_keys = (f"{key}_move_from", f"{key}_move_to")
+        for move_key in move_keys:
+            _clamp(move_key, len(store))
+        col1, col2, col3 = st.columns([2, 2, 1])
+        col1.number_input("Move Sr. No.", 1, len(store), key=move_keys[0])
+        col2.number_input("to position", 1, len(store), key=move_keys[1])
+        col3.button("Move", key=f"{key}_move", on_click=_move_item, args=(store, *move_keys, version_key))
+
+
+@st.cache_resource
+def get_history():
+    return POHistory()
+
+
+def render_job_ui(key, po, start, download_label, save=True):
+    """Run "Generate PDF" as a background job: progress, Cancel, then the download button.
+
+    The job (and its PDF) only ever lives in this session's state, never on
+    disk, so concurrent users can't overwrite each other's output.
+    """
+    job_key = f"{key}_job"
+    if start:
+        previous = st.session_state.get(job_key)
+        if previous is not None:
+            previous.cancel()
+        try:
+            st.session_state[job_key] = render_queue.submit(po, st.session_state.backend)
+        except QueueFull:
+            st.warning("The server is busy rendering other POs, please try again in a moment.")
+            return
+        if save:
+            get_history().save(po)
+
+    job = st.session_state.get(job_key)
+    if job is not None:
+        # Only offer the PDF if it still matches what is on screen
+        job_ui(key, job, download_label, pdf_filename(po), current=job.key == po_key(po, job.backend))
+
+
+def job_ui(key, job, download_label, file_name, current=True, **download_args):
+    """Progress and Cancel while ``job`` runs, then its download button (when ``current``) or outcome."""
+    if not job.finished:
+        st.button("Cancel", key=f"{key}_cancel", on_click=job.cancel)
+        bar = st.progress(job.fraction)
+        # Any widget interaction interrupts this wait; the job carries on
+        # and the next run picks its progress up again
+        while not job.wait(0.25):
+            bar.progress(job.fraction, text=f"Rendering line items: {job.done:,} of {job.total:,}")
+        bar.empty()
+
+    if job.state == DONE:
+        if job.trace is not None:
+            st.session_state.last_trace = job.trace
+        if current:
+            st.download_button(download_label, job.result, file_name=file_name, mime="application/pdf",
+                               **download_args)
+    elif job.state == CANCELLED:
+        st.info("PDF generation cancelled.")
+    elif job.state == FAILED:
+        st.error(f"PDF generation failed: {job.error}")
+
+
+@st.fragment
+def history_panel():
+    query = st.text_input("Search PO No., PR Number, supplier or company", key="history_query")
+    entries = get_history().search(query)
+    if not entries:
+        st.caption("No matching POs.")
+        return
+    entry = st.selectbox("Matches", entries, format_func=lambda e: e.label, key="history_choice")
+    po = get_history().load(entry.id)
+    st.caption(f"{entry.format.capitalize()} PO, {len(po.line_items):,} line items")
+    render_job_ui("history", po, st.button("Re-render", key="history_render"), "Download PDF", save=False)
+
+    # Print run: every match in one PDF, one copy of the fonts and letterheads.
+    # Loaded and rendered on the render queue like any other PDF
+    if st.button(f"Collate all {len(entries)} matches", key="history_collate"):
+        previous = st.session_state.get("history_collate_job")
+        if previous is not None:
+            previous.cancel()
+        history, ids = get_history(), [e.id for e in entries]
+        try:
+            st.session_state.history_collate_job = render_queue.submit_collated(
+                lambda: [history.load(entry_id) for entry_id in ids], "Print run")
+        except QueueFull:
+            st.warning("The server is busy rendering other POs, please try again in a moment.")
+    job = st.session_state.get("history_collate_job")
+    if job is not None:
+        job_ui("history_collate", job, "Download print run", "print_run.pdf", on_click="ignore")
+
+
+# ForeignPO fields entered on the foreign screen; widget keys are "foreign_<field>"
+FOREIGN_FIELDS = (
+    "po_no", "po_date", "pr_no", "to_name", "designation", "company", "telephone", "email", "fax", "mobile",
+    "address", "subject", "consignee_name", "consignee_address", "consignee_contact", "consignee_tel",
+    "consignee_fax", "consignee_email",
+)
+
+# Supplier/consignee fields start from these and can be filled from the master files
+FOREIGN_PARTY_DEFAULTS = {
+    "to_name": "Ms. Joanna Zhang",
+    "designation": "Sales",
+    "company": "Shanghai FR Import&Export Co.,Ltd.",
+    "telephone": "-",
+    "email": "jz@frindustry.com",
+    "fax": "-",
+    "mobile": "18301768502",
+    "address": "No.5588 Caoan Rd ,Jiading District,201800,Shanghai,China",
+    "consignee_name": "Meta Solutions Industrial Company",
+    "consignee_address": "First Floor, KCT Building No: 8588, Al Firdaws Area, Prince Mohammed Bin Fahad Road, "
+                         "Dammam 31441, Saudi Arabia",
+    "consignee_contact": "Mr. Selahadin - +966 535 005 759",
+    "consignee_tel": "+966 13 868 1777",
+    "consignee_fax": "+966 13 868 5777",
+    "consignee_email": "Procurement@metasolco.com",
+}
+
+
+def _fill_from_master(choice_key, fields):
+    record = st.session_state[choice_key]
+    if record is not None:
+        for name in fields:
+            st.session_state[f"foreign_{name}"] = record[name]
+
+
+def master_picker(label, master, key, fields, format_func):
+    """Type-ahead over a master file; picking a match fills in ``fields``."""
+    query = st.text_input(label, key=f"{key}_query", placeholder="Type a few letters")
+    if not query.strip():
+        return
+    matches = master.search(query)
+    if not matches:
+        st.caption("No match in the master file.")
+        return
+    st.selectbox("Matches", matches, index=None, format_func=format_func, key=f"{key}_choice",
+                 on_change=_fill_from_master, args=(f"{key}_choice", fields))
+
+
+@st.fragment
+def foreign_header():
+    # First row: PO No. + Date
+    col1, col2 = st.columns(2)
+    col1.text_input("P.O. No.", "MSIC-PO-A051-06-2025", key="foreign_po_no")
+    col2.date_input("Date", date(2025, 6, 2), key="foreign_po_date")
+
+    # Second row: PR No. (single column)
+    st.text_input("P.R. No.", "MSIC-PR-A010-06-2025", key="foreign_pr_no")
+
+    st.markdown("### Supplier Details")
+    master_picker("Find supplier", suppliers, "supplier", SUPPLIER_FIELDS,
+                  lambda record: f"{record['company']} ({record['to_name']})")
+
+    # To + Designation
+    col1, col2 = st.columns(2)
+    col1.text_input("To", key="foreign_to_name")
+    col2.text_input("Designation", key="foreign_designation")
+
+    # Company name (full width)
+    st.text_input("Company", key="foreign_company")
+
+    # Telephone + Email
+    col1, col2 = st.columns(2)
+    col1.text_input("Telephone No.", key="foreign_telephone")
+    col2.text_input("Email", key="foreign_email")
+
+    # Fax + Mobile
+    col1, col2 = st.columns(2)
+    col1.text_input("Fax No.", key="foreign_fax")
+    col2.text_input("Mobile No.", key="foreign_mobile")
+
+    # Address (full width)
+    st.text_area("Address", key="foreign_address")
+
+    st.markdown("### Subject")
+    st.text_area("Subject", "Promotional Items", key="foreign_subject")
+
+
+@st.fragment
+def foreign_consignee():
+    st.markdown("### Consignee Details & Notify Party")
+    master_picker("Find consignee", consignees, "consignee", CONSIGNEE_FIELDS,
+                  lambda record: record["consignee_name"])
+    st.text_input("Name", key="foreign_consignee_name")
+    st.text_area("Address", key="foreign_consignee_address")
+    st.text_input("Contact", key="foreign_consignee_contact")
+    st.text_input("Tel.", key="foreign_consignee_tel")
+    st.text_input("Fax", key="foreign_consignee_fax")
+    st.text_input("Email", key="foreign_consignee_email")
+
+
+@st.cache_data
+def shipping_docs_frame():
+    import pandas as pd
+
+    # Mixed int/"-" columns as text, so Arrow doesn't have to guess a type
+    return pd.DataFrame(DEFAULT_SHIPPING_DOCS, columns=SHIPPING_COLUMNS).astype(str)
+
+
+def _fill_hs_code():
+    record = st.session_state.hs_code_choice
+    if record is not None:
+        st.session_state.foreign_item_hs_code = record["code"]
+
+
+def hs_code_picker():
+    """Type-ahead over the HS code table; picking a code fills in the Add Item form."""
+    query = st.text_input("Find HS code", key="hs_code_query", placeholder="Type the first digits")
+    if not query.strip():
+        return
+    matches = hs_codes.suggest(query)
+    if not matches:
+        st.caption("No HS code starts with that.")
+        return
+    st.selectbox("Matches", matches, index=None, key="hs_code_choice", on_change=_fill_hs_code,
+                 format_func=lambda record: f"{record['code']} – {record['description']}")
+
+
+@st.fragment
+def foreign_purchase_items():
+    items = st.session_state.foreign_line_items
+    with st.expander("Import Purchase Items (CSV / Excel)"):
+        import_items_ui("foreign_import", items, ForeignLineItem)
+
+    with st.expander("Add Purchase Item"):
+        hs_code_picker()
+        # A form, so typing an item doesn't rerun anything until it is added
+        with st.form("foreign_item_form", clear_on_submit=True):
+            hs_code = st.text_input("HS Code", key="foreign_item_hs_code")
+            product_desc = st.text_area("Product Description", "")
+            uom = st.text_input("UoM", "")
+            qty = st.number_input("Qty", min_value=1, value=1)
+            unit_cost = st.number_input("Unit Cost", min_value=0.0, value=0.0, step=0.01)
+            if st.form_submit_button("Add Item"):
+                items.append(ForeignLineItem(hs_code, product_desc, uom, qty, unit_cost))
+
+    if items:
+        line_items_editor("foreign_items", items, FOREIGN_COLUMNS)
+
+
+def foreign_po_from_state():
+    return ForeignPO(
+        **{name: st.session_state[f"foreign_{name}"] for name in FOREIGN_FIELDS},
+        shipping_docs=[row[:] for row in DEFAULT_SHIPPING_DOCS],
+        line_items=st.session_state.foreign_line_items,
+    )
+
+
+@st.fragment
+def foreign_generate():
+    po = foreign_po_from_state()
+    start = st.button("Generate PDF")
+    if start:
+        problems = hs_codes.validate_line_items(po.line_items)
+        if problems:
+            import pandas as pd
+
+            st.error(f"{len(problems):,} line item(s) have an invalid HS code; fix them before generating the PDF.")
+            st.dataframe(pd.DataFrame(problems[:PREVIEW_ROWS], columns=["Sr. No.", "HS Code", "Problem"]),
+                         hide_index=True)
+            start = False
+    render_job_ui("foreign", po, start, "Download PDF")
+
+
 report_type = st.sidebar.selectbox(
     "Select Report Format",
     ["Local Report Format", "Foreign Report Format"]
 )
 
+# Engines that can't load here (WeasyPrint without pango) aren't offered
+st.sidebar.selectbox("PDF engine", available_backends(), key="backend",
+                     format_func=lambda b: {"canvas": "Canvas (reportlab)", "html": "HTML (WeasyPrint)"}[b])
+show_timings = st.sidebar.checkbox("Show render timings")
+# Filled in at the end of the script, once this run's render (if any) is done
+debug_panel = st.sidebar.container()
+
+cache_stats = render_cache.stats()
+st.sidebar.caption(
+    f"Render cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses, "
+    f"{cache_stats['entries']} PDFs ({cache_stats['bytes'] / 1e6:.1f} MB)"
+)
+
+with st.sidebar.expander("PO History"):
+    history_panel()
+
 st.title("Purchase Order PDF Generator")
 
 st.write(f"**Selected Report Type:** {report_type}")
@@ -55,12 +427,12 @@ if report_type == "Local Report Format":
             ref_quote = st.text_input("Reference Quotation #", "QT210163")
             telephone = st.text_input("Telephone No.", "+966 13 851 1013 x 1001")
             email = st.text_input("Email", "anu@fssitech.com")
-        
+
         subject = st.text_area("Subject")
 
         st.subheader("Line Items")
         if "line_items" not in st.session_state:
-            st.session_state.line_items = []
+            st.session_state.line_items = LineItems(LocalLineItem)
 
         with st.expander("Add Line Item"):
             desc = st.text_area("Description")
@@ -68,784 +440,88 @@ if report_type == "Local Report Format":
             qty = st.number_input("Qty", min_value=1, value=1)
             unit_cost = st.number_input("Unit Cost", min_value=0.0, value=0.0, step=0.01)
             if st.form_submit_button("Add Item", type="secondary"):
-                total_price = qty * unit_cost
-                st.session_state.line_items.append([
-                    len(st.session_state.line_items) + 1,
-                    desc,
-                    unit,
-                    qty,
-                    f"{unit_cost:,.2f}",
-                    f"{total_price:,.2f}"
-                ])
-
-        if st.session_state.line_items:
-            df = pd.DataFrame(
-            st.session_state.line_items,
-            columns=["Sr. No.", "Description", "Unit", "Qty", "Unit Cost", "Total Price"]
-            )
-            st.table(df)
-
-        total = sum(float(item[5].replace(",", "")) for item in st.session_state.line_items)
-        vat = total * 0.15
-        grand_total = total + vat
-
-        st.write(f"**Total:** {total:,.2f}")
-        st.write(f"**15% VAT:** {vat:,.2f}")
-        st.write(f"**Grand Total:** {grand_total:,.2f}")
+                st.session_state.line_items.append(LocalLineItem(desc, unit, qty, unit_cost))
+
+        po = LocalPO(
+            po_no=po_no,
+            po_date=po_date,
+            name=name,
+            designation=designation,
+            vat_no=vat_no,
+            mobile=mobile,
+            company_name=company_name,
+            fax_no=fax_no,
+            pr_number=pr_number,
+            supplier=supplier,
+            ref_quote=ref_quote,
+            telephone=telephone,
+            email=email,
+            subject=subject,
+            line_items=st.session_state.line_items
+        )
+
+        st.write(f"**Total:** {format_cents(po.total_cents)}")
+        st.write(f"**15% VAT:** {format_cents(po.vat_cents)}")
+        st.write(f"**Grand Total:** {format_cents(po.grand_total_cents)}")
 
         submitted = st.form_submit_button("Generate PDF")
 
     # --- FORM END ---
 
-    if submitted:
-        buffer = BytesIO()
-        c = canvas.Canvas(buffer, pagesize=A4)
-
-        # Draw Logo
-        if os.path.exists(LOGO_PATH_LEFT):
-            c.drawImage(LOGO_PATH_LEFT, 40, PAGE_HEIGHT - 60, width=2.11*inch, height=0.58*inch, preserveAspectRatio=True, mask='auto', anchor="nw")
-
-        right_img_width = 2.33 * inch
-        if os.path.exists(LOGO_PATH_RIGHT):
-            c.drawImage(LOGO_PATH_RIGHT, PAGE_WIDTH - 40 - right_img_width, PAGE_HEIGHT - 60, width=2.33*inch, height=0.58*inch, preserveAspectRatio=True,mask='auto', anchor='ne')
-
-        #VAT Number
-        c.setFont("CenturyGothic", 10)
-        c.drawString(40, PAGE_HEIGHT - 70, ' VAT No. 311863395100003')
-
-        c.setLineWidth(1)
-        c.line(40, PAGE_HEIGHT - 80, PAGE_WIDTH - 40, PAGE_HEIGHT - 80)
-        # Title
-        c.setFont("CenturyGothicBold", 12.5)
-        c.drawCentredString(PAGE_WIDTH / 2, PAGE_HEIGHT - 100, "PURCHASE ORDER")
-
-        c.setLineWidth(1)
-        c.line(40, PAGE_HEIGHT - 110, PAGE_WIDTH - 40, PAGE_HEIGHT - 110)
-
-        # Details block
-        c.setFont("CenturyGothic", 10)
-        c.drawString(40, PAGE_HEIGHT - 130, f"Name:")
-        c.drawString(130, PAGE_HEIGHT - 130, f"{name}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 132, line_end, PAGE_HEIGHT - 132)
-
-        po_line_start = PAGE_WIDTH / 2 + 70
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 130, f"PO No.:")
-        c.drawString(po_line_start, PAGE_HEIGHT - 130, f"{po_no}")
-        c.setLineWidth(0.3)
-        c.line(po_line_start, PAGE_HEIGHT - 132, PAGE_WIDTH - 50, PAGE_HEIGHT - 132)
-
-
-        c.drawString(40, PAGE_HEIGHT - 150, f"Designation:")
-        c.drawString(130, PAGE_HEIGHT - 150, f"{designation}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 152, line_end, PAGE_HEIGHT - 152)
-
-        
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 150, f"PO Date:")
-        c.drawString(po_line_start, PAGE_HEIGHT - 150, f"{po_date.strftime('%A, %B %d, %Y')}")
-        c.setLineWidth(0.3)
-        c.line(po_line_start, PAGE_HEIGHT - 152, PAGE_WIDTH - 50, PAGE_HEIGHT - 152)    
-
-
-        
-        c.drawString(40, PAGE_HEIGHT - 175, f"Company Name:")
-        # Prepare paragraph style
-        styles = getSampleStyleSheet()
-        style = styles["Normal"]
-        style.fontName = "CenturyGothic"
-        style.fontSize = 10
-        style.leading = 12  # line height
-
-        # Create Paragraph object for company name
-        company_para = Paragraph(company_name, style)
-        # Define frame position & size
-        frame_x = 130
-        frame_y = PAGE_HEIGHT - 200  # subtract height so text fits
-        frame_width = 150         # adjust to fit your layout
-        frame_height = 50        # height of the box
-
-        # Create frame
-        frame = Frame(frame_x, frame_y, frame_width, frame_height, showBoundary=0)
-
-        # Add paragraph to frame
-        frame.addFromList([company_para], c)
-        
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 190, line_end, PAGE_HEIGHT - 190)
-
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 175, f"Supplier")
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 185, f"Reference:")
-        c.drawString(po_line_start, PAGE_HEIGHT - 180, f"Quotation #: {ref_quote}")
-        c.setLineWidth(0.3)
-        c.line(po_line_start, PAGE_HEIGHT - 190, PAGE_WIDTH - 50, PAGE_HEIGHT - 190)
-
-        c.drawString(40, PAGE_HEIGHT - 210, f"Telephone No.:")
-        c.drawString(130, PAGE_HEIGHT - 210, f"{telephone}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 212, line_end, PAGE_HEIGHT - 212)
-
-        
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 210, f"Email:")
-        c.drawString(po_line_start, PAGE_HEIGHT - 210, f"{email}")
-        c.setLineWidth(0.3)
-        c.line(po_line_start, PAGE_HEIGHT - 212, PAGE_WIDTH - 50, PAGE_HEIGHT - 212)
-
-        c.drawString(40, PAGE_HEIGHT - 230, f"Fax No.:")
-        c.drawString(130, PAGE_HEIGHT - 230, f"{fax_no}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 232, line_end, PAGE_HEIGHT - 232)
-
-        
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 230, f"PR Number:")
-        c.drawString(po_line_start, PAGE_HEIGHT - 230, f"{pr_number}")
-        c.setLineWidth(0.3)
-        c.line(po_line_start, PAGE_HEIGHT - 232, PAGE_WIDTH - 50, PAGE_HEIGHT - 232)
-
-        c.drawString(40, PAGE_HEIGHT - 250, f"Mobile No.:")
-        c.drawString(130, PAGE_HEIGHT - 250, f"{mobile}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 252, line_end, PAGE_HEIGHT - 252)
-
-        c.drawString(40, PAGE_HEIGHT - 270, f"Subject: {subject}")
-
-        # Subject
-        # c.setFont("Helvetica-Bold", 10)
-        # c.drawString(40, PAGE_HEIGHT - 225, f"Subject: {subject}")
-
-        # Line Items Table
-        table_data = [["Sr. No.", "Description", "Unit", "Qty", "Unit Cost", "Total Price"]] + st.session_state.line_items
-        table = Table(table_data, colWidths=[40, 220, 50, 40, 70, 70])
-        table.setStyle(TableStyle([
-            ("GRID", (0,0), (-1,-1), 0.5, colors.black),
-            # ("BACKGROUND", (0,0), (-1,0), colors.lightgrey),
-            ("ALIGN", (2,1), (-1,-1), "CENTER"),
-            ("FONTSIZE", (0,0), (-1,-1), 9)
-        ]))
-        table.wrapOn(c, 40, PAGE_HEIGHT - 355)
-        table_height = len(table_data) * 18
-        table.drawOn(c, 40, PAGE_HEIGHT - 305 - table_height)
-
-        # Totals
-        y_pos = PAGE_HEIGHT - 320 - table_height
-        c.setFont("CenturyGothicBold", 10)
-        c.drawString(400, y_pos, f"Total: {total:,.2f}")
-        y_pos -= 12
-        c.drawString(400, y_pos, f"15% VAT: {vat:,.2f}")
-        y_pos -= 12
-        c.drawString(400, y_pos, f"Grand Total (SAR): {grand_total:,.2f}")
-
-        y_pos -= 12
-        c.setLineWidth(0.5)
-        c.line(40, y_pos, PAGE_WIDTH - 40, y_pos)
-        y_pos -= 12
-        c.setFont("CenturyGothic", 11)
-        c.drawString(40, y_pos, "Terms and Conditions")
-        #Payment Terms
-        y_pos -= 25
-        c.setFont("CenturyGothic", 10)
-        c.drawString(40, y_pos, "Payment Terms: 100% Advance through bank")
-        y_pos -= 12
-        c.drawString(40, y_pos, "Contact Person:")
-        y_pos -= 12
-        c.drawString(40, y_pos, "Incoterm: DPA")
-        y_pos -= 12
-        c.drawString(40, y_pos, "Place of Delivery: Meta Solutions Industrial Company,  First Floor, KCT Building No: 8588, Al Firdaws Ar")
-        y_pos -= 12
-        c.drawString(40, y_pos, "Contact Person: ")
-        y_pos -= 12
-        c.drawString(40, y_pos, "Delivery Schedule: Immediate")
-        y_pos -= 12
-        c.drawString(40, y_pos, "Packing: N/A")
-        y_pos -= 12
-        c.drawString(40, y_pos, "Packaging: N/A")
-        y_pos -= 12
-        c.drawString(40, y_pos, "Note: Duration of Subscription: 7th Aug 2025 to 6th Aug 2026 ")
-
-        # Note
-        y_pos -= 70
-        c.setFont("CenturyGothic", 10)
-        c.drawString(40, y_pos, "Please confirm the purchase order.")
-        y_pos -= 12
-        c.drawString(40, y_pos, "Best Regards")
-        y_pos -= 12
-        c.drawString(40, y_pos, "On behalf of Meta Solutions Industrial Company")
-
-        # Approvals
-        y_pos -= 35
-        c.setFont("CenturyGothic", 9)
-        c.drawString(40, 62, "Prepared & checked by:")
-        c.drawString(40, 36, "AMIR RODRIGUEZ")
-        c.drawString(180, 62, "Reviewed by:")
-        c.drawString(180, 36, "WASIUR REHMAN KHAN")
-        c.drawString(320, 62, "Authorized by")
-        c.drawString(320, 36, "DR. VIMAL PATEL")
-        c.drawString(460, 62, "Approved by:")
-        c.drawString(460, 36, " ANVER SADATH")
-
-        y_pos -= 24
-        c.setFont("CenturyGothic", 8)
-        c.drawString(40, 50, "Procurement Manager")
-        c.drawString(180, 50, "Finance Manager")
-        c.drawString(320, 50, "General Manager")
-        c.drawString(460, 50, "Chairman & Managing Director")
-
-        available_width = PAGE_WIDTH - (2 * 40)
-
-
-        if os.path.exists(LOGO_PATH_FOOTER):
-            c.drawImage(LOGO_PATH_FOOTER, 40, -30, width=available_width, preserveAspectRatio=True, mask='auto')
-
-
-        c.showPage()
-        c.save()
-        buffer.seek(0)
-
-        st.download_button(
-            label="Download PO PDF",
-            data=buffer,
-            file_name=f"{po_no}.pdf",
-            mime="application/pdf"
-        )
+    render_job_ui("local", po, submitted, "Download PO PDF")
+
+    # Widget callbacks aren't allowed inside a form, so the grid lives below it
+    if st.session_state.line_items:
+        st.subheader("Edit Line Items")
+        line_items_editor("local_items", st.session_state.line_items, LOCAL_COLUMNS)
+
+    with st.expander("Import Line Items (CSV / Excel)"):
+        if import_items_ui("local_import", st.session_state.line_items, LocalLineItem):
+            st.rerun()
 
 elif report_type == "Foreign Report Format":
     st.title("Foreign PO Report")
     st.subheader("Foreign Purchase Order Details")
 
-    # First row: PO No. + Date
-    col1, col2 = st.columns(2)
-    po_no = col1.text_input("P.O. No.", "MSIC-PO-A051-06-2025")
-    po_date = col2.date_input("Date", date(2025, 6, 2))
+    # Widgets that master data can fill take their value from session state only
+    for name, value in FOREIGN_PARTY_DEFAULTS.items():
+        st.session_state.setdefault(f"foreign_{name}", value)
 
-    # Second row: PR No. (single column)
-    pr_no = st.text_input("P.R. No.", "MSIC-PR-A010-06-2025")
-
-    st.markdown("### Supplier Details")
-
-    # To + Designation
-    col1, col2 = st.columns(2)
-    to_name = col1.text_input("To", "Ms. Joanna Zhang")
-    designation = col2.text_input("Designation", "Sales")
-
-    # Company name (full width)
-    company = st.text_input("Company", "Shanghai FR Import&Export Co.,Ltd.")
-
-    # Telephone + Email
-    col1, col2 = st.columns(2)
-    telephone = col1.text_input("Telephone No.", "-")
-    email = col2.text_input("Email", "jz@frindustry.com")
-
-    # Fax + Mobile
-    col1, col2 = st.columns(2)
-    fax = col1.text_input("Fax No.", "-")
-    mobile = col2.text_input("Mobile No.", "18301768502")
-
-    # Address (full width)
-    address = st.text_area("Address", "No.5588 Caoan Rd ,Jiading District,201800,Shanghai,China")
-
-    st.markdown("### Subject")
-    subject = st.text_area("Subject", "Promotional Items")
-     # ---- Consignee Details & Notify Party ----
-    st.markdown("### Consignee Details & Notify Party")
-    consignee_name = st.text_input("Name", "Meta Solutions Industrial Company")
-    consignee_address = st.text_area(
-        "Address",
-        "First Floor, KCT Building No: 8588, Al Firdaws Area, Prince Mohammed Bin Fahad Road, Dammam 31441, Saudi Arabia"
-    )
-    consignee_contact = st.text_input("Contact", "Mr. Selahadin - +966 535 005 759")
-    consignee_tel = st.text_input("Tel.", "+966 13 868 1777")
-    consignee_fax = st.text_input("Fax", "+966 13 868 5777")
-    consignee_email = st.text_input("Email", "Procurement@metasolco.com")
+    # Each section is a fragment: typing in one reruns only that section,
+    # not the whole screen with its tables
+    foreign_header()
+    foreign_consignee()
 
     # ---- Shipping Documents ----
     st.markdown("### Shipping Documents")
-    shipping_docs = [
-        ["Bill of Lading / Airway Bill", 2, 1],
-        ["Packing List", 2, 1],
-        ["Certificate of Origin (Chambered)", 2, 1],
-        ["Commercial Invoice (Chambered)", 2, 1],
-        ["Insurance Policy", 1, "-"],
-        ["Certificate of Analysis", 2, "-"],
-        ["Material Safety Data Sheet", 2, "-"]
-    ]
-    shipping_df = pd.DataFrame(shipping_docs, columns=["Documentation", "Original", "Duplicate"])
-    st.table(shipping_df)
+    st.table(shipping_docs_frame())
 
     # ---- Purchase Details (Dynamic Table) ----
     st.markdown("### Purchase Details")
     if "foreign_line_items" not in st.session_state:
-        st.session_state.foreign_line_items = []
-
-    with st.expander("Add Purchase Item"):
-        hs_code = st.text_input("HS Code", "")
-        product_desc = st.text_area("Product Description", "")
-        uom = st.text_input("UoM", "")
-        qty = st.number_input("Qty", min_value=1, value=1)
-        unit_cost = st.number_input("Unit Cost", min_value=0.0, value=0.0, step=0.01)
-        if st.button("Add Item"):
-            total_price = qty * unit_cost
-            st.session_state.foreign_line_items.append([
-                len(st.session_state.foreign_line_items) + 1,
-                hs_code,
-                product_desc,
-                uom,
-                qty,
-                f"{unit_cost:,.2f}",
-                f"{total_price:,.2f}"
-            ])
-
-    if st.session_state.foreign_line_items:
-        purchase_df = pd.DataFrame(
-            st.session_state.foreign_line_items,
-            columns=["S.No.", "HS Code", "Product Description", "UoM", "Qty", "Unit Cost", "Total Price"]
-        )
-        st.table(purchase_df)
-
-    # Calculate Grand Total from last column of line items
-    grand_total = 0.0
-    for row in st.session_state.foreign_line_items:
-        try:
-            # row[-1] is Total Price, remove commas and convert to float
-            grand_total += float(str(row[-1]).replace(",", ""))
-        except ValueError:
-            pass  # skip if conversion fails
-    
-    
-    if st.button("Generate PDF"):
-        pdf_path = "foreign_po.pdf"
-        c = canvas.Canvas(pdf_path, pagesize=A4)
-
-        # Draw Logo
-        if os.path.exists(LOGO_PATH_LEFT):
-            c.drawImage(LOGO_PATH_LEFT, 40, PAGE_HEIGHT - 60, width=2.11*inch, height=0.58*inch, preserveAspectRatio=True, mask='auto', anchor="nw")
-
-        right_img_width = 2.33 * inch
-        if os.path.exists(LOGO_PATH_RIGHT):
-            c.drawImage(LOGO_PATH_RIGHT, PAGE_WIDTH - 40 - right_img_width, PAGE_HEIGHT - 60, width=2.33*inch, height=0.58*inch, preserveAspectRatio=True,mask='auto', anchor='ne')
-
-        #VAT Number
-        c.setFont("CenturyGothic", 10)
-        c.drawString(40, PAGE_HEIGHT - 70, ' VAT No. 311863395100003')
-
-        c.setLineWidth(1)
-        c.line(40, PAGE_HEIGHT - 80, PAGE_WIDTH - 40, PAGE_HEIGHT - 80)
-        # Title
-        c.setFont("CenturyGothicBold", 12.5)
-        c.drawCentredString(PAGE_WIDTH / 2, PAGE_HEIGHT - 100, "FOREIGN PURCHASE ORDER")
-
-        c.setLineWidth(1)
-        c.line(40, PAGE_HEIGHT - 110, PAGE_WIDTH - 40, PAGE_HEIGHT - 110)
-
-        # Details block
-        c.setFont("CenturyGothic", 7.5)
-        c.drawString(40, PAGE_HEIGHT - 130, f"P.O. No.:")
-        c.drawString(130, PAGE_HEIGHT - 130, f"{po_no}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 132, line_end, PAGE_HEIGHT - 132)
-
-        po_line_start = PAGE_WIDTH / 2 + 70
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 130, f"Date:")
-        c.drawString(po_line_start, PAGE_HEIGHT - 130, f"{po_date.strftime('%A, %B %d, %Y')}")
-        c.setLineWidth(0.3)
-        c.line(po_line_start, PAGE_HEIGHT - 132, PAGE_WIDTH - 50, PAGE_HEIGHT - 132)
-
-        c.drawString(40, PAGE_HEIGHT - 140, f"P.R. No.:")
-        c.drawString(130, PAGE_HEIGHT - 140, f"{pr_no}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 142, line_end, PAGE_HEIGHT - 142)
-
-        c.setFont("CenturyGothic", 7.5)
-        c.drawString(40, PAGE_HEIGHT - 150, "Supplier Details")
-
-        c.drawString(40, PAGE_HEIGHT - 160, f"To:")
-        c.drawString(130, PAGE_HEIGHT - 160, f"{to_name}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 162, line_end, PAGE_HEIGHT - 162)
-
-        po_line_start = PAGE_WIDTH / 2 + 70
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 160, f"Designation:")
-        c.drawString(po_line_start, PAGE_HEIGHT - 160, f"{designation}")
-        c.setLineWidth(0.3)
-        c.line(po_line_start, PAGE_HEIGHT - 162, PAGE_WIDTH - 50, PAGE_HEIGHT - 162)
-
-        c.drawString(40, PAGE_HEIGHT - 170, f"Company:")
-        c.drawString(130, PAGE_HEIGHT - 170, f"{company}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 172, PAGE_WIDTH - 50, PAGE_HEIGHT - 172)
-
-        c.drawString(40, PAGE_HEIGHT - 180, f"Telephone No.:")
-        c.drawString(130, PAGE_HEIGHT - 180, f"{telephone}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 182, line_end, PAGE_HEIGHT - 182)
-
-        po_line_start = PAGE_WIDTH / 2 + 70
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 180, f"Email:")
-        c.drawString(po_line_start, PAGE_HEIGHT - 180, f"{email}")
-        c.setLineWidth(0.3)
-        c.line(po_line_start, PAGE_HEIGHT - 182, PAGE_WIDTH - 50, PAGE_HEIGHT - 182)
-
-        c.drawString(40, PAGE_HEIGHT - 190, f"Fax No:")
-        c.drawString(130, PAGE_HEIGHT - 190, f"{fax}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 192, line_end, PAGE_HEIGHT - 192)
-
-        po_line_start = PAGE_WIDTH / 2 + 70
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 190, f"Mobile No.:")
-        c.drawString(po_line_start, PAGE_HEIGHT - 190, f"{mobile}")
-        c.setLineWidth(0.3)
-        c.line(po_line_start, PAGE_HEIGHT - 192, PAGE_WIDTH - 50, PAGE_HEIGHT - 192)
-
-        c.drawString(40, PAGE_HEIGHT - 200, f"Address:")
-        c.drawString(130, PAGE_HEIGHT - 200, f"{address}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 202, PAGE_WIDTH - 50, PAGE_HEIGHT - 202)
-
-        c.drawString(40, PAGE_HEIGHT - 210, f"Subject:")
-        c.drawString(130, PAGE_HEIGHT - 210, f"{subject}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 212, PAGE_WIDTH - 50, PAGE_HEIGHT - 212)
-
-        c.setStrokeColorRGB(0, 0, 0)  # black border
-        c.setLineWidth(1)
-        c.rect(38, PAGE_HEIGHT - 302, PAGE_WIDTH - 80, 80, stroke=1, fill=0)
-
-        c.setFont("CenturyGothicBold", 7.5)
-        c.drawString(40, PAGE_HEIGHT - 230, "Saudi Import Regulations:")
-
-        c.setFont("CenturyGothic", 7.5)
-        c.drawString(40, PAGE_HEIGHT - 240, "This is to notify Saudi Customs authority will not allow to clear the cargo of any material without any origin")
-
-        c.drawString(40, PAGE_HEIGHT - 250, "information identification label, Hazmats or Hazcom, and supplier will be liable for the cost of return and")
-        c.drawString(40, PAGE_HEIGHT - 260, "the penalties")
-        c.drawString(40, PAGE_HEIGHT - 270, "a. Product Name")
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 270, "e. Date of Production")
-        c.drawString(40, PAGE_HEIGHT - 280, "b. Weight(Gross/Net)")
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 280, "f. Hazcom or Hazmat signs as per the MSDS,")
-        c.drawString(40, PAGE_HEIGHT - 290, "c. Supplier name,")
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 290, "g. Country of origin for all drums / IBC's etc.")
-        c.drawString(40, PAGE_HEIGHT - 300, "d. Batch# or Lot#,")
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 300, "h. SASO Certificate for spares or equipments.")
-
-        c.drawString(40, PAGE_HEIGHT - 320, "Terms & Conditions:")
-        c.setFont("CenturyGothicBold", 7.5)
-        c.drawString(40, PAGE_HEIGHT - 330, "Please note that this FPO T&C is our standard format; it may not be applicable to your materials or services. We kindly request that")
-        c.drawString(40, PAGE_HEIGHT - 340, "you review the clauses and disregard any that do not pertain to your products and services.")
-
-        c.setFont("CenturyGothic", 7.5)
-        c.drawString(40, PAGE_HEIGHT - 350, "A  Payment Terms   : Advance")
-        c.drawString(40, PAGE_HEIGHT - 360, "B  Mode of Payment : 100% Advance through bank")
-        c.drawString(40, PAGE_HEIGHT - 370, "C  Regulations :")
-
-        c.setFont("CenturyGothic", 7)
-        c.drawString(50, PAGE_HEIGHT - 380, "- Photos of the material must be sent prior to dispatch, with a clear view of the label and the container. Do not ship the goods unless confirmed by")
-        c.drawString(50, PAGE_HEIGHT - 390, "  the consignee and/or a COA is provided. (The supplier will not hold the containers once the product is stuffed and ready for shipment.)")
-
-        c.drawString(50, PAGE_HEIGHT - 400, "- Purchase Order number, HS Code, and Weight (Net/Gross) must be mentioned in all documents. ")
-        c.drawString(50, PAGE_HEIGHT - 410, "- Please send the draft of the shipping documents before legalization. Send the scan of the shipping documents after legalization, prior to courier.")
-    
-        c.drawString(50, PAGE_HEIGHT - 420, "- Please mention the bill of lading and container number in the commercial invoice and packing list.")
-        c.drawString(50, PAGE_HEIGHT - 430, "- Place the COA, Material Safety Data Sheet, and Packing List along with the goods.")
-
-        c.setFont("CenturyGothic", 7.5)
-        c.drawString(40, PAGE_HEIGHT - 440, "D  INCO terms          :   DAP - MestaSoL, 2nd Industiral, Dammam")
-        c.drawString(40, PAGE_HEIGHT - 450, "E  Place of Delivery   :   Meta Solutions Industrial Company, 2nd Industrial Dammam")
-        c.drawString(40, PAGE_HEIGHT - 460, "F  Delivery Priority   :   Immediate")
-        c.drawString(40, PAGE_HEIGHT - 470, "G  Delivery Schedule   :   Immediate")
-        c.drawString(40, PAGE_HEIGHT - 480, "H  Packing             :   Palletized")
-        c.drawString(40, PAGE_HEIGHT - 490, "I  Packaging           :   Palletized and shrink-wrapped")
-        c.drawString(40, PAGE_HEIGHT - 500, "J  Additional Terms    :   Logo allocation: 300 pcs - MetaSol, 100 pcs - GIT, and 100 pcs - IAA ")
-
-
-        # -------- SUPPLIER DETAILS --------
-        y = PAGE_HEIGHT - 510
-        # c.setFont("Helvetica-Bold", 12)
-        # c.drawString(40, y, "Supplier Details")
-        # y -= 15
-        # c.setFont("Helvetica", 10)
-        # supplier_lines = [
-        #     f"P.O. No.: {po_no}   Date: {po_date.strftime('%A, %B %d, %Y')}",
-        #     f"P.R. No.: {pr_no}",
-        #     f"To: {to_name}   Designation: {designation}",
-        #     f"Company: {company}",
-        #     f"Telephone No.: {telephone}   Email: {email}",
-        #     f"Fax No.: {fax}   Mobile No.: {mobile}",
-        #     f"Address: {address}",
-        #     f"Subject: {subject}"
-        # ]
-        # for line in supplier_lines:
-        #     c.drawString(40, y, line)
-        #     y -= 14
-
-        # # -------- CONSIGNEE TABLE --------
-        styles = getSampleStyleSheet()
-        century_style = ParagraphStyle(
-            name="CenturyGothicSmall",  # Just a name for your reference
-            fontName="CenturyGothic",   # Must match your registered font
-            fontSize=7.5,
-            leading=9
-        )
-        c.setFont("CenturyGothic", 7.5)
-        consignee_data = [
-        ["Consignee Details & Notify Party", ""],
-        ["Name", consignee_name],
-        ["Address", Paragraph(consignee_address,century_style)],  # wrapped
-        ["Contact", consignee_contact],
-        ["Tel.", consignee_tel],
-        ["Fax", consignee_fax],
-        ["Email", consignee_email]
-    ]
-
-        # row heights — make Address row taller (index 2)
-        consignee_row_heights = [20, 18, 50, 18, 18, 18, 18]
-
-        consignee_table = Table(consignee_data, colWidths=[80, 180], rowHeights=consignee_row_heights)
-        consignee_table.setStyle(TableStyle([
-            ("GRID", (0,0), (-1,-1), 0.5, colors.black),
-            ("BACKGROUND", (0,0), (-1,0), colors.lightgrey),
-            ("SPAN", (0,0), (-1,0)),
-            ("FONTSIZE", (0,0), (-1,-1), 7.5),
-            ("VALIGN", (0,0), (-1,-1), "TOP"),
-            ("FONTNAME", (0,0), (-1,0), "CenturyGothicBold"), # header bold
-            ("FONTNAME", (0,1), (-1,-1), "CenturyGothic"),    # rest normal
-            ("ALIGN", (0,0), (-1,0), "CENTER")
-        ]))
-
-        # # -------- SHIPPING DOCUMENTS TABLE --------
-        shipping_data = [["Shipping Documents", "", ""], ["Documentation", "Original", "Duplicate"]] + shipping_df.values.tolist()
-        shipping_table = Table(shipping_data, colWidths=[160, 50, 50])
-        shipping_table.setStyle(TableStyle([
-            ("GRID", (0,0), (-1,-1), 0.5, colors.black),
-            ("BACKGROUND", (0,0), (-1,0), colors.lightgrey),
-            ("FONTSIZE", (0,0), (-1,-1), 7.5),
-            ("SPAN", (0,0), (-1,0)),
-            ("ALIGN", (1,1), (-1,-1), "CENTER"),
-            ("ALIGN", (0,0), (-1,0), "CENTER"),
-            ("FONTNAME", (0,0), (-1,0), "CenturyGothicBold"), # header bold
-            ("FONTNAME", (0,1), (-1,-1), "CenturyGothic"),    # rest normal
-        ]))
-
-        # Draw both tables side-by-side
-        y -= 10
-        consignee_table.wrapOn(c, 40, y)
-        shipping_table.wrapOn(c, 320, y)
-        consignee_table.drawOn(c, 40, y - consignee_table._height)
-        shipping_table.drawOn(c, 320, y - shipping_table._height)
-
-        # Adjust Y after tallest table
-        side_tables_height = max(consignee_table._height, shipping_table._height)
-        y = y - side_tables_height - 20
-
-        available_width = PAGE_WIDTH - (2 * 40)
-        if os.path.exists(LOGO_PATH_FOOTER):
-            c.drawImage(LOGO_PATH_FOOTER, 40, -30, width=available_width, preserveAspectRatio=True, mask='auto')
-        c.showPage()
-        # # -------- NEW PAGE --------
-        # Draw Logo
-        if os.path.exists(LOGO_PATH_LEFT):
-            c.drawImage(LOGO_PATH_LEFT, 40, PAGE_HEIGHT - 60, width=2.11*inch, height=0.58*inch, preserveAspectRatio=True, mask='auto', anchor="nw")
-
-        right_img_width = 2.33 * inch
-        if os.path.exists(LOGO_PATH_RIGHT):
-            c.drawImage(LOGO_PATH_RIGHT, PAGE_WIDTH - 40 - right_img_width, PAGE_HEIGHT - 60, width=2.33*inch, height=0.58*inch, preserveAspectRatio=True,mask='auto', anchor='ne')
-
-        #VAT Number
-        c.setFont("CenturyGothic", 10)
-        c.drawString(40, PAGE_HEIGHT - 70, ' VAT No. 311863395100003')
-
-        c.setLineWidth(1)
-        c.line(40, PAGE_HEIGHT - 80, PAGE_WIDTH - 40, PAGE_HEIGHT - 80)
-        # Title
-        c.setFont("CenturyGothicBold", 12.5)
-        c.drawCentredString(PAGE_WIDTH / 2, PAGE_HEIGHT - 100, "FOREIGN PURCHASE ORDER")
-
-        c.setLineWidth(1)
-        c.line(40, PAGE_HEIGHT - 110, PAGE_WIDTH - 40, PAGE_HEIGHT - 110)
-
-        # Details block
-        c.setFont("CenturyGothic", 7.5)
-        c.drawString(40, PAGE_HEIGHT - 130, f"P.O. No.:")
-        c.drawString(130, PAGE_HEIGHT - 130, f"{po_no}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 132, line_end, PAGE_HEIGHT - 132)
-
-        po_line_start = PAGE_WIDTH / 2 + 70
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 130, f"Date:")
-        c.drawString(po_line_start, PAGE_HEIGHT - 130, f"{po_date.strftime('%A, %B %d, %Y')}")
-        c.setLineWidth(0.3)
-        c.line(po_line_start, PAGE_HEIGHT - 132, PAGE_WIDTH - 50, PAGE_HEIGHT - 132)
-
-        c.drawString(40, PAGE_HEIGHT - 140, f"P.R. No.:")
-        c.drawString(130, PAGE_HEIGHT - 140, f"{pr_no}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 142, line_end, PAGE_HEIGHT - 142)
-
-        c.setFont("CenturyGothic", 7.5)
-        c.drawString(40, PAGE_HEIGHT - 150, "Supplier Details")
-
-        c.drawString(40, PAGE_HEIGHT - 160, f"To:")
-        c.drawString(130, PAGE_HEIGHT - 160, f"{to_name}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 162, line_end, PAGE_HEIGHT - 162)
-
-        po_line_start = PAGE_WIDTH / 2 + 70
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 160, f"Designation:")
-        c.drawString(po_line_start, PAGE_HEIGHT - 160, f"{designation}")
-        c.setLineWidth(0.3)
-        c.line(po_line_start, PAGE_HEIGHT - 162, PAGE_WIDTH - 50, PAGE_HEIGHT - 162)
-
-        c.drawString(40, PAGE_HEIGHT - 170, f"Company:")
-        c.drawString(130, PAGE_HEIGHT - 170, f"{company}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 172, PAGE_WIDTH - 50, PAGE_HEIGHT - 172)
-
-        c.drawString(40, PAGE_HEIGHT - 180, f"Telephone No.:")
-        c.drawString(130, PAGE_HEIGHT - 180, f"{telephone}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 182, line_end, PAGE_HEIGHT - 182)
-
-        po_line_start = PAGE_WIDTH / 2 + 70
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 180, f"Email:")
-        c.drawString(po_line_start, PAGE_HEIGHT - 180, f"{email}")
-        c.setLineWidth(0.3)
-        c.line(po_line_start, PAGE_HEIGHT - 182, PAGE_WIDTH - 50, PAGE_HEIGHT - 182)
-
-        c.drawString(40, PAGE_HEIGHT - 190, f"Fax No:")
-        c.drawString(130, PAGE_HEIGHT - 190, f"{fax}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 192, line_end, PAGE_HEIGHT - 192)
-
-        po_line_start = PAGE_WIDTH / 2 + 70
-        c.drawString(PAGE_WIDTH / 2, PAGE_HEIGHT - 190, f"Mobile No.:")
-        c.drawString(po_line_start, PAGE_HEIGHT - 190, f"{mobile}")
-        c.setLineWidth(0.3)
-        c.line(po_line_start, PAGE_HEIGHT - 192, PAGE_WIDTH - 50, PAGE_HEIGHT - 192)
-
-        c.drawString(40, PAGE_HEIGHT - 200, f"Address:")
-        c.drawString(130, PAGE_HEIGHT - 200, f"{address}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 202, PAGE_WIDTH - 50, PAGE_HEIGHT - 202)
-
-        c.drawString(40, PAGE_HEIGHT - 220, f"Subject:")
-        c.drawString(130, PAGE_HEIGHT - 220, f"{subject}")
-        c.setLineWidth(0.3)
-        line_end = (PAGE_WIDTH / 2) - 10
-        c.line(130, PAGE_HEIGHT - 222, PAGE_WIDTH - 50, PAGE_HEIGHT - 222)
-        c.drawString(40, PAGE_HEIGHT - 240, "Harmonized System (HS) Code       : AS PER BELOW")
-        c.drawString(40, PAGE_HEIGHT - 260, "Import Permit (Internal Use Only) : -")
-        c.drawString(40, PAGE_HEIGHT - 280, "Special Import Requirements       : -")
-        c.drawString(40, PAGE_HEIGHT - 300, "Supplier Offer Reference          : FR20250529-JW")
-        c.drawString(40, PAGE_HEIGHT - 320, "Purchase Details:")
-        # -------- PURCHASE DETAILS TABLE --------
-        # Convert long text fields to Paragraphs so they wrap
-        wrapped_items = []
-        for row in st.session_state.foreign_line_items:
-            wrapped_row = row.copy()
-            # Product Description is column index 2
-            wrapped_row[2] = Paragraph(str(wrapped_row[2]), century_style)
-            wrapped_items.append(wrapped_row)
-
-        # Create table data with header + wrapped content
-        purchase_data = [
-        ["S.No.", "HS Code", "Product Description", "UoM", "Qty", "Unit Cost", "Total Price"]
-        ] + wrapped_items
-
-        # Build the table (no fixed rowHeights → auto adjusts)
-        purchase_table = Table(
-        purchase_data,
-        colWidths=[40, 60, 180, 40, 40, 60, 60]
-        )
-
-        purchase_table.setStyle(TableStyle([
-        ("GRID", (0,0), (-1,-1), 0.5, colors.black),
-        ("FONTNAME", (0,0), (-1,0), "CenturyGothicBold"), # header bold
-        ("FONTNAME", (0,1), (-1,-1), "CenturyGothic"),    # body normal
-        ("FONTSIZE", (0,0), (-1,-1), 7.5),
-        ("ALIGN", (4,1), (-1,-1), "CENTER"),
-        ("VALIGN", (0,0), (-1,-1), "TOP")  # so wrapped text starts at top
-        ]))
-
-        # Draw table
-        y = PAGE_HEIGHT - 330
-        purchase_table.wrapOn(c, 40, y)
-        purchase_table.drawOn(c, 40, y - purchase_table._height)
-
-        y = y - purchase_table._height
-
-        y-=20
-        c.drawString(320, y, "Grand Total")
-        c.drawString(400, y, "USD")
-        c.drawString(PAGE_WIDTH - 100, y, f"{grand_total}")
-        y-=10
-        c.setLineWidth(0.3)
-        c.line(40, y, PAGE_WIDTH - 40, y)
-
-        y -= 30
-        c.setFont("CenturyGothic", 7.5)
-        c.drawString(40, y, "Note: Please mention the product name and HS code exactly the same in all documents")
-        y -= 12
-        c.drawString(40, y, "Best Regards")
-        y -= 12
-        c.drawString(40, y, "On behalf of Meta Solutions Industrial Company")
-
-        # Approvals
-        y -= 20
-        c.setFont("CenturyGothic", 7.5)
-        c.drawString(40, y, "Prepared & checked by:")
-        c.drawString(40, y-12, "AMIR RODRIGUEZ")
-        c.drawString(180, y, "Reviewed by:")
-        c.drawString(180, y-12, "WASIUR REHMAN KHAN")
-        c.drawString(320, y, "Authorized by")
-        c.drawString(320, y-12, "DR. VIMAL PATEL")
-        c.drawString(460, y, "Approved by:")
-        c.drawString(460, y-12, " ANVER SADATH")
-
-        y -= 24
-        c.setFont("CenturyGothic", 7)
-        c.drawString(40, y, "Procurement Manager")
-        c.drawString(180, y, "Finance Manager")
-        c.drawString(320, y, "General Manager")
-        c.drawString(460, y, "Chairman & Managing Director")
-
-        y= 70
-        c.drawString(40, y, "Please confirm the purchase order and send the scanned copy by email.")
-        y-=30
-        c.setLineWidth(0.3)
-        c.line(40, y+10, 130, y+10)
-        c.drawString(50, y, "Name")
-        c.line(170, y+10, 360, y+10)
-        c.drawString(180, y, "Supplier Authorized Signature and Date")
-        c.line(450, y+10, 550, y+10)
-        c.drawString(460, y, "Company Seal")
-
-        available_width = PAGE_WIDTH - (2 * 40)
-        if os.path.exists(LOGO_PATH_FOOTER):
-            c.drawImage(LOGO_PATH_FOOTER, 40, -30, width=available_width, preserveAspectRatio=True, mask='auto')
-
-        # Save PDF
-        c.showPage()
-        c.save()
-
-        # Download button in Streamlit
-        with open(pdf_path, "rb") as f:
-            st.download_button("Download PDF", f, file_name="foreign_po.pdf", mime="application/pdf")
\ No newline at end of file
+        st.session_state.foreign_line_items = LineItems(ForeignLineItem)
+    foreign_purchase_items()
+    foreign_generate()
+
+if show_timings:
+    import pandas as pd
+
+    with debug_panel:
+        trace = st.session_state.get("last_trace")
+        if trace is None:
+            st.caption("No PDF rendered in this session yet (cache hits are not timed).")
+        else:
+            st.caption(f"Last render: {trace['format']}, {trace['items']:,} items")
+            st.table(pd.DataFrame(
+                [(name, f"{seconds * 1000:.1f}") for name, seconds in trace["stages"].items()],
+                columns=["Stage", "ms"],
+            ))
+        rows = summary()
+        if rows:
+            st.caption("All renders in this process (ms)")
+            st.dataframe(pd.DataFrame(
+                [(fmt, name, count, *(f"{v * 1000:.1f}" for v in values)) for fmt, name, count, *values in rows],
+                columns=["Format", "Stage", "Count", "p50", "p90", "p99"],
+            ), hide_index=True)
+            st.download_button("Download metrics", prometheus_text(), file_name="po_metrics.prom",
+                               mime="text/plain")
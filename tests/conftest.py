@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+# The po_* modules live at the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def local_order():
+    return {
+        "format": "local", "po_no": "T-LOCAL-1", "po_date": "2025-01-01", "name": "Test",
+        "company_name": "Test Trading Est.", "supplier": "Test Supplier", "subject": "Test order",
+        "line_items": [{"description": "Stainless steel fitting", "unit": "EA", "qty": 2, "unit_cost": "10.50"}],
+    }
+
+
+@pytest.fixture
+def foreign_order():
+    return {
+        "format": "foreign", "po_no": "T-FOREIGN-1", "po_date": "2025-01-01", "to_name": "Test",
+        "company": "Test Co.", "address": "1 Test Road", "subject": "Test order", "consignee_name": "Consignee",
+        "line_items": [{"hs_code": "84818000", "product_description": "Ball valve, PN16", "uom": "PCS",
+                        "qty": 3, "unit_cost": "7.25"}],
+    }
@@ -0,0 +1,33 @@
+import os
+
+import po_assets
+
+
+def _same(a, b):
+    fields = ("name", "width", "height", "bitsPerComponent", "colorSpace", "_filters", "mask", "streamContent")
+    return all(getattr(a, f) == getattr(b, f) for f in fields) and getattr(a, "_decode", None) == getattr(b, "_decode", None)
+
+
+def test_disk_cache_round_trips(tmp_path, monkeypatch):
+    monkeypatch.setattr(po_assets, "ASSET_CACHE_DIR", str(tmp_path))
+    encoded = po_assets._load_encoded(po_assets.LOGO_PATH_LEFT)
+    assert len(os.listdir(tmp_path)) == 1
+
+    loaded = po_assets._load_encoded(po_assets.LOGO_PATH_LEFT)
+    assert loaded[:2] == encoded[:2]
+    assert _same(loaded[2], encoded[2])
+    assert (loaded[3] is None) == (encoded[3] is None)
+    if encoded[3] is not None:
+        assert _same(loaded[3], encoded[3])
+
+
+def test_damaged_cache_entry_is_rebuilt(tmp_path, monkeypatch):
+    monkeypatch.setattr(po_assets, "ASSET_CACHE_DIR", str(tmp_path))
+    bundle = po_assets._bundle_path(po_assets.LOGO_PATH_FOOTER)
+    with open(bundle, "wb") as f:
+        f.write(b'{"width": 1, "height": 1, "streams": [{"length": 99}]}\n')
+
+    width, height, xobj, _ = po_assets._load_encoded(po_assets.LOGO_PATH_FOOTER)
+    assert (width, height) == (xobj.width, xobj.height) != (1, 1)
+    with open(bundle, "rb") as f:
+        assert po_assets._parse_encoded(f.read())[:2] == (width, height)
@@ -0,0 +1,46 @@
+import os
+import zipfile
+
+from po_batch import render_batch
+
+
+def test_bad_order_is_reported_and_the_rest_rendered(tmp_path, local_order):
+    bad = {**local_order, "po_no": "T-BAD", "po_date": "not a date"}
+    good = [local_order, {**local_order, "po_no": "T-LOCAL-2"}]
+    count, failures, _ = render_batch([good[0], bad, good[1]], str(tmp_path), workers=2, chunksize=1)
+
+    assert count == 2
+    assert [name for name, _ in failures] == ["T-BAD"]
+    assert "ValueError" in failures[0][1]
+    assert sorted(os.listdir(tmp_path / "local")) == ["T-LOCAL-1.pdf", "T-LOCAL-2.pdf"]
+
+
+def test_bad_order_left_out_of_zip(tmp_path, local_order):
+    out = str(tmp_path / "run.zip")
+    count, failures, _ = render_batch([local_order, {"po_no": "T-BAD"}], out, workers=1)
+
+    assert count == 1 and len(failures) == 1
+    with zipfile.ZipFile(out) as archive:
+        assert archive.namelist() == ["local/T-LOCAL-1.pdf"]
+
+
+def test_local_and_foreign_with_the_same_number_are_kept_apart(tmp_path, local_order, foreign_order):
+    foreign_order["po_no"] = local_order["po_no"]
+    count, failures, _ = render_batch([local_order, foreign_order], str(tmp_path), workers=2, chunksize=1)
+
+    assert (count, failures) == (2, [])
+    for fmt in ("local", "foreign"):
+        with open(tmp_path / fmt / "T-LOCAL-1.pdf", "rb") as f:
+            assert f.read(4) == b"%PDF"
+
+
+def test_orders_with_the_same_file_name_fail_after_the_first(tmp_path, local_order):
+    orders = [{**local_order, "po_no": "A/1"}, {**local_order, "po_no": "A 1"}, {**local_order, "po_no": "a_1"}]
+    out = str(tmp_path / "run.zip")
+    count, failures, _ = render_batch(orders, out, workers=2, chunksize=1)
+
+    assert count == 1
+    assert [name for name, _ in failures] == ["A 1", "a_1"]
+    assert "already taken by PO A/1" in failures[0][1]
+    with zipfile.ZipFile(out) as archive:
+        assert archive.namelist() == ["local/A_1.pdf"]
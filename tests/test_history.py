@@ -0,0 +1,39 @@
+from datetime import date, timedelta
+
+import pytest
+
+import po_history
+from po_history import POHistory
+from po_models import po_from_dict
+
+
+@pytest.fixture
+def history(tmp_path, local_order):
+    history = POHistory(str(tmp_path / "history.sqlite3"))
+    start = date(2024, 1, 1)
+    # The alphabetically first PO numbers are the oldest
+    for i in range(30):
+        history.save(po_from_dict({**local_order, "po_no": f"PO-{i:03d}",
+                                   "po_date": (start + timedelta(days=i)).isoformat()}))
+    history.save(po_from_dict({**local_order, "po_no": "OTHER-1", "supplier": "Elsewhere Ltd",
+                               "po_date": "2023-06-01"}))
+    return history
+
+
+def _newest_first(entries):
+    return [(e.po_date, e.po_no) for e in entries]
+
+
+@pytest.mark.parametrize("broad_matches", [po_history.BROAD_MATCHES, 5])
+def test_search_returns_newest_matches_beyond_limit(history, monkeypatch, broad_matches):
+    monkeypatch.setattr(po_history, "BROAD_MATCHES", broad_matches)
+    hits = history.search("po-", limit=10)
+    assert [e.po_no for e in hits] == [f"PO-{i:03d}" for i in range(29, 19, -1)]
+    assert _newest_first(hits) == sorted(_newest_first(hits), reverse=True)
+
+
+@pytest.mark.parametrize("broad_matches", [po_history.BROAD_MATCHES, 5])
+def test_search_matches_any_column(history, monkeypatch, broad_matches):
+    monkeypatch.setattr(po_history, "BROAD_MATCHES", broad_matches)
+    assert [e.po_no for e in history.search("elsewhere")] == ["OTHER-1"]
+    assert history.search("no such po") == []
@@ -0,0 +1,47 @@
+import io
+
+import pytest
+
+from po_import import import_line_items
+from po_models import LineItems, LocalLineItem
+
+pytest.importorskip("pandas")
+
+
+def _import(text):
+    store = LineItems(LocalLineItem)
+    result = import_line_items(io.StringIO(text), store, filename="items.csv")
+    return store, result
+
+
+def test_valid_rows_are_added():
+    store, result = _import("Description,Unit,Qty,Unit Cost\nA,EA,2,10.505\nB,EA,\"1,000\",1e3\n")
+    assert (result.added, result.skipped) == (2, 0)
+    assert (result.first_sr_no, result.last_sr_no) == (1, 2)
+    assert store.sum_cents() == 2 * 1051 + 1000 * 100000
+
+
+@pytest.mark.parametrize("row, message", [
+    ("A,EA,1,inf", "Unit Cost"),
+    ("A,EA,1,-inf", "Unit Cost"),
+    ("A,EA,1,nan", "Unit Cost"),
+    ("A,EA,1,1e400", "Unit Cost"),
+    ("A,EA,1,1e17", "Unit Cost"),
+    ("A,EA,1e20,1", "Qty"),
+    ("A,EA,inf,1", "Qty"),
+    ("A,EA,0,1", "Qty"),
+    ("A,EA,2.5,1", "Qty"),
+    ("A,EA,1000000000,1000000000", "Total Price"),
+    (",EA,1,1", "Description"),
+])
+def test_invalid_rows_are_skipped(row, message):
+    store, result = _import(f"Description,Unit,Qty,Unit Cost\n{row}\nB,EA,1,1\n")
+    assert (result.added, result.skipped) == (1, 1)
+    assert result.errors[0][0] == 2
+    assert result.errors[0][1].startswith(message)
+    assert store.sum_cents() == 100
+
+
+def test_missing_column_adds_nothing():
+    with pytest.raises(ValueError, match="unit_cost"):
+        _import("Description,Unit,Qty\nA,EA,1\n")
@@ -0,0 +1,30 @@
+import time
+
+from po_jobs import CANCELLED, DONE, RenderQueue
+from po_models import po_from_dict
+
+
+def test_collated_job_renders_off_thread(local_order, foreign_order):
+    queue = RenderQueue(workers=1)
+    pos = [po_from_dict(local_order), po_from_dict(foreign_order)]
+    job = queue.submit_collated(lambda: pos, "Print run")
+
+    assert job.wait(60)
+    assert job.state == DONE, job.error
+    assert job.result.startswith(b"%PDF")
+    assert job.done == job.total == 2
+    # The slot is released by the executor's done callback, just after the job finishes
+    deadline = time.monotonic() + 5
+    while queue.pending and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert queue.pending == 0
+
+
+def test_collated_job_can_be_cancelled(local_order):
+    queue = RenderQueue(workers=1)
+    job = queue.submit_collated(lambda: [po_from_dict(local_order)] * 3, "Print run")
+    job.cancel()
+
+    assert job.wait(60)
+    assert job.state == CANCELLED
+    assert job.result is None
@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+import pytest
+
+from po_models import LineItems, LocalLineItem, po_from_dict, to_cents, to_qty
+
+
+@pytest.mark.parametrize("amount, cents", [
+    (0.1, 10), ("12.345", 1235), (" 5 ", 500), (Decimal("1.005"), 101), (3, 300), ("0", 0),
+])
+def test_to_cents(amount, cents):
+    assert to_cents(amount) == cents
+
+
+@pytest.mark.parametrize("amount", [
+    "abc", "", None, [1], "NaN", "sNaN", "inf", "-Infinity", float("nan"), float("inf"), -1, "-0.01", "1e100000",
+])
+def test_to_cents_rejects_bad_amounts(amount):
+    with pytest.raises(ValueError):
+        to_cents(amount)
+
+
+def test_bad_unit_cost_in_payload_is_a_value_error(local_order):
+    local_order["line_items"][0]["unit_cost"] = "abc"
+    with pytest.raises(ValueError, match="abc"):
+        po_from_dict(local_order)
+
+
+def test_line_item_rejects_negative_cost():
+    with pytest.raises(ValueError):
+        LocalLineItem("Fitting", "EA", 1, "-2.50")
+
+
+@pytest.mark.parametrize("qty, expected", [(3, 3), ("12", 12), (" 4 ", 4), (2.0, 2), (Decimal("5.00"), 5)])
+def test_to_qty(qty, expected):
+    assert to_qty(qty) == expected
+
+
+@pytest.mark.parametrize("qty", [0, -3, 2.7, "2.5", "abc", "", None, float("inf"), "NaN", 10**20])
+def test_to_qty_rejects_bad_quantities(qty):
+    with pytest.raises(ValueError):
+        to_qty(qty)
+
+
+def test_to_cents_rejects_amounts_beyond_int64():
+    with pytest.raises(ValueError):
+        to_cents("1e20")
+
+
+def test_line_item_and_store_reject_bad_qty():
+    with pytest.raises(ValueError):
+        LocalLineItem("Fitting", "EA", -3, "1.00")
+    items = LineItems(LocalLineItem, [LocalLineItem("Fitting", "EA", 2, "1.00")])
+    for qty in (-3, 2.7, 10**20):
+        with pytest.raises(ValueError):
+            items.update(0, qty=qty)
+    assert items.sum_cents() == 200
@@ -0,0 +1,72 @@
+import re
+
+import pytest
+
+import po_models
+from po_models import available_backends, backend_error, po_from_dict
+from po_render import render_po
+
+
+def _page_count(pdf):
+    return len(re.findall(rb"/Type /Page\b", pdf))
+
+
+def _tall_order(local_order, lines):
+    tall = {"description": "\n".join(f"line {i}" for i in range(lines)), "unit": "EA", "qty": 1, "unit_cost": 1}
+    return {**local_order, "line_items": [local_order["line_items"][0], tall, local_order["line_items"][0]]}
+
+
+def test_local_row_that_does_not_fit_moves_to_next_page(local_order):
+    pdf = render_po(po_from_dict(_tall_order(local_order, 38)))
+    assert pdf.startswith(b"%PDF")
+    assert _page_count(pdf) == 3
+
+
+def test_local_row_taller_than_a_page_is_split(local_order):
+    pdf = render_po(po_from_dict(_tall_order(local_order, 120)))
+    assert pdf.startswith(b"%PDF")
+    assert _page_count(pdf) == 4
+
+
+@pytest.mark.skipif(backend_error("html") is not None, reason="WeasyPrint can't load here")
+@pytest.mark.parametrize("order", ["local_order", "foreign_order"])
+def test_html_backend_renders_pdf(order, request):
+    pdf = render_po(po_from_dict(request.getfixturevalue(order)), "html")
+    assert pdf.startswith(b"%PDF")
+
+
+def test_unloadable_backend_is_not_offered(monkeypatch):
+    monkeypatch.setitem(po_models._backend_errors, "html", "WeasyPrint can't load: no pango")
+    assert available_backends() == ("canvas",)
+
+
+def _foreign_order(foreign_order, n, description="Ball valve, PN16"):
+    item = foreign_order["line_items"][0]
+    items = [{**item, "product_description": f"{description} {i + 1}"} for i in range(n)]
+    return po_from_dict({**foreign_order, "line_items": items})
+
+
+@pytest.mark.parametrize("n, pages", [(1, 2), (30, 3), (200, 8)])
+def test_foreign_purchase_table_paginates(foreign_order, n, pages):
+    assert _page_count(render_po(_foreign_order(foreign_order, n))) == pages
+
+
+def test_foreign_rows_and_total_stay_on_the_page(foreign_order):
+    pymupdf = pytest.importorskip("pymupdf")
+    doc = pymupdf.open(stream=render_po(_foreign_order(foreign_order, 30)))
+    rows = []
+    for page in doc:
+        for block in page.get_text("dict")["blocks"]:
+            for line in block.get("lines", []):
+                text = "".join(span["text"] for span in line["spans"])
+                if text.startswith("Ball valve, PN16 "):
+                    rows.append(int(text.rsplit(" ", 1)[1]))
+                    assert line["bbox"][3] < page.rect.height - 80
+    assert rows == list(range(1, 31))
+    assert "Grand Total" in doc[-1].get_text()
+
+
+@pytest.mark.parametrize("word", ["valve", "válve"])  # pre-wrapped text, and a Paragraph
+def test_foreign_row_taller_than_a_page_is_split(foreign_order, word):
+    po = _foreign_order(foreign_order, 2, " ".join(f"{word}{i}" for i in range(1500)))
+    assert _page_count(render_po(po)) == 14
@@ -0,0 +1,70 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from tornado.testing import AsyncHTTPTestCase
+
+import po_html
+import po_models
+from po_server import make_app
+
+
+class RenderTest(AsyncHTTPTestCase):
+    def get_app(self):
+        # Renders in-process, so monkeypatching reaches them
+        self.pool = ThreadPoolExecutor(max_workers=2)
+        return make_app(self.pool, workers=2, concurrency=2)
+
+    def tearDown(self):
+        super().tearDown()
+        self.pool.shutdown()
+
+    @pytest.fixture(autouse=True)
+    def _fixtures(self, local_order, monkeypatch):
+        self.order = local_order
+        self.monkeypatch = monkeypatch
+
+    def post(self, data, query=""):
+        return self.fetch(f"/render{query}", method="POST", body=json.dumps(data))
+
+    def test_renders_pdf(self):
+        response = self.post(self.order)
+        assert response.code == 200
+        assert response.body.startswith(b"%PDF")
+
+    def test_bad_amount_is_400(self):
+        self.order["line_items"][0]["unit_cost"] = "abc"
+        response = self.post(self.order)
+        assert response.code == 400
+        assert "abc" in json.loads(response.body)["error"]
+
+    def test_bad_quantity_is_400(self):
+        self.order["line_items"][0]["qty"] = "many"
+        assert self.post(self.order).code == 400
+
+    def test_numeric_po_no_is_400(self):
+        self.order["po_no"] = 123
+        assert self.post(self.order).code == 400
+
+    def test_numeric_po_date_is_400(self):
+        self.order["po_date"] = 20250101
+        assert self.post(self.order).code == 400
+
+    def test_unknown_backend_is_400(self):
+        assert self.post(self.order, "?backend=latex").code == 400
+
+    def test_backend_that_cannot_load_is_503(self):
+        def broken():
+            raise OSError("cannot load library 'libpango-1.0-0'")
+
+        self.monkeypatch.setattr(po_html, "_engine", None)
+        self.monkeypatch.setattr(po_html, "_load_engine", broken)
+        response = self.post(self.order, "?backend=html")
+        assert response.code == 503
+        assert "pango" in json.loads(response.body)["error"]
+
+    def test_backend_unavailable_here_is_503(self):
+        self.monkeypatch.setitem(po_models._backend_errors, "html", "WeasyPrint can't load: no pango")
+        response = self.post(self.order, "?backend=html")
+        assert response.code == 503
+        assert "no pango" in json.loads(response.body)["error"]
@@ -0,0 +1,120 @@
+import copy
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import po_watch
+from po_cache import po_key
+from po_models import po_from_dict
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    inbox, outbox = tmp_path / "inbox", tmp_path / "outbox"
+    inbox.mkdir()
+    watcher = po_watch.Watcher(str(inbox), str(outbox), workers=2, debounce=0)
+    # Threads instead of processes, so the tests can step into the renders
+    watcher.pool.shutdown()
+    watcher.pool = ThreadPoolExecutor(max_workers=2)
+    yield watcher
+    watcher.pool.shutdown(wait=True)
+
+
+def _drop(watcher, name, orders):
+    path = os.path.join(watcher.inbox, name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(orders, f)
+    watcher.touch(path)
+    return path
+
+
+def _drain(watcher):
+    deadline = time.monotonic() + 60
+    while not watcher.idle:
+        assert time.monotonic() < deadline, "watcher never went idle"
+        watcher.step(timeout=0.05)
+
+
+def test_newer_version_finishing_first_wins(watcher, local_order, monkeypatch):
+    older = copy.deepcopy(local_order)
+    older["line_items"] *= 3
+    newer = copy.deepcopy(local_order)
+    newer["subject"] = "Revised order"
+
+    # Hold the older render back until the newer one has been reaped
+    newer_reaped = threading.Event()
+    render_to = po_watch._render_to
+
+    def render_in_order(data, path):
+        if data["subject"] != newer["subject"]:
+            assert newer_reaped.wait(30)
+        return render_to(data, path)
+
+    monkeypatch.setattr(po_watch, "_render_to", render_in_order)
+    reap = watcher._reap
+
+    def reap_and_note(timeout):
+        reap(timeout)
+        if watcher.stats["rendered"]:
+            newer_reaped.set()
+
+    monkeypatch.setattr(watcher, "_reap", reap_and_note)
+    _drop(watcher, "a.json", older)
+    _drop(watcher, "b.json", newer)
+    _drain(watcher)
+
+    assert watcher.stats["rendered"] == 1
+    assert watcher.stats["superseded"] == 1
+    assert watcher.stats["failed"] == 0
+    content_hash, pdf = watcher.ledger.get(("local", newer["po_no"]))
+    assert content_hash == po_key(po_from_dict(newer))
+    assert os.path.exists(os.path.join(watcher.outbox, pdf))
+    assert not [name for name in os.listdir(watcher.outbox) if name.endswith(".tmp")]
+    assert sorted(os.listdir(watcher.processed_dir)) == ["a.json", "b.json"]
+
+
+def test_bad_amount_moves_file_to_failed(watcher, local_order):
+    bad = copy.deepcopy(local_order)
+    bad["line_items"][0]["unit_cost"] = "abc"
+    _drop(watcher, "bad.json", bad)
+    _drop(watcher, "good.json", local_order)
+    _drain(watcher)
+
+    assert watcher.stats["failed"] == 1
+    assert watcher.stats["rendered"] == 1
+    assert os.path.exists(os.path.join(watcher.failed_dir, "bad.json.error.txt"))
+    assert os.listdir(watcher.processed_dir) == ["good.json"]
+
+
+def test_numeric_po_no_moves_file_to_failed(watcher, local_order):
+    bad = copy.deepcopy(local_order)
+    bad["po_no"] = 12345
+    _drop(watcher, "bad.json", bad)
+    _drop(watcher, "good.json", local_order)
+    _drain(watcher)
+
+    assert watcher.stats["failed"] == 1
+    assert watcher.stats["rendered"] == 1
+    assert os.path.exists(os.path.join(watcher.failed_dir, "bad.json.error.txt"))
+    assert os.listdir(watcher.processed_dir) == ["good.json"]
+
+
+def test_local_and_foreign_with_the_same_number_are_kept_apart(watcher, local_order, foreign_order):
+    foreign_order["po_no"] = local_order["po_no"]
+    _drop(watcher, "orders.json", [local_order, foreign_order])
+    _drain(watcher)
+    assert watcher.stats["rendered"] == 2
+    for fmt in ("local", "foreign"):
+        _, pdf = watcher.ledger.get((fmt, local_order["po_no"]))
+        assert pdf == os.path.join(fmt, local_order["po_no"] + ".pdf")
+        assert os.path.exists(os.path.join(watcher.outbox, pdf))
+
+    # Dropping both again is a no-op for each
+    _drop(watcher, "orders.json", [local_order, foreign_order])
+    _drain(watcher)
+    assert watcher.stats["rendered"] == 2
+    assert watcher.stats["unchanged"] == 2